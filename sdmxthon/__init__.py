@@ -1,9 +1,10 @@
-from sdmxthon.api.api import (get_datasets, get_pandas_df, read_sdmx,
+from sdmxthon.api.api import (get_datasets, get_pandas_df,
+                              iter_datasets_chunks, read_sdmx,
                               upload_metadata_to_fmr, xml_to_csv)
 from sdmxthon.model.dataset import Dataset
 from sdmxthon.model.message import Message
 from sdmxthon.utils.enums import ActionEnum, MessageTypeEnum
 
 __all__ = ['read_sdmx', 'get_datasets', 'get_pandas_df', 'xml_to_csv',
-           'upload_metadata_to_fmr', 'Message', 'Dataset', 'MessageTypeEnum',
-           'ActionEnum']
+           'iter_datasets_chunks', 'upload_metadata_to_fmr', 'Message',
+           'Dataset', 'MessageTypeEnum', 'ActionEnum']
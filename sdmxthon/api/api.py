@@ -5,14 +5,18 @@ supported agencies by the API.
 """
 import os
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
 from sdmxthon.model.dataset import Dataset
 from sdmxthon.model.error import SDMXError
 from sdmxthon.model.message import Message
 from sdmxthon.model.submission import SubmissionResult
+from sdmxthon.parsers.data_types import check_dtype_backend, convert_dtypes
 from sdmxthon.parsers.read import read_sdmx_csv, read_xml
-from sdmxthon.parsers.reader_input_processor import process_string_to_read
+from sdmxthon.parsers.reader_input_processor import open_source, \
+    process_stream_to_read, process_string_to_read
+from sdmxthon.parsers.stream_read import iter_xml_chunks
+from sdmxthon.parsers.writer_output import open_zip_entry
 from sdmxthon.utils.enums import MessageTypeEnum
 from sdmxthon.utils.handlers import drop_na_all, first_element_dict
 from sdmxthon.webservices.fmr import submit_structures_to_fmr
@@ -22,7 +26,9 @@ from sdmxthon.webservices.webservices import BisWs, EcbWs, EuroStatWs, IloWs, \
     UnicefWs
 
 
-def read_sdmx(sdmx_file, validate=False, use_dataset_id=False) -> Message:
+def read_sdmx(sdmx_file, validate=False, use_dataset_id=False,
+              streaming=False, dtype_backend=None, validate_max_size=None,
+              validate_first_error_only=False) -> Message:
     """
     Read SDMX performs the operation of reading a SDMX Data and SDMX
     metadata files in XML or CSV format. URLs could be used.
@@ -30,17 +36,43 @@ def read_sdmx(sdmx_file, validate=False, use_dataset_id=False) -> Message:
     :param sdmx_file: Path, URL or SDMX file as string
     :param validate: Validation of the XML file against the XSD (default: False)
     :param use_dataset_id: Use the DataSetID as key in output (default: True)
+    :param streaming: Reads SDMX-ML data files incrementally, keeping \
+    only the parsed observations in memory. URLs are parsed while they \
+    are downloaded. If validate is True, the data is validated by the \
+    parser reading it (default: False)
+    :param dtype_backend: Use 'categorical' to get the coded dimensions \
+    and attributes as Pandas Categorical columns, or 'pyarrow' to get \
+    Arrow backed columns. On streaming or validated reading, the \
+    categorical columns are built from the codes of the values while \
+    reading, so the peak memory falls too. Otherwise, and for 'pyarrow', \
+    the columns are converted after reading, so it reduces the memory held \
+    by the data, not the peak memory (default: None)
+    :param validate_max_size: Validates only the first N MB of the XML \
+    file (default: None, validates the whole file)
+    :param validate_first_error_only: Raises only the first validation \
+    error found. On streaming, stops on the first error (default: False)
 
     :return: A :obj:`Message <sdmxthon.model.message.Message>` object
     """
+    check_dtype_backend(dtype_backend)
     if isinstance(sdmx_file, Path):
         sdmx_file = str(sdmx_file)
 
-    # Process the SDMX file and check the file type
-    infile, filetype = process_string_to_read(sdmx_file)
+    source = process_stream_to_read(sdmx_file) if streaming else None
+
+    if source is not None:
+        infile, filetype = source, "xml"
+    else:
+        # Process the SDMX file and check the file type
+        infile, filetype = process_string_to_read(sdmx_file)
     if filetype == "xml":
         payload = read_xml(infile, None, validate=validate,
-                           use_dataset_id=use_dataset_id)
+                           use_dataset_id=use_dataset_id,
+                           streaming=source is not None,
+                           validate_max_size=validate_max_size,
+                           validate_first_error_only=(
+                               validate_first_error_only),
+                           categorical=dtype_backend == 'categorical')
     elif filetype == "json":
         raise Exception('Json is not supported')
     elif filetype == "csv":
@@ -52,6 +84,10 @@ def read_sdmx(sdmx_file, validate=False, use_dataset_id=False) -> Message:
     if isinstance(payload, dict):
         if isinstance(first_element_dict(payload), Dataset):
             type_ = MessageTypeEnum.StructureSpecificDataSet
+            if dtype_backend is not None:
+                for ds in payload.values():
+                    ds.data = convert_dtypes(ds.data, ds.structure,
+                                             dtype_backend)
         elif isinstance(first_element_dict(payload), SubmissionResult):
             type_ = MessageTypeEnum.Submission
         else:
@@ -64,7 +100,7 @@ def read_sdmx(sdmx_file, validate=False, use_dataset_id=False) -> Message:
 
 
 def get_datasets(path_to_data, path_to_metadata, validate=True,
-                 remove_empty_columns=True):
+                 remove_empty_columns=True, dtype_backend=None):
     """
     GetDatasets performs the operation of reading a SDMX Data and SDMX
     metadata files. URLs could be used.
@@ -77,9 +113,17 @@ def get_datasets(path_to_data, path_to_metadata, validate=True,
 
     :param remove_empty_columns: Removes empty columns on output pd.Dataframe
 
+    :param dtype_backend: Use 'categorical' to get the dimensions and \
+    attributes with a codelist as Pandas Categorical columns, with the \
+    codelist values as categories, or 'pyarrow' to get Arrow backed \
+    columns. OBS_VALUE is converted to numeric if the measure is numeric. \
+    The columns are converted after reading, so it reduces the memory held \
+    by the data, not the peak memory (default: None)
+
     :return: A :obj:`Dataset <sdmxthon.model.dataset.DataSet>` object or a \
     dict of :obj:`Datasets <sdmxthon.model.dataset.DataSet>`
     """
+    check_dtype_backend(dtype_backend)
 
     message_datasets = read_sdmx(path_to_data, validate=validate)
 
@@ -103,6 +147,11 @@ def get_datasets(path_to_data, path_to_metadata, validate=True,
         if remove_empty_columns:
             datasets[v].data = drop_na_all(datasets[v].data)
 
+        if dtype_backend is not None:
+            datasets[v].data = convert_dtypes(datasets[v].data,
+                                              datasets[v].structure,
+                                              dtype_backend)
+
     if len(datasets) == 1:
         return first_element_dict(datasets)
 
@@ -110,7 +159,7 @@ def get_datasets(path_to_data, path_to_metadata, validate=True,
 
 
 def get_pandas_df(path_to_data, validate=True, remove_empty_columns=True,
-                  use_dataset_id=False):
+                  use_dataset_id=False, streaming=False, dtype_backend=None):
     """
     GetPandasDF reads all observations in a SDMX file as Pandas Dataframe(s)
 
@@ -119,12 +168,20 @@ def get_pandas_df(path_to_data, validate=True, remove_empty_columns=True,
     :param validate: Validation of the XML file against the XSD (default: True)
     :param remove_empty_columns: Removes empty columns on output pd.Dataframe
     :param use_dataset_id: Use the DataSetID as key in output (default: False)
+    :param streaming: Reads the SDMX-ML file incrementally (default: False)
+    :param dtype_backend: Use 'categorical' to get the coded dimensions \
+    and attributes as Pandas Categorical columns, or 'pyarrow' to get \
+    Arrow backed columns. On streaming or validated reading, the \
+    categorical columns are built while reading, so the peak memory falls \
+    too. Otherwise the columns are converted after reading (default: None)
 
     :return: A dict of `Pandas Dataframe \
     <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_
     """
     message_datasets = read_sdmx(path_to_data, validate=validate,
-                                 use_dataset_id=use_dataset_id)
+                                 use_dataset_id=use_dataset_id,
+                                 streaming=streaming,
+                                 dtype_backend=dtype_backend)
 
     if message_datasets.type != MessageTypeEnum.StructureSpecificDataSet:
         raise ValueError('Only SDMX data messages are allowed in get_pandas_df')
@@ -136,12 +193,61 @@ def get_pandas_df(path_to_data, validate=True, remove_empty_columns=True,
         return {ds: drop_na_all(datasets[ds].data) for ds in datasets}
 
 
+def iter_datasets_chunks(path_to_data, chunk_rows=50000, validate=False,
+                         use_dataset_id=False, validate_max_size=None,
+                         dtype_backend=None):
+    """
+    Iterates over the observations of a SDMX-ML data file by chunks of
+    Pandas Dataframes, while the file is being parsed. Only one chunk is
+    kept in memory at a time.
+
+    :param path_to_data: Path, URL or SDMX-ML data file as string
+    :param chunk_rows: Maximum number of rows on each chunk (default: 50000)
+    :param validate: Validation of the XML file against the XSD \
+    (default: False). The data is validated by the parser reading it, \
+    so a chunk may be returned before an error found later in the file
+    :param use_dataset_id: Use the DataSetID as key in output (default: False)
+    :param validate_max_size: Validates only the first N MB of the file \
+    (default: None, validates the whole file)
+    :param dtype_backend: Use 'categorical' to get the coded dimensions \
+    and attributes of each chunk as Pandas Categorical columns, built from \
+    the codes of the values while reading, or 'pyarrow' to get Arrow \
+    backed columns (default: None)
+
+    :return: A generator of tuples (dataset id, `Pandas Dataframe \
+    <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_)
+
+    .. important::
+
+        Columns are added as they are found on the file, so a chunk may
+        not have the columns of an attribute that is only reported in
+        other chunks.
+    """
+    check_dtype_backend(dtype_backend)
+    if isinstance(path_to_data, Path):
+        path_to_data = str(path_to_data)
+
+    source = process_stream_to_read(path_to_data)
+    if source is None:
+        raise ValueError('Only SDMX-ML data files can be read by chunks')
+
+    chunks = iter_xml_chunks(source, chunk_rows, validate=validate,
+                             use_dataset_id=use_dataset_id,
+                             validate_max_size=validate_max_size,
+                             categorical=dtype_backend == 'categorical')
+    if dtype_backend is None:
+        return chunks
+    return ((k, convert_dtypes(df, dtype_backend=dtype_backend))
+            for k, df in chunks)
+
+
 def xml_to_csv(data, output_path=None, validate=True,
                remove_empty_columns=True, **kwargs):
     """
     XML to CSV transforms a SDMX file into a CSV. Saves the file on disk or
-    .zip of CSV. If the SDMX data file has only a Dataset and output_path is
-    '', it returns a StringIO object. Kwargs are supported.
+    .zip of CSV (each CSV is compressed as it is written). If the SDMX data
+    file has only a Dataset and output_path is '', it returns a StringIO
+    object. Kwargs are supported.
 
     :param data: Path, URL or SDMX file as string (Data file)
     :param output_path: Path to save the CSV (default: None)
@@ -160,11 +266,12 @@ def xml_to_csv(data, output_path=None, validate=True,
             datasets[ds].data = drop_na_all(datasets[ds].data)
 
     if output_path is not None and '.zip' in output_path:
-        with ZipFile(output_path, 'w') as zipObj:
+        with ZipFile(output_path, 'w', compression=ZIP_DEFLATED) as zipObj:
             # Add multiple files to the zip
             for record in datasets:
-                zipObj.writestr(record + '.csv',
-                                data=datasets[record].to_csv(**kwargs))
+                with open_zip_entry(zipObj, record + '.csv',
+                                    newline='') as f:
+                    datasets[record].to_csv(f, **kwargs)
 
     else:
         if len(datasets) > 1:
@@ -235,11 +342,12 @@ def upload_metadata_to_fmr(data: (str, os.PathLike),
         raise ValueError('Only SDMX-ML is supported')
 
     # Submit the SDMX structures to FMR for processing
-    submit_structures_to_fmr(
-        sdmx_text=sdmx_text,
-        host=host,
-        port=port,
-        user=user,
-        password=password,
-        use_https=use_https
-    )
+    with open_source(sdmx_text) as f:
+        submit_structures_to_fmr(
+            sdmx_text=f,
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            use_https=use_https
+        )
@@ -1,7 +1,8 @@
 from sdmxthon.model.base import IdentifiableArtefact
 from sdmxthon.model.itemScheme import Concept
 from sdmxthon.model.representation import Representation
-from sdmxthon.model.utils import generic_setter, int_setter
+from sdmxthon.model.utils import generic_setter, int_setter, \
+    structure_changed
 from sdmxthon.parsers.writer_aux import add_indent, export_intern_data
 from sdmxthon.utils.handlers import split_unique_id
 from sdmxthon.utils.mappings import structureAbbr
@@ -48,6 +49,7 @@ class Component(IdentifiableArtefact):
     @local_representation.setter
     def local_representation(self, value: Representation):
         self._local_representation = generic_setter(value, Representation)
+        structure_changed()
 
     @property
     def concept_identity(self):
@@ -58,6 +60,7 @@ class Component(IdentifiableArtefact):
     @concept_identity.setter
     def concept_identity(self, value: Concept):
         self._concept_identity = generic_setter(value, Concept)
+        structure_changed()
 
     @property
     def representation(self):
@@ -322,6 +325,7 @@ class Attribute(Component):
             raise ValueError(
                 "The value for usageStatus has to be 'Mandatory' "
                 "or 'Conditional'")
+        structure_changed()
 
     @related_to.setter
     def related_to(self, value):
@@ -329,6 +333,7 @@ class Attribute(Component):
             self._relatedTo = "NoSpecifiedRelationship"
         else:
             self._relatedTo = value
+        structure_changed()
 
 
 class MeasureDimension(Dimension):
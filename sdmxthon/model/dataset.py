@@ -4,6 +4,7 @@
 """
 
 import json
+from concurrent.futures import Executor
 from copy import copy
 from datetime import date, datetime
 
@@ -14,8 +15,10 @@ from sdmxthon.model.definitions import DataFlowDefinition, \
     DataStructureDefinition
 from sdmxthon.model.header import Header
 from sdmxthon.model.utils import ACTION_SDMX_CSV_MAPPER
+from sdmxthon.parsers.data_types import to_arrow_table
 from sdmxthon.parsers.data_validations import validate_data
 from sdmxthon.parsers.write import writer
+from sdmxthon.parsers.writer_output import open_output
 from sdmxthon.utils.enums import ActionEnum, MessageTypeEnum
 from sdmxthon.webservices.fmr import validate_sdmx_csv_fmr
 
@@ -355,18 +358,83 @@ class Dataset:
         with open(path_to_json, 'w') as f:
             f.write(json.dumps(element, ensure_ascii=False, indent=2))
 
-    def to_feather(self, path_to_feather: str, **kwargs):
+    def to_arrow(self, dictionary_encode: bool = False):
+        """Parses the data to a pyarrow Table. Requires pyarrow
+
+        :param dictionary_encode: Dictionary encodes the dimensions and
+                                  attributes with a codelist
+        :type dictionary_encode: bool
+
+        :return: A pyarrow Table
+        """
+        return to_arrow_table(self.data, self.structure, dictionary_encode)
+
+    def to_feather(self, path_to_feather: str,
+                   dictionary_encode: bool = False, **kwargs):
         """Parses the data to an Apache Feather format. Kwargs are supported.
+        Check the `pyarrow write_feather docs
+        <https://arrow.apache.org/docs/python/generated/pyarrow.feather
+        .write_feather.html>`_
 
         :param path_to_feather: Path to Feather file
         :type path_to_feather: str
 
+        :param dictionary_encode: Dictionary encodes the dimensions and
+                                  attributes with a codelist
+        :type dictionary_encode: bool
+
+        """
+        table = self.to_arrow(dictionary_encode)
+        from pyarrow import feather
+
+        feather.write_feather(table, path_to_feather, **kwargs)
+
+    def to_parquet(self, path_to_parquet: str,
+                   dictionary_encode: bool = False, **kwargs):
+        """Parses the data to an Apache Parquet format. Kwargs are supported.
+        Check the `pyarrow write_table docs
+        <https://arrow.apache.org/docs/python/generated/pyarrow.parquet
+        .write_table.html>`_
+
+        :param path_to_parquet: Path to Parquet file
+        :type path_to_parquet: str
+
+        :param dictionary_encode: Dictionary encodes the dimensions and
+                                  attributes with a codelist
+        :type dictionary_encode: bool
+
         """
-        self.data.to_feather(path_to_feather, **kwargs)
+        table = self.to_arrow(dictionary_encode)
+        from pyarrow import parquet
 
-    def structural_validation(self):
+        parquet.write_table(table, path_to_parquet, **kwargs)
+
+    def structural_validation(self, max_duplicated_rows: int = None,
+                              n_jobs: int = None, max_errors: int = None,
+                              fail_fast: bool = False,
+                              summary: bool = False):
         """Performs a Structural Validation on the Data.
 
+        :param max_duplicated_rows: Maximum number of row indices reported
+                                    on each duplicated datapoint error
+                                    (SS07)
+        :type max_duplicated_rows: int
+
+        :param n_jobs: Number of threads validating the components
+                       (-1 uses all CPUs)
+        :type n_jobs: int
+
+        :param max_errors: Stops the validation once this number of errors
+                           is found
+        :type max_errors: int
+
+        :param fail_fast: Stops the validation on the first error
+        :type fail_fast: bool
+
+        :param summary: Returns only the number of errors by code and
+                        component, as a dict {code: {component: count}}
+        :type summary: bool
+
         :returns:
             A list of errors as defined in the Validation Page.
 
@@ -384,16 +452,24 @@ class Dataset:
         elif not isinstance(self.structure, DataStructureDefinition):
             raise TypeError('structure must be a DataStructureDefinition')
 
-        return validate_data(self.data, self.structure)
+        return validate_data(self.data, self.structure,
+                             max_duplicated_rows=max_duplicated_rows,
+                             n_jobs=n_jobs, max_errors=max_errors,
+                             fail_fast=fail_fast, summary=summary)
 
-    def to_sdmx_csv(self, version: int, output_path: str = None):
+    def to_sdmx_csv(self, version: int, output_path: str = None,
+                    compression='infer'):
 
         """
         Converts a dataset to an SDMX CSV format
 
         :param version: The SDMX-CSV version (1.2)
         :param output_path: The path where the resulting
-                            SDMX CSV file will be saved
+                            SDMX CSV file will be saved, or a text or
+                            binary stream to write to
+        :param compression: Compression of the output: 'infer' (from the
+                            extension of output_path: .gz, .zst or .zip),
+                            'gzip', 'zstd', 'zip' or None
 
         :return: The SDMX CSV data as a string if no output path is provided
 
@@ -412,8 +488,8 @@ class Dataset:
         # Link to pandas.to_csv documentation on sphinx:
         # https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_csv.html
 
-        # Create a copy of the dataset
-        df: pd.DataFrame = copy(self.data)
+        # Create a copy of the dataset (the data is not copied)
+        df: pd.DataFrame = self.data.copy(deep=False)
 
         # Add additional attributes to the dataset
         for k, v in self.attached_attributes.items():
@@ -439,13 +515,13 @@ class Dataset:
         else:
             raise Exception('Invalid SDMX-CSV version.')
 
-        # Convert the dataset into a csv file
-        if output_path is not None:
-            # Save the CSV file to the specified output path
-            df.to_csv(output_path, index=False, header=True)
-
         # Return the SDMX CSV data as a string
-        return df.to_csv(index=False, header=True)
+        if output_path is None:
+            return df.to_csv(index=False, header=True)
+
+        # Save the CSV file to the specified output path
+        with open_output(output_path, compression, newline='') as f:
+            df.to_csv(f, index=False, header=True)
 
     def fmr_validation(self, host: str = 'localhost',
                        port: int = 8080,
@@ -551,15 +627,19 @@ class Dataset:
                prepared: datetime = None,
                sender: str = 'Unknown',
                receiver: str = 'Not_supplied',
-               prettyprint=True):
+               prettyprint=True,
+               n_jobs: int = None,
+               executor: Executor = None,
+               compression='infer'):
         """Parses the data to SDMX-ML 2.1, specifying the Message_Type
         (StructureSpecific or Generic or Metadata)
 
         :param message_type: Format of the Message in SDMX-ML
         :type message_type: MessageTypeEnum
 
-        :param output_path: Path to save the file, defaults to ''
-        :type output_path: str
+        :param output_path: Path to save the file or a text or binary \
+        stream to write to (file, socket...), defaults to ''
+        :type output_path: str or file-like object
 
         :param prettyprint: Saves the file formatted to be human-readable
         :type prettyprint: bool
@@ -588,6 +668,19 @@ class Dataset:
         :param receiver: ID of the Receiver, defaults to 'Not_supplied'
         :type receiver: str
 
+        :param n_jobs: Number of processes writing the chunks of the data
+                       (-1 uses all CPUs)
+        :type n_jobs: int
+
+        :param executor: concurrent.futures Executor used to write the
+                         chunks of the data, instead of creating a process pool
+        :type executor: `Executor`
+
+        :param compression: Compression of the output: 'infer' (from the \
+        extension of output_path: .gz, .zst or .zip), 'gzip', 'zstd', 'zip' \
+        or None, defaults to 'infer'
+        :type compression: str
+
         :returns: StringIO object, if outputPath is ''
         """
 
@@ -598,8 +691,10 @@ class Dataset:
             return writer(path=output_path, type_=message_type, payload=self,
                           id_=id_, test=test, header=header,
                           prepared=prepared, sender=sender, receiver=receiver,
-                          prettyprint=prettyprint)
+                          prettyprint=prettyprint, n_jobs=n_jobs,
+                          executor=executor, compression=compression)
         writer(path=output_path, type_=message_type, payload=self, id_=id_,
                test=test, header=header,
                prepared=prepared, sender=sender, receiver=receiver,
-               prettyprint=prettyprint)
+               prettyprint=prettyprint, n_jobs=n_jobs,
+               executor=executor, compression=compression)
@@ -12,7 +12,8 @@ from sdmxthon.model.descriptors import AttributeDescriptor, ComponentList, \
     DimensionDescriptor, MeasureDescriptor
 from sdmxthon.model.extras import ReferencePeriod, ReleaseCalendar
 from sdmxthon.model.header import Header, Party, Sender
-from sdmxthon.model.utils import bool_setter, ConstraintRoleType, generic_setter
+from sdmxthon.model.utils import bool_setter, ConstraintRoleType, \
+    generic_setter, structure_changed, structure_version
 from sdmxthon.parsers.writer_aux import add_indent, create_namespaces, \
     export_intern_data, get_end_message, parse_metadata, write_from_header
 from sdmxthon.utils.enums import MessageTypeEnum
@@ -45,6 +46,7 @@ class MemberSelection(object):
         if not isinstance(value, list):
             value = [value]
         self._selValue = generic_setter(value, list)
+        structure_changed()
 
     @property
     def values_for(self):
@@ -53,6 +55,7 @@ class MemberSelection(object):
     @values_for.setter
     def values_for(self, value):
         self._values_for = generic_setter(value, str)
+        structure_changed()
 
     @property
     def is_included(self):
@@ -83,6 +86,7 @@ class CubeRegion(object):
     @member.setter
     def member(self, value):
         self._member = generic_setter(value, list)
+        structure_changed()
 
     @property
     def is_included(self):
@@ -150,6 +154,7 @@ class DataKeySet(object):
     @keys.setter
     def keys(self, value):
         self._keys = generic_setter(value, list)
+        structure_changed()
 
     @property
     def is_included(self):
@@ -218,6 +223,7 @@ class Constraint(MaintainableArtefact):
     @data_content_region.setter
     def data_content_region(self, value):
         self._data_content_region = generic_setter(value, list)
+        structure_changed()
 
     @property
     def data_content_keys(self):
@@ -226,6 +232,7 @@ class Constraint(MaintainableArtefact):
     @data_content_keys.setter
     def data_content_keys(self, value):
         self._data_content_keys = generic_setter(value, list)
+        structure_changed()
 
     @property
     def metadata_content_region(self):
@@ -311,6 +318,7 @@ class ContentConstraint(Constraint):
             raise ValueError('ConstraintRole must be either '
                              '"allowableContent" or "actualContent"')
         self._role = role
+        self._series_key_index = None
 
     @property
     def role(self):
@@ -322,6 +330,26 @@ class ContentConstraint(Constraint):
             raise ValueError('ConstraintRole must be either '
                              '"Allowed" or "Actual"')
         self._role = value
+        structure_changed()
+
+    @property
+    def series_key_index(self):
+        """
+        Index of the series keys (DataKeySet) of the constraint, used on
+        the SS11 validation. It is built once and rebuilt when the keys
+        are set again (see structure_changed)
+        """
+        from sdmxthon.parsers.data_validations import SeriesKeyIndex
+
+        key = structure_version()
+        cached = self._series_key_index
+        if cached is None or cached[0] != key:
+            index = SeriesKeyIndex()
+            for e in self.data_content_keys or []:
+                for k in e.keys:
+                    index.add(k)
+            cached = self._series_key_index = (key, index)
+        return cached[1]
 
     def _parse_XML(self, indent, label):
         prettyprint = indent != ''
@@ -450,6 +478,7 @@ class DataStructureDefinition(MaintainableArtefact):
         self.attribute_descriptor = attribute_list
         self.group_dimension_descriptor = group_dimension_descriptor
         self._constraints = constraint
+        self._validation_plan = None
 
     def __eq__(self, other):
         if isinstance(other, DataStructureDefinition):
@@ -584,6 +613,21 @@ class DataStructureDefinition(MaintainableArtefact):
 
         return cubes, series
 
+    @property
+    def validation_plan(self):
+        """
+        Codes, facets and constraints used on the structural validation.
+        It is computed once and rebuilt when the components, codelists or
+        constraints are set again (see structure_changed)
+        """
+        from sdmxthon.parsers.data_validations import ValidationPlan
+
+        key = structure_version()
+        plan = self._validation_plan
+        if plan is None or plan.key != key:
+            plan = self._validation_plan = ValidationPlan(self, key)
+        return plan
+
     @property
     def measure_code(self):
         """Key of the MeasureDescriptor component (PrimaryMeasure)"""
@@ -592,14 +636,17 @@ class DataStructureDefinition(MaintainableArtefact):
     @dimension_descriptor.setter
     def dimension_descriptor(self, value):
         self._dimensionDescriptor = generic_setter(value, DimensionDescriptor)
+        structure_changed()
 
     @measure_descriptor.setter
     def measure_descriptor(self, value):
         self._measureDescriptor = generic_setter(value, MeasureDescriptor)
+        structure_changed()
 
     @attribute_descriptor.setter
     def attribute_descriptor(self, value):
         self._attributeDescriptor = generic_setter(value, AttributeDescriptor)
+        structure_changed()
 
     @group_dimension_descriptor.setter
     def group_dimension_descriptor(self, value):
@@ -619,6 +666,7 @@ class DataStructureDefinition(MaintainableArtefact):
         if self._constraints is None:
             self._constraints = []
         self._constraints.append(value)
+        structure_changed()
 
     def to_vtl_json(self, path: str = None):
         """Formats the DataStructureDefinition as a VTL DataStructure"""
@@ -876,6 +924,7 @@ class DataFlowDefinition(MaintainableArtefact):
         if self._constraints is None:
             self._constraints = []
         self._constraints.append(value)
+        structure_changed()
 
     def upload_to_fmr(self, host: str = 'localhost',
                       port: int = 8080,
@@ -1,5 +1,6 @@
 from sdmxthon.model.base import IdentifiableArtefact
 from sdmxthon.model.component import Attribute, Dimension, PrimaryMeasure
+from sdmxthon.model.utils import structure_changed
 from sdmxthon.parsers.writer_aux import add_indent, export_intern_data
 
 
@@ -76,6 +77,7 @@ class ComponentList(IdentifiableArtefact):
                 f"The object has to be of the dim_type "
                 f"[Dimension, Attribute, PrimaryMeasure], "
                 f"{value.__class__.__name__} provided")
+        structure_changed()
 
     def __len__(self):
         return len(self.components)
@@ -9,7 +9,8 @@ from sdmxthon.model.base import InternationalString, MaintainableArtefact, \
     NameableArtefact
 from sdmxthon.model.header import Contact
 from sdmxthon.model.representation import Representation
-from sdmxthon.model.utils import bool_setter, generic_setter
+from sdmxthon.model.utils import bool_setter, generic_setter, \
+    structure_changed
 from sdmxthon.parsers.writer_aux import add_indent, export_intern_data
 from sdmxthon.utils.handlers import split_unique_id
 from sdmxthon.utils.mappings import structureAbbr
@@ -101,6 +102,7 @@ class ItemScheme(MaintainableArtefact):
                         value.parent in self._items.keys()):
                     self._items[value.parent].add_child(value.id)
                     value.parent = self._items[value.parent]
+                structure_changed()
         else:
             raise TypeError(
                 f"The object has to be of the type {self._itemType}")
@@ -579,6 +581,7 @@ class Concept(Item):
     def core_representation(self, value):
         from .representation import Representation
         self._coreRepresentation = generic_setter(value, Representation)
+        structure_changed()
 
     def _parse_XML(self, indent, head):
         outfile = super(Concept, self)._parse_XML(indent, head)
@@ -1,18 +1,25 @@
 """
     Message file contains the Message class for the use of external assets
 """
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from typing import Dict
 
 from sdmxthon.model.dataset import Dataset
 from sdmxthon.model.error import SDMXError
 from sdmxthon.model.header import Header
 from sdmxthon.model.submission import SubmissionResult
+from sdmxthon.parsers.data_validations import get_n_jobs
 from sdmxthon.parsers.write import writer
 from sdmxthon.utils.enums import MessageTypeEnum
 from sdmxthon.webservices.fmr import submit_structures_to_fmr
 
 
+def _structural_validation(dataset: Dataset, **kwargs):
+    return dataset.structural_validation(**kwargs)
+
+
 class Message:
     """ Message class holds the type of SDMX Message, its payload and its
     header.
@@ -117,18 +124,53 @@ class Message:
             if isinstance(e, Dataset):
                 e.set_dimension_at_observation(dim_at_obs)
 
-    def validate(self):
+    def validate(self, n_jobs: int = None, executor: Executor = None,
+                 max_errors: int = None, fail_fast: bool = False,
+                 summary: bool = False):
         """Performs the semantic validation if the Payload is all Datasets
 
+        :param n_jobs: Number of processes validating the datasets
+                       (-1 uses all CPUs). With only one dataset, the number
+                       of threads validating its components
+        :type n_jobs: int
+
+        :param executor: concurrent.futures Executor used to validate the
+                         datasets, instead of creating a process pool
+        :type executor: `Executor`
+
+        :param max_errors: Maximum number of errors found on each dataset
+        :type max_errors: int
+
+        :param fail_fast: Stops the validation of each dataset on the first
+                          error
+        :type fail_fast: bool
+
+        :param summary: Returns only the number of errors by code and
+                        component of each dataset
+        :type summary: bool
+
         :raises:
             TypeError: if the payload is not a DataSet or a dict of DataSets
         """
         validations = {}
         if (isinstance(self.payload, dict) and
                 all(isinstance(n, Dataset) for n in self.payload.values())):
-            for e in self.payload.values():
-                e: Dataset
-                list_errors = e.structural_validation()
+            datasets = list(self.payload.values())
+            n_jobs = get_n_jobs(n_jobs)
+            validation = partial(_structural_validation,
+                                 max_errors=max_errors, fail_fast=fail_fast,
+                                 summary=summary)
+            if executor is not None and len(datasets) > 1:
+                results = executor.map(validation, datasets)
+            elif n_jobs > 1 and len(datasets) > 1:
+                # Datasets (data and structure) are pickled to the workers
+                with ProcessPoolExecutor(
+                        max_workers=min(n_jobs, len(datasets))) as pool:
+                    results = list(pool.map(validation, datasets))
+            else:
+                results = [validation(e, n_jobs=n_jobs) for e in datasets]
+
+            for e, list_errors in zip(datasets, results):
                 if len(list_errors) > 0:
                     validations[e.structure.id] = list_errors
             if len(validations) == 0:
@@ -136,7 +178,9 @@ class Message:
 
             return validations
         elif isinstance(self.payload, Dataset):
-            return self.payload.structural_validation()
+            return self.payload.structural_validation(
+                n_jobs=n_jobs, max_errors=max_errors, fail_fast=fail_fast,
+                summary=summary)
         else:
             raise TypeError('Wrong Payload. Must be of type '
                             'DataSet or a dict of DataSet')
@@ -182,11 +226,15 @@ class Message:
                prepared: datetime = None,
                sender: str = 'Unknown',
                receiver: str = 'Not_supplied',
-               prettyprint=True) -> str:
+               prettyprint=True,
+               n_jobs: int = None,
+               executor: Executor = None,
+               compression='infer') -> str:
         """Exports its payload to a XML file in SDMX-ML 2.1 format
 
-        :param output_path: Path to save the file, defaults to ''
-        :type output_path: str
+        :param output_path: Path to save the file or a text or binary \
+        stream to write to (file, socket...), defaults to ''
+        :type output_path: str or file-like object
 
         :param prettyprint: Specifies if the output file is formatted
         :type prettyprint: bool
@@ -215,6 +263,19 @@ class Message:
         :param receiver: ID of the Receiver, defaults to 'Not_supplied'
         :type receiver: str
 
+        :param n_jobs: Number of processes writing the chunks of the data
+                       (-1 uses all CPUs)
+        :type n_jobs: int
+
+        :param executor: concurrent.futures Executor used to write the
+                         chunks of the data, instead of creating a process pool
+        :type executor: `Executor`
+
+        :param compression: Compression of the output: 'infer' (from the \
+        extension of output_path: .gz, .zst or .zip), 'gzip', 'zstd', 'zip' \
+        or None, defaults to 'infer'
+        :type compression: str
+
         :returns: A str, if outputPath is ''
 
         """
@@ -226,11 +287,14 @@ class Message:
             return writer(path=output_path, type_=self.type,
                           payload=self.payload, id_=id_, test=test,
                           prepared=prepared, sender=sender, receiver=receiver,
-                          header=header, prettyprint=prettyprint)
+                          header=header, prettyprint=prettyprint,
+                          n_jobs=n_jobs, executor=executor,
+                          compression=compression)
         writer(path=output_path, type_=self.type, payload=self.payload,
                id_=id_, test=test, header=header,
                prepared=prepared, sender=sender, receiver=receiver,
-               prettyprint=prettyprint)
+               prettyprint=prettyprint, n_jobs=n_jobs,
+               executor=executor, compression=compression)
 
 
 if __name__ == '__main__':
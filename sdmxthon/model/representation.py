@@ -1,6 +1,7 @@
 from typing import List
 
-from sdmxthon.model.utils import FacetType, string_setter, FacetValueType
+from sdmxthon.model.utils import FacetType, string_setter, \
+    FacetValueType, structure_changed
 
 
 class Facet:
@@ -49,10 +50,12 @@ class Facet:
                 raise ValueError(f"The facet {value} is not recognised")
         else:
             raise ValueError("Facet dim_type should be of the str dim_type")
+        structure_changed()
 
     @facet_value.setter
     def facet_value(self, value):
         self._facetValue = string_setter(value)
+        structure_changed()
 
     @facet_value_type.setter
     def facet_value_type(self, value):
@@ -115,6 +118,7 @@ class Representation(object):
     @codelist.setter
     def codelist(self, value):
         self._codelist = value
+        structure_changed()
 
     @concept_scheme.setter
     def concept_scheme(self, value):
@@ -123,10 +127,12 @@ class Representation(object):
     @facets.setter
     def facets(self, value):
         self._facets = value
+        structure_changed()
 
     def add_facet(self, value):
         """Add a facet to the list"""
         self._facets.append(value)
+        structure_changed()
 
     @property
     def type_(self):
@@ -2,6 +2,8 @@
     Utils has some handling functions for the model module
 """
 
+import itertools
+import os
 import re
 from base64 import b64encode
 from datetime import datetime
@@ -160,6 +162,26 @@ def generic_setter(value, class_):
                     f"{class_.__name__} class. {type(value)} passed")
 
 
+_versions = itertools.count(1)
+_structure_version = 0
+
+
+def structure_changed():
+    """Marks a change on the components, codelists or constraints, so the
+    validation plans and indexes built before are rebuilt. It is called by
+    their setters: changes made in place on the lists and dicts returned
+    by the getters are not detected"""
+    global _structure_version
+    _structure_version = next(_versions)
+
+
+def structure_version() -> tuple:
+    """Number of the last change on the components, codelists or
+    constraints. The process id is included, as the objects copied to
+    other processes keep the plans built on the parent"""
+    return os.getpid(), _structure_version
+
+
 def int_setter(value: int):
     """Generic setter for integer objects
 
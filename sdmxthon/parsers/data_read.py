@@ -4,12 +4,101 @@ import numpy as np
 import pandas as pd
 
 from sdmxthon.model.dataset import Dataset
+from sdmxthon.parsers.data_types import MAX_UNIQUE_RATIO
 from sdmxthon.utils.handlers import add_list
 from sdmxthon.utils.parsing_words import ATTRIBUTES, DIM_OBS, exc_attributes, \
     GENERIC, GROUP, ID, OBS, OBS_DIM, OBSKEY, OBSVALUE, SERIES, SERIESKEY, \
     STRID, STRSPE, STRTYPE, VALUE
 
-chunksize = 50000
+
+class ColumnBuffer:
+    """
+    Accumulates observations as one list per column, so a DataFrame can be
+    built in a single step. Missing values are filled with NaN, as pandas
+    does when building a DataFrame from a list of records.
+
+    :param categorical: Keeps each distinct value of a column only once,
+                        instead of a string per observation. The columns
+                        with few distinct values (at most MAX_UNIQUE_RATIO
+                        of the rows) are built as categorical
+    :param exclude: Columns stored as they are (e.g. OBS_VALUE)
+    """
+
+    def __init__(self, categorical: bool = False, exclude: tuple = ()):
+        self.columns = {}
+        self.length = 0
+        self.categorical = categorical
+        self.exclude = frozenset(exclude)
+        self.values = {}
+
+    def __len__(self):
+        return self.length
+
+    def append(self, *parts: dict):
+        """
+        Adds a row built from one or more dicts. Later dicts take
+        precedence over the previous ones, as in {**first, **second}
+        """
+        if self.categorical:
+            self._append_values(parts)
+            return
+        n = self.length
+        for part in parts:
+            for k, v in part.items():
+                column = self.columns.get(k)
+                if column is None:
+                    column = self.columns[k] = []
+                missing = n - len(column)
+                if missing < 0:
+                    column[n] = v
+                    continue
+                if missing > 0:
+                    column.extend([np.nan] * missing)
+                column.append(v)
+        self.length = n + 1
+
+    def _append_values(self, parts):
+        # Same as append, replacing each value by the first equal one
+        n = self.length
+        for part in parts:
+            for k, v in part.items():
+                column = self.columns.get(k)
+                if column is None:
+                    column = self.columns[k] = []
+                    self.values[k] = None if k in self.exclude else {}
+                values = self.values[k]
+                if values is not None and v is not None:
+                    v = values.setdefault(v, v)
+                missing = n - len(column)
+                if missing < 0:
+                    column[n] = v
+                    continue
+                if missing > 0:
+                    column.extend([np.nan] * missing)
+                column.append(v)
+        self.length = n + 1
+
+    def to_columns(self) -> dict:
+        """Returns the columns padded to the same length and empties the
+        buffer"""
+        for k, column in self.columns.items():
+            missing = self.length - len(column)
+            if missing > 0:
+                column.extend([np.nan] * missing)
+            values = self.values.get(k)
+            if (values is not None and
+                    len(values) <= self.length * MAX_UNIQUE_RATIO):
+                self.columns[k] = pd.Categorical(column,
+                                                 categories=list(values))
+        columns = self.columns
+        self.columns = {}
+        self.values = {}
+        self.length = 0
+        return columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """Builds the DataFrame and empties the buffer"""
+        return pd.DataFrame(self.to_columns())
 
 
 def get_element_to_list(data, mode):
@@ -21,22 +110,9 @@ def get_element_to_list(data, mode):
     return obs
 
 
-def process_df(test_list: list, df: pd.DataFrame):
-    if len(test_list) > 0:
-        if df is not None:
-            df = pd.concat([df, pd.DataFrame(test_list)], ignore_index=True)
-        else:
-            df = pd.DataFrame(test_list)
-
-    del test_list[:]
-
-    return test_list, df
-
-
 def reading_generic_series(dataset) -> pd.DataFrame:
     # Generic Series
-    test_list = []
-    df = None
+    buffer = ColumnBuffer()
     dataset[SERIES] = add_list(dataset[SERIES])
     for series in dataset[SERIES]:
         keys = dict()
@@ -61,19 +137,14 @@ def reading_generic_series(dataset) -> pd.DataFrame:
                 obs[OBSVALUE.upper()] = None
             if ATTRIBUTES in data:
                 obs = {**obs, **get_element_to_list(data, mode=ATTRIBUTES)}
-            test_list.append({**keys, **obs})
-        if len(test_list) > chunksize:
-            test_list, df = process_df(test_list, df)
+            buffer.append(keys, obs)
 
-    test_list, df = process_df(test_list, df)
-
-    return df
+    return buffer.to_frame()
 
 
 def reading_generic_all(dataset) -> pd.DataFrame:
     # Generic All Dimensions
-    test_list = []
-    df = None
+    buffer = ColumnBuffer()
     dataset[OBS] = add_list(dataset[OBS])
     for data in dataset[OBS]:
         obs = dict()
@@ -85,44 +156,59 @@ def reading_generic_all(dataset) -> pd.DataFrame:
                 obs[OBSVALUE.upper()] = data[OBSVALUE][VALUE.lower()]
         if ATTRIBUTES in data:
             obs = {**obs, **get_element_to_list(data, mode=ATTRIBUTES)}
-        test_list.append({**obs})
-        if len(test_list) > chunksize:
-            test_list, df = process_df(test_list, df)
-
-    test_list, df = process_df(test_list, df)
+        buffer.append(obs)
 
-    return df
+    return buffer.to_frame()
 
 
 def reading_str_series(dataset) -> pd.DataFrame:
     # Structure Specific Series
-    test_list = []
-    df = None
+    # Series keys are stored once per series and repeated by the number
+    # of observations, instead of being copied on every row
+    series_buffer = ColumnBuffer()
+    obs_buffer = ColumnBuffer()
+    counts = []
+    order = {}
+    obs_columns_seen = 0
     dataset[SERIES] = add_list(dataset[SERIES])
     for data in dataset[SERIES]:
         keys = dict(itertools.islice(data.items(), len(data) - 1))
         if not isinstance(data[OBS], list):
             data[OBS] = [data[OBS]]
+        series_buffer.append(keys)
+        order.update(dict.fromkeys(keys))
         for j in data[OBS]:
-            test_list.append({**keys, **j})
-        if len(test_list) > chunksize:
-            test_list, df = process_df(test_list, df)
-
-    test_list, df = process_df(test_list, df)
+            obs_buffer.append(j)
+        counts.append(len(data[OBS]))
+        if len(obs_buffer.columns) > obs_columns_seen:
+            order.update(dict.fromkeys(obs_buffer.columns))
+            obs_columns_seen = len(obs_buffer.columns)
+
+    series_columns = series_buffer.to_columns()
+    obs_columns = obs_buffer.to_columns()
+    columns = {}
+    for k in order:
+        if k in series_columns:
+            values = np.repeat(np.array(series_columns[k], dtype=object),
+                               counts)
+            if k in obs_columns:
+                # Observation values take precedence over the series keys
+                obs_values = np.array(obs_columns[k], dtype=object)
+                values = np.where(pd.isna(obs_values), values, obs_values)
+            columns[k] = values
+        else:
+            columns[k] = obs_columns[k]
 
-    return df
+    return pd.DataFrame(columns)
 
 
 def reading_group_data(dataset) -> pd.DataFrame:
     # Structure Specific Group Data
-    test_list = []
-    df = None
+    buffer = ColumnBuffer()
     dataset[GROUP] = add_list(dataset[GROUP])
     for data in dataset[GROUP]:
-        test_list.append(dict(data.items()))
-        if len(test_list) > chunksize:
-            test_list, df = process_df(test_list, df)
-    test_list, df = process_df(test_list, df)
+        buffer.append(data)
+    df = buffer.to_frame()
 
     cols_to_delete = [x for x in df.columns if ':type' in x]
     for x in cols_to_delete:
@@ -0,0 +1,169 @@
+"""
+    Conversion of the data read from SDMX files to memory efficient dtypes
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from sdmxthon.model.definitions import DataStructureDefinition
+from sdmxthon.utils.mappings import Data_Types_VTL
+
+DTYPE_BACKENDS = ['categorical', 'pyarrow']
+
+OBS_VALUE = 'OBS_VALUE'
+TIME_PERIOD = 'TIME_PERIOD'
+
+# Maximum distinct values by row of a column considered coded without DSD
+MAX_UNIQUE_RATIO = 0.5
+
+
+def check_dtype_backend(dtype_backend):
+    if dtype_backend is not None and dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f'Invalid dtype_backend {dtype_backend}, '
+                         f'allowed values are {DTYPE_BACKENDS}')
+
+
+def check_pyarrow():
+    if pa is None:
+        raise ImportError('pyarrow is required for Arrow output, '
+                          'install it with pip install sdmxthon[arrow]')
+
+
+def check_arrow_dtype():
+    check_pyarrow()
+    if not hasattr(pd, 'ArrowDtype'):
+        raise ImportError(f'pandas>=1.5 is required for the pyarrow '
+                          f'dtype_backend ({pd.__version__} installed), '
+                          f'install it with pip install sdmxthon[arrow]')
+
+
+def is_numeric_type(type_: str) -> bool:
+    return Data_Types_VTL.get(type_) in ('Integer', 'Number')
+
+
+def to_categorical(column: pd.Series, categories: list = None):
+    """
+    Converts a column to categorical. The categories (codelist values) are
+    seeded first, so that they are shared among datasets with the same DSD.
+    Values not present in the categories are kept.
+    """
+    if categories is None:
+        return column.astype('category')
+    values = column.dropna().unique()
+    categories = pd.Index(categories).append(
+        pd.Index(values).difference(categories, sort=False))
+    return column.astype(pd.CategoricalDtype(categories))
+
+
+def to_numeric(column: pd.Series):
+    """Converts a column to numeric, keeping it as it is if not possible"""
+    try:
+        return pd.to_numeric(column.replace('', np.nan))
+    except (TypeError, ValueError):
+        return column
+
+
+def to_arrow_numeric(column: pd.Series):
+    column = to_numeric(column)
+    if column.dtype == object:
+        return column.astype('string[pyarrow]')
+    return column.astype(pd.ArrowDtype(pa.from_numpy_dtype(column.dtype)))
+
+
+def numeric_measure(dsd: DataStructureDefinition):
+    """Returns the measure code if its representation is numeric"""
+    if dsd is None or dsd.measure_descriptor is None:
+        return None
+    types = dsd.validation_plan.types
+    if is_numeric_type(types.get(dsd.measure_code)):
+        return dsd.measure_code
+    return None
+
+
+def coded_columns(data: pd.DataFrame, dsd: DataStructureDefinition = None):
+    """
+    Returns the components with a codelist present in the data, with the
+    codelist values. Without DSD, the string columns with few distinct
+    values (at most MAX_UNIQUE_RATIO of the rows) are considered coded,
+    except OBS_VALUE and TIME_PERIOD.
+    """
+    if dsd is None:
+        max_unique = len(data) * MAX_UNIQUE_RATIO
+        return {k: None for k in data.columns
+                if k not in (OBS_VALUE, TIME_PERIOD) and
+                data[k].dtype == object and data[k].nunique() <= max_unique}
+
+    plan = dsd.validation_plan
+    return {k: plan.codelist_values[k] for k in data.columns
+            if k in plan.codelist_values}
+
+
+def convert_dtypes(data: pd.DataFrame,
+                   dsd: DataStructureDefinition = None,
+                   dtype_backend: str = None) -> pd.DataFrame:
+    """
+    Converts the columns of a DataFrame to the dtypes of a backend
+
+    :param data: Pandas DataFrame with the data as read from the file
+    :param dsd: DataStructureDefinition of the data. Only the components
+                with a codelist are converted to categorical. If not
+                present, only the string columns with few distinct values
+    :param dtype_backend: 'categorical', 'pyarrow' or None (no conversion).
+                          The columns are converted after reading, so the
+                          peak memory does not fall, only the memory held
+                          by the DataFrame afterwards. 'pyarrow' is an
+                          output format change only, and requires
+                          pandas>=1.5
+    :return: A Pandas DataFrame
+    """
+    check_dtype_backend(dtype_backend)
+    if dtype_backend is None or len(data.columns) == 0:
+        return data
+    if dtype_backend == 'pyarrow':
+        check_arrow_dtype()
+
+    data = data.copy(deep=False)
+    coded = coded_columns(data, dsd)
+    measure = numeric_measure(dsd)
+    for k in data.columns:
+        if k == measure:
+            data[k] = to_numeric(data[k]) if dtype_backend == 'categorical' \
+                else to_arrow_numeric(data[k])
+        elif dtype_backend == 'categorical':
+            if k in coded:
+                data[k] = to_categorical(data[k], coded[k])
+        elif data[k].dtype == object:
+            data[k] = data[k].astype('string[pyarrow]')
+    return data
+
+
+def to_arrow_table(data: pd.DataFrame,
+                   dsd: DataStructureDefinition = None,
+                   dictionary_encode: bool = False):
+    """
+    Converts a DataFrame to a pyarrow Table. The data is read as usual
+    and converted afterwards, so only the output format changes
+
+    :param data: Pandas DataFrame
+    :param dsd: DataStructureDefinition of the data
+    :param dictionary_encode: Dictionary encodes the string columns of the
+                              coded components (see coded_columns).
+                              Categorical columns are always encoded
+    :return: A pyarrow Table
+    """
+    check_pyarrow()
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    if not dictionary_encode:
+        return table
+    coded = coded_columns(data, dsd)
+    for i, field in enumerate(table.schema):
+        if (field.name in coded and
+                (pa.types.is_string(field.type) or
+                 pa.types.is_large_string(field.type))):
+            table = table.set_column(i, field.name,
+                                     table.column(i).dictionary_encode())
+    return table
@@ -1,6 +1,9 @@
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from datetime import datetime
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
@@ -50,7 +53,47 @@ def get_mandatory_attributes(dsd: DataStructureDefinition) -> list:
     return data
 
 
-def validate_data(data: DataFrame, dsd: DataStructureDefinition):
+class ValidationPlan:
+    """
+    Codes, facets and constraints of a DataStructureDefinition used on the
+    structural validation. It is built once per DSD
+    (see DataStructureDefinition.validation_plan), so validating many
+    datasets with the same DSD only runs the checks
+    """
+
+    def __init__(self, dsd: DataStructureDefinition, key: tuple = None):
+        self.key = key
+        self.measure_code = dsd.measure_code \
+            if dsd.measure_descriptor is not None else None
+        self.dimension_codes = dsd.dimension_codes
+        self.attribute_codes = frozenset(dsd.attribute_codes)
+        self.mandatory = get_mandatory_attributes(dsd)
+        self.codelist_values = get_codelist_values(dsd)
+        self.codelist_sets = {k: frozenset(v) for k, v in
+                              self.codelist_values.items()}
+        self.faceted, self.types = dsd._facet_type
+        self.time_checks = {}
+        for k, v in self.types.items():
+            time_check = get_time_check(v)
+            if time_check is not None:
+                self.time_checks[k] = time_check
+        self.cubes, _ = dsd._format_constraints
+        self.series_index = SeriesKeyIndex()
+        for c in dsd.constraints or []:
+            if c.role == "Allowed" and c.data_content_keys:
+                self.series_index.update(c.series_key_index)
+        self.man_codes = frozenset(self.dimension_codes + self.mandatory)
+
+        dataset_attributes = set(dsd.dataset_attribute_codes)
+        self.all_codes = [k for k in self.dimension_codes +
+                          dsd.attribute_codes
+                          if k not in dataset_attributes]
+
+
+def validate_data(data: DataFrame, dsd: DataStructureDefinition,
+                  max_duplicated_rows: int = None, n_jobs: int = None,
+                  max_errors: int = None, fail_fast: bool = False,
+                  summary: bool = False):
     """
         Data validations stands for the next schema:
 
@@ -87,65 +130,143 @@ def validate_data(data: DataFrame, dsd: DataStructureDefinition):
                 Cube Region Constraint is valid
             * - SS11
               - Check if each row is compliant with the Series Constraints
+
+        :param data: Pandas DataFrame to be validated
+        :param dsd: DataStructureDefinition of the data
+        :param max_duplicated_rows: Maximum number of row indices reported
+                                    on each SS07 error (default: all)
+        :param n_jobs: Number of threads validating the columns
+                       (-1 uses all CPUs, default: 1)
+        :param max_errors: Stops the validation once this number of errors
+                           is found (default: all)
+        :param fail_fast: Stops on the first error (max_errors=1)
+        :param summary: Returns only the number of errors by code and
+                        component, without the rows of each error
+        :return: A list of errors, or a dict {code: {component: count}}
+                 if summary is True
     """
 
-    mandatory = get_mandatory_attributes(dsd)
-    codelist_values = get_codelist_values(dsd)
+    plan = dsd.validation_plan
+    if fail_fast:
+        max_errors = 1
+    if max_errors is not None and max_errors < 1:
+        raise ValueError('max_errors must be a positive integer')
+    if max_duplicated_rows is not None and (
+            not isinstance(max_duplicated_rows, (int, np.integer)) or
+            isinstance(max_duplicated_rows, bool) or
+            max_duplicated_rows < 1):
+        raise ValueError('max_duplicated_rows must be a positive integer')
+    rows = not summary
 
     errors = []
 
-    faceted, types = dsd._facet_type
+    process_measure_errors(plan, data, errors, rows)
+
+    grouping_keys = []
+
+    columns = validate_columns(data, plan, n_jobs, rows)
+    try:
+        for column_errors, column_keys in columns:
+            if budget_reached(errors, max_errors):
+                break
+            errors += column_errors
+            grouping_keys += column_keys
+    finally:
+        columns.close()
+
+    if len(plan.series_index) > 0 and \
+            not budget_reached(errors, max_errors):
+        error_SS11(data, plan.series_index, errors, rows)
+
+    if len(grouping_keys) > 0 and not budget_reached(errors, max_errors):
+        error_SS07(data, grouping_keys, errors, max_duplicated_rows, rows)
+
+    if max_errors is not None:
+        del errors[max_errors:]
+
+    if summary:
+        return summarise_errors(errors)
+    return errors
 
-    cubes, series_const = dsd._format_constraints
 
-    process_measure_errors(dsd, data, errors, faceted, types)
+def budget_reached(errors: list, max_errors: int = None) -> bool:
+    return max_errors is not None and len(errors) >= max_errors
 
+
+def summarise_errors(errors: list) -> dict:
+    """
+    Counts the errors by code and component
+
+    :return: A dict {code: {component: number of errors}}
+    """
+    summary = {}
+    for e in errors:
+        components = summary.setdefault(e['Code'], {})
+        components[e['Component']] = components.get(e['Component'], 0) + 1
+    return summary
+
+
+def get_n_jobs(n_jobs: int = None) -> int:
+    """Number of workers for n_jobs (None is 1, -1 all the CPUs)"""
+    if n_jobs is None:
+        return 1
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError('n_jobs must be a positive integer or -1')
+    return n_jobs
+
+
+def validate_column(data: DataFrame, plan: ValidationPlan, k: str,
+                    rows: bool = True):
+    """
+    Validates one component of the data
+
+    :return: The errors and the grouping keys (dimensions) found
+    """
+    errors = []
     grouping_keys = []
+    if k not in data.keys() or data[k].isnull().values.all():
+        if k in plan.mandatory:
+            errors.append(
+                {'Code': 'SS03', 'ErrorLevel': 'CRITICAL',
+                 'Component': f'{k}', 'Type': 'Attribute', 'Rows': None,
+                 'Message': f'Missing {k}'})
+        elif k in plan.dimension_codes:
+            errors.append(
+                {'Code': 'SS01', 'ErrorLevel': 'CRITICAL',
+                 'Component': f'{k}', 'Type': 'Dimension', 'Rows': None,
+                 'Message': f'Missing {k}'})
+    else:
+        process_errors_by_column(data, plan, errors, k, grouping_keys, rows)
+    return errors, grouping_keys
 
-    all_codes = dsd.dimension_codes + dsd.attribute_codes
-
-    for k in dsd.dataset_attribute_codes:
-        if k in all_codes:
-            all_codes.remove(k)
-
-    man_codes = dsd.dimension_codes + mandatory
-
-    for k in all_codes:
-        if k not in data.keys() or data[k].isnull().values.all():
-            if k in mandatory:
-                errors.append(
-                    {'Code': 'SS03', 'ErrorLevel': 'CRITICAL',
-                     'Component': f'{k}', 'Type': 'Attribute', 'Rows': None,
-                     'Message': f'Missing {k}'})
-            elif k in dsd.dimension_codes:
-                errors.append(
-                    {'Code': 'SS01', 'ErrorLevel': 'CRITICAL',
-                     'Component': f'{k}', 'Type': 'Dimension', 'Rows': None,
-                     'Message': f'Missing {k}'})
-            continue
-        else:
-            process_errors_by_column(data, dsd, errors, k, man_codes,
-                                     grouping_keys,
-                                     faceted, types, codelist_values, cubes)
-
-    if len(series_const) > 0:
-        error_SS11(data, series_const, errors)
-
-    if len(grouping_keys) > 0:
-        duplicated = data[data.duplicated(subset=grouping_keys, keep=False)]
-        if len(duplicated) > 0:
-            indexes = list(duplicated.index)
-            duplicated_dict = duplicated.to_dict(orient="records")
-            rows = dict(zip(indexes, duplicated_dict))
-            duplicated.groupby(by=grouping_keys).apply(
-                lambda x: create_error_SS07(x, rows, errors, grouping_keys)
-            )
-            del indexes
-            del duplicated_dict
-            del rows
-        del duplicated
 
-    return errors
+def validate_columns(data: DataFrame, plan: ValidationPlan,
+                     n_jobs: int = None, rows: bool = True):
+    """
+    Validates the components of the data, in a thread pool if n_jobs is
+    greater than 1. The threads share the DataFrame, no data is copied.
+    Closing the generator cancels the components not validated yet
+
+    :return: A generator of the errors and grouping keys of each
+             component, in the order of the components
+    """
+    n_jobs = min(get_n_jobs(n_jobs), len(plan.all_codes))
+    if n_jobs <= 1:
+        for k in plan.all_codes:
+            yield validate_column(data, plan, k, rows)
+        return
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(validate_column, data, plan, k, rows)
+                   for k in plan.all_codes]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
 
 
 # Time validations
@@ -184,6 +305,32 @@ reporting_periods = {'ReportingYear': "A[1]", 'ReportingSemester': "S[1-2]",
                      }
 
 
+# Values always valid for each time type. They are checked with pandas on
+# all the values at once, the rest are validated one by one
+regex_year = r'(19(0[1-9]|[1-9][0-9])|[2-9][0-9]{3})'
+
+fast_patterns = {
+    'ObservationalTimePeriod': f'{regex_monthly}|{regex_specials}',
+    'StandardTimePeriod': f'{regex_monthly}|{regex_specials}',
+    'BasicTimePeriod': f'{regex_monthly}|{regex_specials}',
+    'GregorianTimePeriod': regex_monthly,
+    'ReportingTimePeriod': regex_specials,
+    'GregorianYear': regex_year,
+    'GregorianYearMonth': regex_year + r'-(0[1-9]|1[012])',
+    'GregorianDay': regex_year + r'-(0[1-9]|1[012])-(0[1-9]|1[0-9]|2[0-8])'
+}
+
+for period in reporting_periods:
+    fast_patterns[period] = regex_specials
+
+fast_matchers = {k: re.compile(v) for k, v in fast_patterns.items()}
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(format_: str):
+    return re.compile(format_)
+
+
 def check_date(e, format_: str):
     try:
         res = datetime.strptime(e, format_)
@@ -197,7 +344,7 @@ def check_date(e, format_: str):
 
 def check_reporting(e, format_):
     # Matching semester, quarter and trimester
-    match_reporting = re.compile(format_)
+    match_reporting = compile_pattern(format_)
 
     try:
         res = match_reporting.fullmatch(e)
@@ -306,59 +453,51 @@ def time_period_valid(dt_str: str, type_: str):
     return process_special_time_format(dt_str)
 
 
-def error_SS09(k, time_types, data_column, errors, role):
-    if time_types[k] in time_periods:
-        create_error_SS09(data_column, time_types[k], time_types[k], k,
-                          role, errors, time_period_valid)
-    elif time_types[k] in gregorian_periods:
-        format_ = gregorian_periods[time_types[k]]
-        create_error_SS09(data_column, format_, time_types[k], k,
-                          role, errors, check_date)
+def check_date_time(e, type_):
+    """Validates DateTime and TimeRange (DateTime/Duration) values"""
+    if type_ == "TimeRange":
+        if '/' not in e:
+            return False
+        e, duration = e.split('/', maxsplit=1)
+        try:
+            if not match_duration.fullmatch(duration):
+                return False
+        except (TypeError, ValueError):
+            return False
 
-    elif time_types[k] in reporting_periods:
+    try:
+        res = datetime.fromisoformat(e)
+        if not 1900 < res.year <= 9999:
+            return False
+    except (TypeError, ValueError):
+        return False
+    return True
 
-        format_ = r'(19|[2-9][0-9])\d{2}-' + reporting_periods[time_types[k]]
 
+def get_time_check(time_type: str):
+    """
+    Returns the format and the function used to validate a time type, or
+    None if the type is not a time type
+    """
+    if time_type in time_periods:
+        return time_type, time_period_valid
+    if time_type in gregorian_periods:
+        return gregorian_periods[time_type], check_date
+    if time_type in reporting_periods:
+        return (r'(19|[2-9][0-9])\d{2}-' + reporting_periods[time_type],
+                time_period_valid)
+    if time_type.lower() == "datetime" or time_type == "TimeRange":
+        return time_type, check_date_time
+    return None
+
+
+def error_SS09(k, time_types, data_column, errors, role, time_check=None):
+    if time_check is None:
+        time_check = get_time_check(time_types[k])
+    if time_check is not None:
+        format_, func = time_check
         create_error_SS09(data_column, format_, time_types[k], k,
-                          role, errors, time_period_valid)
-
-    elif time_types[k].lower() == "datetime" or time_types[k] == "TimeRange":
-        for e in data_column:
-            invalid_date = False
-            duration = ""
-            control_changed = False
-            if time_types[k] == "TimeRange" and '/' not in e:
-                invalid_date = True
-            elif time_types[k] == "TimeRange":
-                duration = e.split('/', maxsplit=1)[1]
-                e = e.split('/', maxsplit=1)[0]
-
-                try:
-                    res = match_duration.fullmatch(duration)
-                    if not res:
-                        invalid_date = True
-                except (TypeError, ValueError):
-                    invalid_date = True
-                duration = '/' + duration
-                control_changed = True
-
-            try:
-                res = datetime.fromisoformat(e)
-                if not 1900 < res.year <= 9999:
-                    invalid_date = True
-            except (TypeError, ValueError):
-                invalid_date = True
-
-            if invalid_date:
-                errors.append(
-                    {'Code': 'SS09', 'ErrorLevel': "CRITICAL",
-                     'Component': f'{k}',
-                     'Type': f'{role}',
-                     'Rows': None,
-                     'Message': f'Value {e + duration} not compliant '
-                                f'with type : {time_types[k]}'})
-            if control_changed:
-                e += duration
+                          role, errors, func)
 
 
 # Facets
@@ -366,105 +505,124 @@ def trunc_dec(x):
     return x.rstrip('0').rstrip('.') if '.' in x else x
 
 
+def trunc_decimals(values) -> np.ndarray:
+    """Removes the trailing zeros of the decimal part (trunc_dec on an
+    array of strings)"""
+    values = pd.Series(values, dtype=object, copy=True)
+    has_point = values.str.contains('.', regex=False).to_numpy(dtype=bool)
+    if has_point.any():
+        values[has_point] = values[has_point].str.rstrip('0').str.rstrip('.')
+    return values.to_numpy(dtype=str)
+
+
+def count_decimals(values: pd.Series) -> np.ndarray:
+    """Number of digits after the decimal point of an array of strings"""
+    point = values.str.find('.').to_numpy()
+    lengths = values.str.len().to_numpy()
+    return np.where(point < 0, 0, lengths - point - 1)
+
+
+def facet_errors(values, key, type_, f, error_level=error_level_facets):
+    return [{'Code': 'SS08', 'ErrorLevel': error_level,
+             'Component': f'{key}', 'Type': f'{type_}',
+             'Rows': None,
+             'Message': f'Value {v} not compliant with '
+                        f'{f.facet_type} : {f.facet_value}'}
+            for v in values]
+
+
+def sequence_errors(values, key, type_, message):
+    return [{'Code': 'SS08', 'ErrorLevel': error_level_facets,
+             'Component': f'{key}', 'Type': f'{type_}',
+             'Rows': None,
+             'Message': message.format(v)}
+            for v in values]
+
+
 def check_sequence(data_column, errors, key, type_, start, interval, end):
-    data_column = np.sort(data_column)
+    data_column = np.sort(data_column[~np.isnan(data_column)])
+    if len(data_column) == 0:
+        return
     control = True
-    if int(data_column[0]) < start:
+    if data_column[0] < start:
         control = False
-        values = data_column[data_column < start].tolist()
-        if len(values) > 0:
-            for v in values:
-                errors.append(
-                    {'Code': 'SS08', 'ErrorLevel': error_level_facets,
-                     'Component': f'{key}', 'Type': f'{type_}',
-                     'Rows': None,
-                     'Message': f'Value {v} not compliant '
-                                f'with startValue : {start}'})
-
-    if end is not None and int(data_column[-1]) > end:
+        errors += sequence_errors(
+            data_column[data_column < start], key, type_,
+            f'Value {{}} not compliant with startValue : {start}')
+
+    if end is not None and data_column[-1] > end:
         control = False
-        values = data_column[data_column > end].tolist()
-        if len(values) > 0:
-            for v in values:
-                errors.append(
-                    {'Code': 'SS08', 'ErrorLevel': error_level_facets,
-                     'Component': f'{key}', 'Type': f'{type_}',
-                     'Rows': None,
-                     'Message': f'Value {v} not compliant '
-                                f'with endValue : {end}'})
+        errors += sequence_errors(
+            data_column[data_column > end], key, type_,
+            f'Value {{}} not compliant with endValue : {end}')
 
     if control:
         values = data_column[(data_column - start) % interval != 0]
-        if len(values) > 0:
-            for v in values:
-                if end is not None:
-                    errors.append(
-                        {'Code': 'SS08', 'ErrorLevel': error_level_facets,
-                         'Component': f'{key}',
-                         'Type': f'{type_}',
-                         'Rows': None,
-                         'Message': f'Value {v} in {key} not compliant '
-                                    f'with sequence : {start}-{end} '
-                                    f'(interval: {interval})'})
-                else:
-                    errors.append(
-                        {'Code': 'SS08', 'ErrorLevel': error_level_facets,
-                         'Component': f'{key}',
-                         'Type': f'{type_}',
-                         'Rows': None,
-                         'Message': f'Value {v} in {key} '
-                                    f'not compliant with sequence : '
-                                    f'{start}-infinite '
-                                    f'(interval: {interval})'})
+        if end is not None:
+            message = f'Value {{}} in {key} not compliant with sequence : ' \
+                      f'{start}-{end} (interval: {interval})'
+        else:
+            message = f'Value {{}} in {key} not compliant with sequence : ' \
+                      f'{start}-infinite (interval: {interval})'
+        errors += sequence_errors(values, key, type_, message)
 
 
 def check_num_facets(facets, data_column, key, type_):
+    """
+    Checks the facets of a numeric component. All the checks are
+    vectorised, data_column should hold the unique values
+
+    :param facets: Facets of the component representation
+    :param data_column: Values as float64
+    :return: A list of SS08 errors
+    """
+    data_column = np.asarray(data_column, dtype='float64')
     errors = []
     is_sequence = None
     start = None
     end = None
     interval = None
+    str_column = None
     for f in facets:
-        values = []
-        if f.facet_type == 'maxLength' or f.facet_type == 'minLength':
-            temp = data_column.astype('str')
-            temp = temp[np.isin(temp, ['nan', 'None'], invert=True)]
-            format_temp = np.vectorize(trunc_dec)
-            length_checker = np.vectorize(len)
-            arr_len = length_checker(format_temp(temp))
-            if f.facet_type == 'maxLength':
-                max_ = int(f.facet_value)
-                values = temp[arr_len > max_]
+        if f.facet_type in ('maxLength', 'minLength', 'decimals'):
+            if str_column is None:
+                temp = data_column.astype('str')
+                temp = temp[np.isin(temp, ['nan', 'None'], invert=True)]
+                str_column = pd.Series(temp, dtype=object)
+            if f.facet_type == 'decimals':
+                decimals = count_decimals(str_column.str.replace(
+                    r'\.?0+$', '', regex=True))
+                values = str_column[decimals > int(f.facet_value)]
             else:
-                min_ = int(f.facet_value)
-                values = temp[arr_len < min_]
+                arr_len = pd.Series(trunc_decimals(str_column.to_numpy()),
+                                    dtype=object).str.len().to_numpy()
+                if f.facet_type == 'maxLength':
+                    values = str_column[arr_len > int(f.facet_value)]
+                else:
+                    values = str_column[arr_len < int(f.facet_value)]
+            values = values.tolist()
 
         elif f.facet_type == 'maxValue':
-            max_ = int(f.facet_value)
-            values = data_column[data_column > max_]
+            values = data_column[data_column > int(f.facet_value)]
         elif f.facet_type == 'minValue':
-            min_ = int(f.facet_value)
-            values = data_column[data_column < min_]
+            values = data_column[data_column < int(f.facet_value)]
         elif f.facet_type == 'isSequence':
             if f.facet_value.upper() == 'TRUE':
                 is_sequence = True
+            continue
         elif f.facet_type == 'startValue':
             start = int(f.facet_value)
+            continue
         elif f.facet_type == 'endValue':
             end = int(f.facet_value)
+            continue
         elif f.facet_type == 'interval':
             interval = int(f.facet_value)
+            continue
         else:
             continue
 
-        if len(values) > 0:
-            for v in values:
-                errors.append(
-                    {'Code': 'SS08', 'ErrorLevel': error_level_facets,
-                     'Component': f'{key}', 'Type': f'{type_}',
-                     'Rows': None,
-                     'Message': f'Value {v} not compliant with '
-                                f'{f.facet_type} : {f.facet_value}'})
+        errors += facet_errors(values, key, type_, f)
 
     if is_sequence is not None and start is not None and interval is not None:
         check_sequence(data_column, errors, key, type_, start, interval, end)
@@ -473,51 +631,61 @@ def check_num_facets(facets, data_column, key, type_):
 
 
 def check_str_facets(facets, data_column, key, type_):
-    data_column = data_column[
-        np.isin(data_column, ['nan', 'None'], invert=True)].astype('str')
+    """
+    Checks the facets of a string component. All the checks are
+    vectorised, data_column should hold the unique values
+
+    :param facets: Facets of the component representation
+    :param data_column: Values as strings
+    :return: A list of SS08 errors
+    """
+    data_column = np.asarray(data_column).astype('str')
+    data_column = pd.Series(
+        data_column[np.isin(data_column, ['nan', 'None'], invert=True)],
+        dtype=object)
 
-    error_level = 'WARNING'
     errors = []
 
     for f in facets:
-        if f.facet_type == 'maxLength' or f.facet_type == 'maxValue':
-            max_ = int(f.facet_value)
+        if f.facet_type in ('maxLength', 'minLength'):
+            arr_len = data_column.str.len()
             if f.facet_type == 'maxLength':
-                length_checker = np.vectorize(len)
-                arr_len = length_checker(data_column)
-                values = data_column[arr_len > max_]
+                values = data_column[arr_len > int(f.facet_value)]
             else:
-                values = data_column[int(data_column) > max_]
-        elif f.facet_type == 'minLength' or f.facet_type == 'minValue':
-            min_ = int(f.facet_value)
-            if f.facet_type == 'minLength':
-                length_checker = np.vectorize(len)
-                arr_len = length_checker(data_column)
-                values = data_column[arr_len < min_]
+                values = data_column[arr_len < int(f.facet_value)]
+        elif f.facet_type in ('maxValue', 'minValue'):
+            numbers = pd.to_numeric(data_column, errors='coerce')
+            if f.facet_type == 'maxValue':
+                values = data_column[numbers > int(f.facet_value)]
             else:
-                values = data_column[int(data_column) < min_]
-
+                values = data_column[numbers < int(f.facet_value)]
+        elif f.facet_type == 'decimals':
+            numbers = pd.to_numeric(data_column, errors='coerce')
+            decimals = count_decimals(data_column.str.replace(
+                r'\.?0+$', '', regex=True))
+            values = data_column[numbers.notna().to_numpy() &
+                                 (decimals > int(f.facet_value))]
         elif f.facet_type == 'pattern':
-            r = re.compile(str(f.facet_value))
-            vec = np.vectorize(lambda x: bool(not r.fullmatch(x)))
-            values = data_column[vec(data_column)]
+            matches = data_column.str.fullmatch(
+                compile_pattern(str(f.facet_value)))
+            values = data_column[~matches.to_numpy(dtype=bool)]
         else:
             continue
 
-        if len(values) > 0:
-            for v in values:
-                errors.append({'Code': 'SS08', 'ErrorLevel': error_level,
-                               'Component': f'{key}', 'Type': f'{type_}',
-                               'Rows': None,
-                               'Message': f'Value {v} not compliant with '
-                                          f'{f.facet_type} : {f.facet_value}'})
+        errors += facet_errors(values.tolist(), key, type_, f, 'WARNING')
     return errors
 
 
 # Processing errors
 
-def process_measure_errors(dsd, data, errors, faceted, types):
-    mc = dsd.measure_code
+def error_rows(data: DataFrame, rows: bool = True):
+    """Rows reported on an error, None if rows are not requested"""
+    return data.to_dict('records') if rows else None
+
+
+def process_measure_errors(plan, data, errors, rows: bool = True):
+    mc = plan.measure_code
+    faceted = plan.faceted
     type_ = 'Measure'
 
     if mc not in data.keys() or data[mc].isnull().values.all():
@@ -527,39 +695,34 @@ def process_measure_errors(dsd, data, errors, faceted, types):
              'Message': f'Missing {mc}'})
     elif data[mc].isnull().values.any():
         if 'OBS_STATUS' in data.keys():
-
-            rows = data[
-                (data[mc].isna()) & (data['OBS_STATUS'] != 'M')].to_dict(
-                'records')
-            if len(rows) > 0:
-                errors.append({'Code': 'SS02', 'ErrorLevel': 'CRITICAL',
-                               'Component': f'{mc}', 'Type': f'{type_}',
-                               'Rows': rows.copy(),
-                               'Message': f'Missing value in '
-                                          f'{type_.lower()} {mc}'})
+            missing = (data[mc].isna()) & (data['OBS_STATUS'] != 'M')
         else:
-            rows = data[data[mc].isna()].to_dict('records')
-            if len(rows) > 0:
-                errors.append({'Code': 'SS02', 'ErrorLevel': 'CRITICAL',
-                               'Component': f'{mc}', 'Type': f'{type_}',
-                               'Rows': rows.copy(),
-                               'Message': f'Missing value in '
-                                          f'{type_.lower()} {mc}'})
+            missing = data[mc].isna()
+        if missing.any():
+            errors.append({'Code': 'SS02', 'ErrorLevel': 'CRITICAL',
+                           'Component': f'{mc}', 'Type': f'{type_}',
+                           'Rows': error_rows(data[missing], rows),
+                           'Message': f'Missing value in '
+                                      f'{type_.lower()} {mc}'})
 
     if mc in data.keys() and mc in faceted:
         facets = faceted[mc]
+        # Facets are checked on the distinct values
+        values = data[mc].unique()
         try:
-            data_column = data[mc].astype('float64')
+            data_column = values.astype('float64')
             errors += check_num_facets(facets, data_column, mc, type_)
         except (TypeError, ValueError):
-            data_column = data[mc].astype('str')
+            data_column = values.astype('str')
             errors += check_str_facets(facets, data_column, mc, type_)
 
         del data_column
 
 
-def process_errors_by_column(data, dsd, errors, k, man_codes, grouping_keys,
-                             faceted, types, codelist_values, cubes):
+def process_errors_by_column(data, plan, errors, k, grouping_keys,
+                             rows: bool = True):
+    faceted = plan.faceted
+    types = plan.types
     is_numeric = False
 
     data_column = data[k].unique().astype('str')
@@ -571,7 +734,7 @@ def process_errors_by_column(data, dsd, errors, k, man_codes, grouping_keys,
         except (TypeError, ValueError):
             pass
 
-    if k in dsd.attribute_codes:
+    if k in plan.attribute_codes:
         role = 'Attribute'
         code = 'SS06'
     else:
@@ -579,7 +742,7 @@ def process_errors_by_column(data, dsd, errors, k, man_codes, grouping_keys,
         role = 'Dimension'
         code = 'SS05'
 
-    if k in man_codes:
+    if k in plan.man_codes:
         control = False
         if is_numeric:
             if np.isnan(np.sum(float_column)):
@@ -590,15 +753,15 @@ def process_errors_by_column(data, dsd, errors, k, man_codes, grouping_keys,
         if control:
             pos = data[(data[k] == 'nan') | (data[k] == '') |
                        (data[k].isnull())].index.values
-            rows = data.iloc[pos, :].to_dict('records')
             errors.append({'Code': code, 'ErrorLevel': 'CRITICAL',
                            'Component': f'{k}', 'Type': f'{role}',
-                           'Rows': rows.copy(),
+                           'Rows': error_rows(data.iloc[pos, :], rows),
                            'Message': f'Missing value in '
                                       f'{role.lower()} {k}'})
 
-    if k in types:
-        error_SS09(k, types, data_column, errors, role)
+    if k in plan.time_checks:
+        error_SS09(k, types, data_column, errors, role,
+                   plan.time_checks[k])
 
     if k in faceted:
         facets = faceted[k]
@@ -608,25 +771,33 @@ def process_errors_by_column(data, dsd, errors, k, man_codes, grouping_keys,
             errors += check_str_facets(facets, data_column, k, role)
 
     if is_numeric:
-        data_column = data_column.astype('str')
-        format_temp = np.vectorize(trunc_dec)
-        data_column = format_temp(data_column)
+        data_column = trunc_decimals(data_column.astype('str'))
 
-    if k in cubes.keys():
+    if k in plan.cubes:
         code = 'SS10'
-        values = data_column[
-            np.isin(data_column, list(cubes[k]), invert=True)]
+        values = not_allowed_values(data_column, plan.cubes[k])
         if len(values) > 0:
             create_error_SS10_SS04(values, code, role, k, errors)
 
-    elif k in codelist_values.keys():
+    elif k in plan.codelist_sets:
         code = 'SS04'
-        values = data_column[
-            np.isin(data_column, codelist_values[k], invert=True)]
+        values = not_allowed_values(data_column, plan.codelist_sets[k])
         if len(values) > 0:
             create_error_SS10_SS04(values, code, role, k, errors)
 
 
+def not_allowed_values(data_column, allowed) -> np.ndarray:
+    """
+    Returns the distinct values not present in the allowed values (set)
+
+    :param data_column: Unique values of the column, as strings
+    :param allowed: Set of codes (Codelist or Cube Region values)
+    """
+    mask = np.fromiter((v not in allowed for v in data_column),
+                       dtype=bool, count=len(data_column))
+    return data_column[mask]
+
+
 def create_error_SS10_SS04(values, code, role, k, errors):
     values = values[
         np.isin(values, ['nan', 'None', np.nan], invert=True)]
@@ -646,72 +817,167 @@ def format_row(row, grouping_keys):
     return string
 
 
-def create_error_SS07(x, rows, errors, grouping_keys):
-    elems = [rows[k] for k in list(x.index)]
-    errors.append({'Code': 'SS07',
-                   'ErrorLevel': 'WARNING',
-                   'Component': 'Duplicated',
-                   'Type': 'Datapoint',
-                   'Rows': elems,
-                   'Message': f'Duplicated datapoint '
-                              f'{format_row(elems[0], grouping_keys)}'
-                   })
-
-
-def create_error_SS09(data_column, format_, time_type, comp, role, errors,
-                      func):
-    for e in data_column:
-        if not func(e, format_):
-            errors.append(
-                {'Code': 'SS09', 'ErrorLevel': "CRITICAL",
-                 'Component': f'{comp}',
-                 'Type': f'{role}',
-                 'Rows': None,
-                 'Message': f'Value {e} not compliant with '
-                            f'type : {time_type}'})
-
-
-def error_SS11(data, series_const, errors):
-    lookup = pd.DataFrame(series_const).drop_duplicates() \
-        .reset_index(drop=True)
-    all_columns = lookup.columns.tolist()
-
-    result = all(elem in data.columns.tolist() for elem in all_columns)
-
-    if result:
-        columns = lookup.columns[lookup.isna().any()].tolist()
-
-        lookup['membership_series_const'] = True
+def find_duplicated_groups(data: DataFrame, grouping_keys: list) -> list:
+    """
+    Finds the rows with the same values on the grouping keys. The keys are
+    factorised to integer group ids, so no rows are materialised
 
-        dict_wild = {}
+    :param data: Pandas DataFrame
+    :param grouping_keys: Columns identifying a datapoint
+    :return: A list with the positions of the rows on each group of
+             duplicates, sorted by the key values
+    """
+    positions = np.flatnonzero(
+        data.duplicated(subset=grouping_keys, keep=False).to_numpy())
+    if len(positions) == 0:
+        return []
 
-        for e in columns:
-            dict_wild[e] = lookup[lookup[e].isna()]
-            dict_wild[e].pop(e)
+    group_ids = data[grouping_keys].iloc[positions] \
+        .groupby(by=grouping_keys, sort=True).ngroup().to_numpy()
+    # Keys with missing values are reported as SS05
+    valid = ~np.isnan(group_ids)
+    positions = positions[valid]
+    group_ids = group_ids[valid]
+
+    order = np.argsort(group_ids, kind='stable')
+    positions = positions[order]
+    bounds = np.flatnonzero(np.diff(group_ids[order])) + 1
+    return np.split(positions, bounds)
+
+
+def error_SS07(data, grouping_keys, errors, max_rows: int = None,
+               rows: bool = True):
+    groups = find_duplicated_groups(data, grouping_keys)
+    if len(groups) == 0:
+        return
+
+    # Only the first row of each group is read, to format the message
+    firsts = data[grouping_keys].iloc[[g[0] for g in groups]] \
+        .to_dict(orient='records')
+    for group, first in zip(groups, firsts):
+        if max_rows is not None:
+            group = group[:max_rows]
+        errors.append({'Code': 'SS07',
+                       'ErrorLevel': 'WARNING',
+                       'Component': 'Duplicated',
+                       'Type': 'Datapoint',
+                       'Rows': data.index[group].tolist() if rows else None,
+                       'Message': f'Duplicated datapoint '
+                                  f'{format_row(first, grouping_keys)}'
+                       })
+
+
+def time_values_valid(values, format_, time_type, func) -> np.ndarray:
+    """
+    Validates the time values, first with the pattern of values always
+    valid for the time type (vectorised) and then the remaining values
+    one by one with func
+    """
+    values = pd.Series(values, dtype=object)
+    valid = np.zeros(len(values), dtype=bool)
+    if time_type in fast_matchers:
+        valid = values.str.fullmatch(fast_matchers[time_type]) \
+            .fillna(False).to_numpy(dtype=bool)
+    pending = np.flatnonzero(~valid)
+    for i in pending:
+        valid[i] = bool(func(values.iat[i], format_))
+    return valid
 
-        res = data[all_columns].merge(lookup, how="left")
 
-        for k in dict_wild:
-            res.update(data[all_columns].merge(dict_wild[k], how="left"),
-                       overwrite=False)
+def create_error_SS09(data_column, format_, time_type, comp, role, errors,
+                      func):
+    values = pd.unique(np.asarray(data_column, dtype=object))
+    valid = time_values_valid(values, format_, time_type, func)
+    for e in values[~valid]:
+        errors.append(
+            {'Code': 'SS09', 'ErrorLevel': "CRITICAL",
+             'Component': f'{comp}',
+             'Type': f'{role}',
+             'Rows': None,
+             'Message': f'Value {e} not compliant with '
+                        f'type : {time_type}'})
 
-        indexes = res[res['membership_series_const'].isna()].index.tolist()
 
-        del res
-        del dict_wild
-        del lookup
-        del all_columns
+class SeriesKeyIndex:
+    """
+    Index of the series keys of the Allowed constraints. Keys are grouped
+    by the components they have a value for (the missing components are
+    wildcards), holding a set with the tuples of values of each group
+    """
 
-        if len(indexes) > 0:
-            rows = data.loc[indexes, :].to_dict('records')
-            errors.append({'Code': 'SS11',
-                           'ErrorLevel': 'WARNING',
-                           'Component': 'Series',
-                           'Type': 'Constraint',
-                           'Rows': rows.copy(),
-                           'Message': 'Found disallowed rows'
-                           })
-            del rows
-    else:
-        del lookup
-        del all_columns
+    def __init__(self, keys: list = None):
+        self.patterns = {}
+        if keys is not None:
+            for key in keys:
+                self.add(key)
+
+    def __len__(self):
+        return sum(len(v) for v in self.patterns.values())
+
+    def add(self, key: dict):
+        components = tuple(sorted(k for k, v in key.items()
+                                  if v is not None))
+        self.patterns.setdefault(components, set()).add(
+            tuple(key[k] for k in components))
+
+    def update(self, other):
+        for components, values in other.patterns.items():
+            self.patterns.setdefault(components, set()).update(values)
+
+    @property
+    def components(self) -> list:
+        result = {}
+        for components in self.patterns:
+            result.update(dict.fromkeys(components))
+        return list(result)
+
+    def allowed(self, data: DataFrame) -> np.ndarray:
+        """
+        Checks the series keys of the data against the index. Only the
+        distinct series keys are looked up
+
+        :param data: Pandas DataFrame with all the components of the index
+        :return: A boolean array, True on the rows matching any key
+        """
+        keys = data[self.components]
+        if len(keys) == 0:
+            return np.zeros(0, dtype=bool)
+        # Codes of the series keys, factorised column by column so they
+        # stay below the number of rows (missing values are code 0)
+        codes = np.zeros(len(keys), dtype=np.int64)
+        for column in self.components:
+            values, uniques = pd.factorize(keys[column])
+            codes = pd.factorize(codes * (len(uniques) + 1) + values + 1)[0]
+        _, first, group_ids = np.unique(codes, return_index=True,
+                                        return_inverse=True)
+        distinct = keys.iloc[first]
+
+        allowed = np.zeros(len(distinct), dtype=bool)
+        for components, values in self.patterns.items():
+            if len(components) == 0:
+                # A key without values allows all the series
+                allowed[:] = True
+                break
+            # Each distinct key is looked up in the set of the group, so
+            # the cost depends on the keys of the data, not of the index
+            allowed |= np.fromiter(
+                (key in values for key in distinct[list(components)]
+                 .itertuples(index=False, name=None)),
+                dtype=bool, count=len(distinct))
+        return allowed[group_ids]
+
+
+def error_SS11(data, series_index: SeriesKeyIndex, errors,
+               rows: bool = True):
+    if not all(k in data.columns for k in series_index.components):
+        return
+
+    disallowed = ~series_index.allowed(data)
+    if disallowed.any():
+        errors.append({'Code': 'SS11',
+                       'ErrorLevel': 'WARNING',
+                       'Component': 'Series',
+                       'Type': 'Constraint',
+                       'Rows': error_rows(data[disallowed], rows),
+                       'Message': 'Found disallowed rows'
+                       })
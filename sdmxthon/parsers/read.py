@@ -1,7 +1,8 @@
-from xml.parsers.expat import ExpatError
+from io import BytesIO
 
 import pandas as pd
 import xmltodict
+from lxml import etree
 
 from sdmxthon.model.dataset import Dataset
 from sdmxthon.model.error import SDMXError
@@ -9,8 +10,10 @@ from sdmxthon.model.submission import SubmissionResult
 from sdmxthon.model.utils import ACTION_SDMX_CSV_MAPPER_READING
 from sdmxthon.parsers.data_read import create_dataset
 from sdmxthon.parsers.metadata_read import create_metadata
-from sdmxthon.parsers.reader_input_processor import process_string_to_read, \
-    validate_doc
+from sdmxthon.parsers.reader_input_processor import ChunkValidator, \
+    is_url, open_source, peek_root, process_stream_to_read, \
+    process_string_to_read
+from sdmxthon.parsers.stream_read import read_xml_stream
 from sdmxthon.utils.enums import ActionEnum
 from sdmxthon.utils.handlers import add_list, split_from_urn
 from sdmxthon.utils.parsing_words import ACTION, AGENCY_ID, ALL_DIM, DATASET, \
@@ -210,18 +213,136 @@ def read_sdmx_csv(infile: str):
     return payload
 
 
+def tree_to_dict(root) -> dict:
+    """
+    Converts a lxml tree to a dict, as xmltodict.parse does with the
+    module options (namespaces removed and no prefix on attributes)
+
+    :param root: lxml root element
+    :return: A dict with the root element as only key
+    """
+    names = {}
+
+    def build_name(tag):
+        name = names.get(tag)
+        if name is None:
+            if tag[0] == '{':
+                uri, local = tag[1:].split('}', 1)
+                prefix = namespaces.get(uri, uri)
+                name = f'{prefix}:{local}' if prefix else local
+            else:
+                name = tag
+            names[tag] = name
+        return name
+
+    def push_data(item, key, value):
+        if item is None:
+            return {key: value}
+        if key in item:
+            if isinstance(item[key], list):
+                item[key].append(value)
+            else:
+                item[key] = [item[key], value]
+        else:
+            item[key] = value
+        return item
+
+    stack = []
+    item = None
+    data = []
+    declarations = {}
+    for event, element in etree.iterwalk(root, events=('start', 'end',
+                                                       'start-ns')):
+        if event == 'start-ns':
+            prefix, uri = element
+            declarations[prefix or ''] = uri or None
+            continue
+        if event == 'start':
+            stack.append((item, data))
+            attrs = {build_name(k): v for k, v in element.attrib.items()}
+            # xmltodict adds the namespace declarations to the next
+            # element with attributes
+            if attrs and declarations:
+                attrs['xmlns'] = declarations
+                declarations = {}
+            item = attrs or None
+            data = [] if element.text is None else [element.text]
+            continue
+
+        text = (''.join(data).strip() or None) if data else None
+        child = item
+        item, data = stack.pop()
+        if child is not None:
+            if text:
+                child['#text'] = text
+            item = push_data(item, build_name(element.tag), child)
+        else:
+            item = push_data(item, build_name(element.tag), text)
+        if element.tail is not None:
+            data.append(element.tail)
+    return item
+
+
+def read_and_validate(infile, max_size: int = None,
+                      first_error_only: bool = False) -> dict:
+    """
+    Parses the XML file with lxml, validating it against the XSD with the
+    same parser, and converts the tree to a dict
+
+    :param infile: Binary file-like object
+    :param max_size: Validates only the first max_size MB of the file
+    :param first_error_only: Reports only the first validation error
+    :return: A dict with the root element as only key
+    """
+    root = None
+    for _, element in ChunkValidator(max_size,
+                                     first_error_only).iterparse(infile):
+        if root is None:
+            root = element
+    return tree_to_dict(root)
+
+
+def xml_source(infile):
+    """
+    Gets the source to be opened with open_source, with SDMX-ML strings
+    as binary streams
+
+    :param infile: Path, URL, SDMX-ML as string or binary stream
+    :return: Path, URL or binary file-like object
+    """
+    source = process_stream_to_read(infile)
+    if source is None:
+        source = process_string_to_read(infile)[0]
+    if isinstance(source, str) and not is_url(source):
+        source = BytesIO(bytes(source, 'UTF_8'))
+    return source
+
+
 def read_xml(infile: str, mode: str = None,
              validate: bool = True,
-             use_dataset_id: bool = False):
-    infile, filetype = process_string_to_read(infile)
-    if validate:
-        validate_doc(infile)
-    try:
-        dict_info = xmltodict.parse(infile, **options)
-    except ExpatError as e:
-        if e.offset > 10:  # UTF-8 BOM
-            raise e
-        dict_info = xmltodict.parse(infile[3:], **options)
+             use_dataset_id: bool = False,
+             streaming: bool = False,
+             validate_max_size: int = None,
+             validate_first_error_only: bool = False,
+             categorical: bool = False):
+    # The source is opened once, URLs are downloaded only once
+    with open_source(xml_source(infile)) as f:
+        root, f = peek_root(f)
+        data = root in (STRSPE, GENERIC)
+        if data and (streaming or validate) and mode in (None, "Data"):
+            # The data is read from the parser validating it
+            return read_xml_stream(
+                f, validate=validate, use_dataset_id=use_dataset_id,
+                validate_max_size=validate_max_size,
+                validate_first_error_only=validate_first_error_only,
+                categorical=categorical)
+        if mode == "Data" and not data:
+            raise TypeError("Unable to parse sdmx file as data file")
+        if validate:
+            dict_info = read_and_validate(f, validate_max_size,
+                                          validate_first_error_only)
+        else:
+            dict_info = xmltodict.parse(f, **options)
 
     del infile
 
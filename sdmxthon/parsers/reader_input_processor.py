@@ -1,40 +1,248 @@
+import bz2
 import csv
+import gzip
+import io
 import json
+import mmap
 import os
-from io import BytesIO, StringIO, TextIOWrapper
+import threading
+from contextlib import contextmanager
+from io import BytesIO, StringIO
 from pathlib import Path
+from zipfile import ZipFile
 
 import requests
 import validators
 from lxml import etree
 
+from sdmxthon.parsers.writer_output import check_zstandard, zstandard
+from sdmxthon.utils import session
 from sdmxthon.utils.xml_allowed_errors import ALLOWED_ERRORS_CONTENT
 
 path_to_schema = 'schemas/SDMXMessage.xsd'
 
+# First bytes of the compressed files
+MAGIC_NUMBERS = {b'\x1f\x8b': 'gzip', b'BZh': 'bz2',
+                 b'\x28\xb5\x2f\xfd': 'zstd', b'PK\x03\x04': 'zip'}
+
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.zst', '.zip')
+
+_schema = None
+_schema_lock = threading.Lock()
+
 
 def URLparsing(infile: str):
     try:
-        response = requests.get(infile)
+        response = session.get(infile)
         if response.status_code == 400:
             raise requests.ConnectionError(
                 f'Invalid URL. Response from server: {response.text}')
-        infile = TextIOWrapper(BytesIO(response.content),
-                               encoding='utf-8',
-                               errors="replace").read()
+        infile = open_stream(BytesIO(response.content))
     except requests.ConnectionError:
         raise requests.ConnectionError('Invalid URL. '
                                        'No response from server')
     return infile
 
 
+def open_url(url: str):
+    """
+    Requests a URL without downloading the body, so it can be parsed by
+    chunks while it is being received
+
+    :param url: URL of the SDMX file
+    :return: The requests Response, its raw attribute is the binary stream
+    """
+    try:
+        response = session.get(url, stream=True)
+    except requests.ConnectionError:
+        raise requests.ConnectionError('Invalid URL. '
+                                       'No response from server')
+    if response.status_code == 400:
+        raise requests.ConnectionError(
+            f'Invalid URL. Response from server: {response.text}')
+    # Content-Encoding (gzip, deflate) is decoded on read
+    response.raw.decode_content = True
+    return response
+
+
+def is_url(source) -> bool:
+    return (isinstance(source, str) and "<" not in source[:10] and
+            bool(validators.url(source)))
+
+
+def get_compression(stream):
+    """
+    Gets the compression of a binary stream from its first bytes, leaving
+    the stream on the same position
+
+    :param stream: Seekable binary file-like object
+    :return: 'gzip', 'bz2', 'zstd', 'zip' or None
+    """
+    position = stream.tell()
+    head = stream.read(4)
+    stream.seek(position)
+    for magic, compression in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def decompress(source, compression: str):
+    """
+    Opens a compressed file to be read by chunks
+
+    :param source: Path or binary file-like object
+    :param compression: 'gzip', 'bz2', 'zstd' or 'zip' (with a single file)
+    :return: Binary file-like object with the decompressed data
+    """
+    if compression == 'gzip':
+        return gzip.open(source, 'rb')
+    if compression == 'bz2':
+        return bz2.open(source, 'rb')
+    if compression == 'zstd':
+        check_zstandard()
+        return zstandard.open(source, 'rb')
+    # The file is kept open by the entry after closing the archive
+    with ZipFile(source) as archive:
+        names = [e for e in archive.namelist() if not e.endswith('/')]
+        if len(names) != 1:
+            raise ValueError('Zip files must contain a single SDMX file')
+        return archive.open(names[0])
+
+
+def is_compressed_xml(path: str) -> bool:
+    """Checks if a path is a compressed file, that is not CSV or JSON"""
+    path = path.lower()
+    return (path.endswith(COMPRESSED_EXTENSIONS) and
+            ".csv" not in path and ".json" not in path)
+
+
+def is_binary_stream(infile) -> bool:
+    return (isinstance(infile, mmap.mmap) or
+            (hasattr(infile, 'read') and
+             not isinstance(infile, io.TextIOBase)))
+
+
+def open_stream(stream):
+    """
+    Decompresses a binary stream if it is compressed (gzip, bz2, zstd or
+    zip). Streams already decompressed are returned as they are
+
+    :param stream: Binary file-like object or mmap
+    :return: Binary file-like object
+    """
+    if isinstance(stream, (BytesIO, io.BufferedReader, io.FileIO,
+                           mmap.mmap)):
+        compression = get_compression(stream)
+        if compression is not None:
+            return decompress(stream, compression)
+    return stream
+
+
+def open_input(path):
+    """
+    Opens a local file as a binary stream to be parsed, without reading it
+    into memory. Compressed files (gzip, bz2, zstd or zip with a single
+    file) are decompressed by chunks and the rest are memory-mapped
+
+    :param path: Path to the file
+    :return: Binary file-like object
+    """
+    with open(path, 'rb') as f:
+        compression = get_compression(f)
+        if compression is None:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return BytesIO()
+    return decompress(path, compression)
+
+
+@contextmanager
+def open_source(source):
+    """
+    Opens a source returned by process_string_to_read or
+    process_stream_to_read: paths are opened with open_input, URLs are
+    streamed from the response and both are closed at the end. XML strings
+    and streams are used as they are
+
+    :param source: Path, URL, SDMX-ML as string or binary file-like object
+    """
+    if isinstance(source, os.PathLike):
+        with open_input(source) as f:
+            yield f
+    elif is_url(source):
+        with open_url(source) as response:
+            yield response.raw
+    else:
+        yield source
+
+
+class ChainedReader:
+    """
+    Binary file-like object that reads the bytes already taken from a
+    stream before the rest of it
+
+    :param head: Bytes read from the stream
+    :param stream: Binary file-like object
+    """
+
+    def __init__(self, head: bytes, stream):
+        self.head = BytesIO(head)
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.head.read(size)
+        if size is None or size < 0:
+            return data + self.stream.read()
+        if not data:
+            return self.stream.read(size)
+        return data
+
+
+def peek_root(stream, chunk_size: int = 65536):
+    """
+    Gets the name of the root element of a XML stream, without seeking
+    it, so it can be used on URL responses and sockets
+
+    :param stream: Binary file-like object
+    :param chunk_size: Bytes read from the stream on each step
+    :return: A tuple with the local name of the root element (None if the
+             stream is empty or is not XML) and a stream with all the
+             data, including the bytes read
+    """
+    parser = etree.XMLPullParser(events=('start',), huge_tree=True)
+    head = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return None, ChainedReader(b''.join(head), stream)
+        head.append(chunk)
+        try:
+            parser.feed(chunk)
+        except etree.XMLSyntaxError:
+            return None, ChainedReader(b''.join(head), stream)
+        for _, element in parser.read_events():
+            return (etree.QName(element).localname,
+                    ChainedReader(b''.join(head), stream))
+
+
 def process_string_to_read(infile: str):
+    """
+    Gets the file type of the input and the source to be parsed. Local XML
+    files and binary streams are not read into memory: the files are
+    returned as Path, to be opened with open_source
+
+    :param infile: Path, URL, SDMX file as string or binary stream
+    :return: A tuple with the source and the file type (xml, json or csv)
+    """
     if isinstance(infile, Path):
         infile = str(infile)
     if isinstance(infile, (str, os.PathLike)):
         # Is URL
         if validators.url(infile):
-            infile = URLparsing(infile)
+            return URLparsing(infile), "xml"
         # Is file as string
         elif len(infile) > 10 and "<?" in infile[:10] and "xml" in infile[:10]:
             pass
@@ -72,14 +280,10 @@ def process_string_to_read(infile: str):
               isinstance(infile, os.PathLike)):
             if not os.path.isfile(infile):
                 raise ValueError(f"File not found: {infile}")
-            try:
-                with open(infile, "r",
-                          encoding='utf-8',
-                          errors='replace') as f:
-                    infile = f.read()
-                    return infile, "xml"
-            except AttributeError:
-                pass
+            return Path(infile), "xml"
+        # Is compressed file as path
+        elif is_compressed_xml(infile) and os.path.isfile(infile):
+            return Path(infile), "xml"
         elif "DATAFLOW," in infile[:11] or ("STRUCTURE," in infile[:11] and
                                             "STRUCTURE_ID" in infile[:25]):
             return StringIO(infile), "csv"
@@ -88,10 +292,8 @@ def process_string_to_read(infile: str):
                         f'Found {infile}'
             raise ValueError(error_msg)
     # Is bytes
-    elif isinstance(infile, BytesIO):
-        infile = TextIOWrapper(infile,
-                               encoding='utf-8',
-                               errors="replace").read()
+    elif is_binary_stream(infile):
+        return open_stream(infile), "xml"
 
     else:
         error_msg = f'Cannot parse as SDMX, ' \
@@ -105,38 +307,202 @@ def process_string_to_read(infile: str):
     return infile, "xml"
 
 
-def validate_doc(infile):
+def process_stream_to_read(infile):
     """
-    Validates the XML file against the XSD schema
+    Gets a source that can be parsed incrementally, without reading the
+    whole file as a string
 
-    :param infile: String or Path to file
-    :exception: Exception if the XML file is not valid
+    :param infile: Path to file, URL, SDMX-ML as string or binary stream
+    :return: Path to file, URL (to be opened with open_source) or binary
+             file-like object, None if the input cannot be streamed
+             (CSV or JSON files)
     """
-    try:
-        parser = etree.ETCompatXMLParser()
-    except AttributeError:
-        # fallback to xml.etree
-        parser = etree.XMLParser(remove_blank_text=True)
+    if isinstance(infile, os.PathLike):
+        infile = str(infile)
+    if isinstance(infile, str):
+        if validators.url(infile):
+            return infile
+        if len(infile) > 10 and "<" in infile[:10]:
+            return BytesIO(bytes(infile, "UTF_8"))
+        if ((".xml" in infile or is_compressed_xml(infile)) and
+                os.path.isfile(infile)):
+            return Path(infile)
+        return None
+    if is_binary_stream(infile):
+        return open_stream(infile)
+    return None
+
+
+def load_schema():
+    """
+    Compiles the SDMX-ML XSD schema. It is built only once per process
+    and shared by all the threads, so it can be called at startup to avoid
+    the compilation time on the first file. The schema is only bound to
+    the parsers, each of them validating with its own context and error
+    log, so threads validate in parallel
+
+    :return: The compiled lxml XMLSchema
+    """
+    global _schema
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                base_path = os.path.dirname(os.path.dirname(__file__))
+                path = os.path.join(base_path, path_to_schema)
+                _schema = etree.XMLSchema(etree.parse(path))
+    return _schema
 
-    base_path = os.path.dirname(os.path.dirname(__file__))
-    schema = os.path.join(base_path, path_to_schema)
-    xmlschema_doc = etree.parse(schema)
-    xmlschema = etree.XMLSchema(xmlschema_doc)
 
+def severe_errors(log_errors):
+    """
+    Messages of the validation errors that are not allowed
+
+    :param log_errors: lxml error log entries
+    :return: A generator of the error messages
+    """
+    for e in log_errors:
+        if e.domain != etree.ErrorDomains.SCHEMASV:
+            continue
+        if any(allowed_error in e.message
+               for allowed_error in ALLOWED_ERRORS_CONTENT):
+            continue
+        yield e.message
+
+
+class ChunkValidator:
+    """
+    Validates a XML document against the XSD schema while it is read by
+    chunks. The chunks are fed to a parser bound to the schema, which keeps
+    the state of the validation along the whole document, so the result is
+    the same as validating the full tree. The children of the root and of
+    the datasets are cleared once completed, so the tree is not kept,
+    unless the document is read with iterparse to get the data from the
+    same parser
+
+    :param max_size: Validates only the first max_size MB of the file
+    :param first_error_only: Raises on the first error found, without
+                             validating the rest of the file
+    """
+
+    def __init__(self, max_size: int = None, first_error_only: bool = False):
+        self.parser = etree.XMLPullParser(events=('start', 'end'),
+                                          schema=load_schema(),
+                                          remove_comments=True,
+                                          remove_pis=True, huge_tree=True)
+        self.limit = None if max_size is None else \
+            int(max_size * 1024 * 1024)
+        self.first_error_only = first_error_only
+        self.read = 0
+        self.done = False
+        self.errors = []
+        self._events = False
+        self._checked = 0
+        self._depth = 0
+
+    def feed(self, data: bytes):
+        """Parses the next chunk, validating the elements completed"""
+        if self.done and not self._events:
+            return
+        self.parser.feed(data)
+        self.read += len(data)
+        if not self._events:
+            self._release()
+        if self.done:
+            return
+        self._check_errors()
+        if self.limit is not None and self.read >= self.limit:
+            # The elements not read completely are not checked. The rest
+            # of the file is still parsed on iterparse, without errors
+            self.done = True
+            self._raise_errors()
+
+    def close(self):
+        """
+        Validates the rest of the message
+
+        :exception: Exception if the XML file is not valid
+        """
+        if self.done and not self._events:
+            self._raise_errors()
+            return
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError as e:
+            # The first validation error is raised again on close,
+            # even if it is allowed
+            if not any(error.message in str(e)
+                       for error in self.parser.feed_error_log):
+                raise
+        if not self._events:
+            self._release()
+        if not self.done:
+            self.done = True
+            self._check_errors()
+        self._raise_errors()
+
+    def iterparse(self, source, chunk_size: int = 65536):
+        """
+        Parses and validates a binary file-like object, as lxml iterparse
+        does. The elements are not cleared, so the data is read from the
+        same parser that validates it
+
+        :param source: Binary file-like object
+        :param chunk_size: Number of bytes read on each chunk
+        :return: A generator of (event, element) tuples, with start and
+                 end events
+        """
+        self._events = True
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+            yield from self.parser.read_events()
+        self.close()
+        yield from self.parser.read_events()
+
+    def _raise_errors(self):
+        if len(self.errors) > 0:
+            raise Exception(';\n'.join(self.errors))
+
+    def _release(self):
+        for event, element in self.parser.read_events():
+            if event == 'start':
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth in (1, 2):
+                element.clear()
+                parent = element.getparent()
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    def _check_errors(self):
+        log = list(self.parser.feed_error_log)
+        for message in severe_errors(log[self._checked:]):
+            self.errors.append(message)
+            if self.first_error_only:
+                self.done = True
+                raise Exception(message)
+        self._checked = len(log)
+
+
+def validate_doc(infile, max_size: int = None,
+                 first_error_only: bool = False):
+    """
+    Validates the XML file against the XSD schema, reading it by chunks
+
+    :param infile: String or binary file-like object
+    :param max_size: Validates only the first max_size MB of the file
+    :param first_error_only: Stops on the first error found
+    :exception: Exception if the XML file is not valid
+    """
     if isinstance(infile, str):
         infile = BytesIO(bytes(infile, "UTF_8"))
-
-    doc = etree.parse(infile, parser=parser)
-    if not xmlschema.validate(doc):
-        log_errors = list(xmlschema.error_log)
-        unhandled_errors = []
-        for e in log_errors:
-            unhandled_errors.append(e.message)
-        severe_errors = unhandled_errors.copy()
-        for e in unhandled_errors:
-            for allowed_error in ALLOWED_ERRORS_CONTENT:
-                if allowed_error in e:
-                    severe_errors.remove(e)
-
-        if len(severe_errors) > 0:
-            raise Exception(';\n'.join(severe_errors))
+    validator = ChunkValidator(max_size, first_error_only)
+    while not validator.done:
+        chunk = infile.read(65536)
+        if not chunk:
+            break
+        validator.feed(chunk)
+    validator.close()
@@ -0,0 +1,393 @@
+"""
+    Incremental reader for SDMX-ML data messages. Uses lxml iterparse to
+    process every Series and Obs as soon as it is closed, so the whole
+    document is never loaded in memory.
+"""
+import numpy as np
+import pandas as pd
+import xmltodict
+from lxml import etree
+
+from sdmxthon.model.dataset import Dataset
+from sdmxthon.parsers.data_read import ColumnBuffer, get_at_att_str, \
+    reading_group_data
+from sdmxthon.parsers.data_types import OBS_VALUE, TIME_PERIOD
+from sdmxthon.parsers.reader_input_processor import ChunkValidator, \
+    open_source
+from sdmxthon.utils.handlers import add_list
+from sdmxthon.utils.parsing_words import ALL_DIM, ATTRIBUTES, DATASET, \
+    DATASET_ID, DIM_OBS, GENERIC, GROUP, HEADER, ID, namespaces, OBS, \
+    OBS_DIM, OBSKEY, OBSVALUE, SERIES, SERIESKEY, STRID, STRREF, STRSPE, \
+    STRTYPE, STRUCTURE, VALUE
+
+options = {'process_namespaces': True,
+           'namespaces': namespaces,
+           'dict_constructor': dict,
+           'attr_prefix': ''}
+
+
+# Columns with a value on almost every observation, never categorical
+PLAIN_COLUMNS = (OBS_VALUE, TIME_PERIOD, OBSVALUE.upper(), OBS_DIM)
+
+
+class _StreamedDataSet:
+    """Holds the state of a DataSet element while it is being parsed"""
+
+    def __init__(self, attributes: dict, categorical: bool = False):
+        self.attributes = attributes
+        self.groups = []
+        self.attached_attributes = {}
+        self.buffer = ColumnBuffer(categorical, exclude=PLAIN_COLUMNS)
+        self.has_series = False
+        self.has_obs = False
+        self.offset = 0
+
+
+def _local_name(tag, cache: dict):
+    name = cache.get(tag)
+    if name is None:
+        name = cache[tag] = tag.rpartition('}')[2]
+    return name
+
+
+def _attributes(element, cache: dict) -> dict:
+    """Maps the attributes names as xmltodict does with the namespaces"""
+    result = {}
+    for k, v in element.attrib.items():
+        name = cache.get(k)
+        if name is None:
+            if k[0] == '{':
+                uri, local = k[1:].split('}', 1)
+                prefix = namespaces.get(uri, uri)
+                name = local if prefix is None else f'{prefix}:{local}'
+            else:
+                name = k
+            cache[k] = name
+        result[name] = v
+    return result
+
+
+def _values(element) -> dict:
+    """Extracts the id-value pairs from a generic Value list"""
+    return {e.get(ID): e.get(VALUE.lower()) for e in element}
+
+
+def _release(element):
+    """Clears an element and the siblings already processed"""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _generic_obs(element, tags: dict, series: bool) -> dict:
+    obs = {OBS_DIM: None, OBSVALUE.upper(): None} if series else {}
+    for child in element:
+        name = _local_name(child.tag, tags)
+        if name == OBS_DIM:
+            obs[OBS_DIM] = child.get(VALUE.lower())
+        elif name == OBSKEY:
+            obs.update(_values(child))
+        elif name == OBSVALUE:
+            if not series and child.get(ID) is not None:
+                obs[child.get(ID)] = child.get(VALUE.lower())
+            else:
+                obs[OBSVALUE.upper()] = child.get(VALUE.lower())
+        elif name == ATTRIBUTES:
+            obs.update(_values(child))
+    return obs
+
+
+def iterparse_datasets(source, chunk_rows: int = None,
+                       validator: ChunkValidator = None,
+                       categorical: bool = False):
+    """
+    Parses a SDMX-ML data message incrementally
+
+    :param source: Path to the file or file-like object
+    :param chunk_rows: Number of observations to be buffered before
+                       yielding the dataset state with completed=False
+    :param validator: ChunkValidator to validate the message against the
+                      XSD with the same parser (source must be a binary
+                      file-like object)
+    :param categorical: Builds the columns with few distinct values as
+                        categorical from the codes buffered
+    :return: A generator of tuples (global_mode, header, dataset state,
+             completed). If the message is not a data message, yields
+             (None, None, None, True) and stops
+    """
+    if validator is None:
+        context = etree.iterparse(source, events=('start', 'end'),
+                                  huge_tree=True)
+    else:
+        context = validator.iterparse(source)
+    tags = {}
+    names = {}
+    depth = 0
+    global_mode = None
+    header = None
+    dataset = None
+    series_keys = {}
+
+    for event, element in context:
+        name = _local_name(element.tag, tags)
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                if name not in (STRSPE, GENERIC):
+                    yield None, None, None, True
+                    return
+                global_mode = name
+            elif depth == 2 and DATASET in name:
+                dataset = _StreamedDataSet(_attributes(element, names),
+                                           categorical)
+                series_keys = {}
+            elif depth == 3 and name == SERIES:
+                dataset.has_series = True
+                series_keys = _attributes(element, names) \
+                    if global_mode == STRSPE else {}
+            continue
+
+        depth -= 1
+        if depth == 1:
+            if name == HEADER:
+                header = xmltodict.parse(etree.tostring(element),
+                                         **options)[HEADER]
+                _release(element)
+            elif DATASET in name:
+                yield global_mode, header, dataset, True
+                dataset = None
+                _release(element)
+        elif dataset is None:
+            continue
+        elif global_mode == STRSPE:
+            if name == OBS and depth in (2, 3):
+                dataset.buffer.append(series_keys,
+                                      _attributes(element, names))
+                if depth == 2:
+                    dataset.has_obs = True
+                _release(element)
+            elif name == SERIES and depth == 2:
+                _release(element)
+            elif name == GROUP and depth == 2:
+                dataset.groups.append(_attributes(element, names))
+                _release(element)
+        else:
+            if name == OBS and depth == 3:
+                dataset.buffer.append(series_keys,
+                                      _generic_obs(element, tags, True))
+                _release(element)
+            elif name == OBS and depth == 2:
+                dataset.has_obs = True
+                dataset.buffer.append(_generic_obs(element, tags, False))
+                _release(element)
+            elif (name in (SERIESKEY, ATTRIBUTES) and depth == 3 and
+                  dataset.has_series):
+                series_keys.update(_values(element))
+                element.clear()
+            elif name == ATTRIBUTES and depth == 2:
+                dataset.attached_attributes.update(_values(element))
+                _release(element)
+            elif name in (SERIES, GROUP) and depth == 2:
+                _release(element)
+
+        if (chunk_rows is not None and dataset is not None and
+                len(dataset.buffer) >= chunk_rows):
+            yield global_mode, header, dataset, False
+
+    del context
+
+
+def get_stream_metadata(header: dict, dataset: _StreamedDataSet):
+    from sdmxthon.parsers.read import get_dataset_metadata
+
+    structures = {}
+    for structure in add_list(header[STRUCTURE]):
+        structures[structure[STRID]] = structure
+
+    str_ref = dataset.attributes.get(STRREF)
+    if str_ref not in structures:
+        raise Exception("Could not find structure reference")
+    structure = structures[str_ref]
+
+    if dataset.has_series:
+        mode = SERIES
+    elif dataset.has_obs:
+        mode = OBS
+    else:
+        mode = OBS if structure[DIM_OBS] == ALL_DIM else SERIES
+    return get_dataset_metadata(structure, str_ref, mode=mode)
+
+
+def _get_shell(dataset: _StreamedDataSet) -> dict:
+    """Rebuilds the DataSet element as xmltodict would (without Series)"""
+    shell = dict(dataset.attributes)
+    if len(dataset.groups) > 0:
+        groups = dataset.groups
+        shell[GROUP] = groups[0] if len(groups) == 1 else groups
+    return shell
+
+
+def _fill_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """Replaces the missing values with '', also on categorical columns"""
+    df = df.replace(np.nan, '')
+    for k in df.columns:
+        column = df[k]
+        if isinstance(column.dtype, pd.CategoricalDtype) and column.hasnans:
+            if '' not in column.cat.categories:
+                column = column.cat.add_categories('')
+            df[k] = column.fillna('')
+    return df
+
+
+def get_stream_frame(global_mode, dataset: _StreamedDataSet,
+                     metadata: dict) -> pd.DataFrame:
+    """
+    Builds the DataFrame with the observations buffered so far, in the
+    same format as the dict based reader
+
+    :param global_mode: StructureSpecificData or GenericData
+    :param dataset: Dataset state from iterparse_datasets
+    :param metadata: Metadata from get_stream_metadata
+    :return: A pandas DataFrame. The buffer is emptied
+    """
+    df = dataset.buffer.to_frame()
+    if global_mode == STRSPE:
+        if dataset.has_series:
+            if len(dataset.groups) > 0 and len(df) > 0:
+                df_group = reading_group_data(_get_shell(dataset))
+                common_columns = list(set(df.columns).intersection(
+                    set(df_group.columns)))
+                df = pd.merge(df, df_group, on=common_columns, how='left')
+        elif dataset.has_obs:
+            df = _fill_missing(df)
+    else:
+        if dataset.has_series:
+            renames = {'OBSVALUE': 'OBS_VALUE',
+                       'ObsDimension': metadata[DIM_OBS]}
+            df.rename(columns=renames, inplace=True)
+        elif dataset.has_obs:
+            df = _fill_missing(df)
+            df.rename(columns={'OBSVALUE': 'OBS_VALUE'}, inplace=True)
+
+    df.index = pd.RangeIndex(dataset.offset, dataset.offset + len(df))
+    dataset.offset += len(df)
+    return df
+
+
+def create_stream_dataset(global_mode, dataset: _StreamedDataSet,
+                          metadata: dict) -> Dataset:
+    df = get_stream_frame(global_mode, dataset, metadata)
+    if global_mode == STRSPE:
+        attached_attributes = get_at_att_str(_get_shell(dataset))
+    else:
+        attached_attributes = dataset.attached_attributes
+
+    return Dataset(attached_attributes=attached_attributes,
+                   data=df,
+                   unique_id=metadata[STRID],
+                   structure_type=metadata[STRTYPE])
+
+
+def _validator(validate: bool, max_size: int = None,
+               first_error_only: bool = False):
+    # The data is validated by the parser reading it, in a single pass
+    if not validate:
+        return None
+    return ChunkValidator(max_size, first_error_only)
+
+
+def iter_xml_chunks(source, chunk_rows: int, validate: bool = False,
+                    use_dataset_id: bool = False,
+                    validate_max_size: int = None,
+                    validate_first_error_only: bool = False,
+                    categorical: bool = False):
+    """
+    Reads a SDMX-ML data message by chunks of observations
+
+    :param source: Path to the file, URL or file-like object
+    :param chunk_rows: Maximum number of rows on each chunk
+    :param validate: Validation of the XML file against the XSD
+    :param use_dataset_id: Use the DataSetID as key in output
+    :param validate_max_size: Validates only the first MB of the file
+    :param validate_first_error_only: Reports only the first validation
+                                      error
+    :param categorical: Builds the columns with few distinct values of
+                        each chunk as categorical
+    :return: A generator of tuples (dataset id, pandas DataFrame)
+    """
+    if chunk_rows is None or chunk_rows < 1:
+        raise ValueError('chunk_rows must be a positive integer')
+
+    validator = _validator(validate, validate_max_size,
+                           validate_first_error_only)
+    with open_source(source) as f:
+        for global_mode, header, dataset, completed in \
+                iterparse_datasets(f, chunk_rows, validator, categorical):
+            if global_mode is None:
+                raise TypeError("Unable to parse sdmx file as data file")
+            if completed and len(dataset.buffer) == 0 and \
+                    dataset.offset > 0:
+                continue
+            metadata = get_stream_metadata(header, dataset)
+            if use_dataset_id and DATASET_ID in header:
+                dataset_id = header[DATASET_ID]
+            else:
+                dataset_id = metadata[STRID]
+            yield dataset_id, get_stream_frame(global_mode, dataset,
+                                               metadata)
+
+
+def read_xml_stream(source, validate: bool = False,
+                    use_dataset_id: bool = False,
+                    validate_max_size: int = None,
+                    validate_first_error_only: bool = False,
+                    categorical: bool = False):
+    """
+    Reads a SDMX-ML data message without building the full document tree
+
+    :param source: Path to the file, URL or file-like object
+    :param validate: Validation of the XML file against the XSD
+    :param use_dataset_id: Use the DataSetID as key in output
+    :param validate_max_size: Validates only the first MB of the file
+    :param validate_first_error_only: Reports only the first validation
+                                      error
+    :param categorical: Builds the columns with few distinct values as
+                        categorical from the codes buffered, so the values
+                        are not kept once per observation
+    :return: A dict of Datasets, or None if the message is not a data message
+    """
+    parsed = []
+    header = None
+    validator = _validator(validate, validate_max_size,
+                           validate_first_error_only)
+    with open_source(source) as f:
+        for global_mode, header, dataset, _ in \
+                iterparse_datasets(f, validator=validator,
+                                   categorical=categorical):
+            if global_mode is None:
+                return None
+            metadata = get_stream_metadata(header, dataset)
+            parsed.append((metadata, create_stream_dataset(global_mode,
+                                                           dataset,
+                                                           metadata)))
+
+    if len(parsed) == 0:
+        raise Exception('Cannot parse datasets on this file')
+
+    datasets = {}
+    if len(parsed) == 1:
+        metadata, ds = parsed[0]
+        if use_dataset_id and DATASET_ID in header:
+            datasets[header[DATASET_ID]] = ds
+        else:
+            datasets[metadata[STRID]] = ds
+        return datasets
+
+    for metadata, ds in parsed:
+        if metadata[STRID] in datasets and len(ds.data) == 0:
+            continue
+        # Adding the dataset even if STRID is already present
+        datasets[metadata[STRID]] = ds
+    return datasets
@@ -1,29 +1,25 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 
+import numpy as np
 import pandas as pd
 
 from sdmxthon.model.component import GroupDimensionDescriptor, PrimaryMeasure
 from sdmxthon.model.header import Header, Party, Sender
-from sdmxthon.parsers.data_validations import get_mandatory_attributes
+from sdmxthon.parsers.data_validations import get_mandatory_attributes, \
+    get_n_jobs
 from sdmxthon.parsers.writer_aux import create_namespaces, get_end_message, \
     parse_metadata, write_from_header
+from sdmxthon.parsers.writer_output import open_output
 from sdmxthon.utils.enums import MessageTypeEnum
 from sdmxthon.utils.mappings import genericAbbr, messageAbbr
 
 chunksize = 100000
 
 
-def remove_null_values_on_dataset(dataset):
-    """
-    This function removes null values from a dataset
-
-    :param dataset: The dataset is to be cleaned
-    :return: The same dataset without null values
-    """
-    dataset.data = dataset.data.fillna(value='')
-    return dataset
-
-
 def writer(path, payload, type_,
            prettyprint=True,
            id_='test',
@@ -31,11 +27,15 @@ def writer(path, payload, type_,
            prepared=datetime.now(),
            sender='Unknown',
            receiver='Not_supplied',
-           header: Header = None):
+           header: Header = None,
+           n_jobs: int = None,
+           executor: Executor = None,
+           compression='infer'):
     """
     This function writes a SDMX-ML file from a payload
 
-    :param path: Output path (if empty, returns the string)
+    :param path: Output path or a text or binary stream, like a file or
+                 socket file object (if empty, returns the string)
 
     :param payload: Payload to be written
 
@@ -55,11 +55,17 @@ def writer(path, payload, type_,
 
     :param header: Header of the message
 
+    :param n_jobs: Number of processes writing the chunks of the datasets
+                   (-1 uses all CPUs)
+
+    :param executor: concurrent.futures Executor used to write the chunks,
+                     instead of creating a process pool
+
+    :param compression: 'infer' (from the extension of the path: .gz, .zst
+                        or .zip), 'gzip', 'zstd', 'zip' or None
+
     :return: XML as string, if path is empty
     """
-    # Header
-    outfile = create_namespaces(type_, payload, prettyprint)
-
     if header is None:
         header = Header(ID=id_,
                         Test=test,
@@ -67,57 +73,137 @@ def writer(path, payload, type_,
                         sender=Sender(sender),
                         Receiver=[Party(receiver)])
 
-    outfile += write_from_header(header=header, prettyprint=prettyprint,
-                                 type_=type_, payload=payload)
+    n_jobs = get_n_jobs(n_jobs)
+    if executor is None and n_jobs > 1:
+        # Chunks are pickled to the workers and written back in order
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            return writer(path, payload, type_, prettyprint=prettyprint,
+                          header=header, executor=pool,
+                          compression=compression)
+
+    chunks = iter_message(payload, type_, header, prettyprint, executor)
+
+    if isinstance(path, str) and path == '':
+        return ''.join(chunks)
+
+    with open_output(path, compression) as f:
+        f.writelines(chunks)
+
+
+def iter_message(payload, type_, header: Header, prettyprint=True,
+                 executor: Executor = None):
+    """
+    Generates a SDMX-ML message by chunks. The datasets are written by
+    chunks of about chunksize observations
+
+    :param payload: Payload to be written
+    :param type_: Message type
+    :param header: Header of the message
+    :param prettyprint: Prettyprint option
+    :param executor: Executor writing the chunks of the datasets
+    :return: A generator of strings
+    """
+    # Header
+    yield create_namespaces(type_, payload, prettyprint)
+
+    yield write_from_header(header=header, prettyprint=prettyprint,
+                            type_=type_, payload=payload)
 
     # Dataset
     if type_ == MessageTypeEnum.GenericDataSet:
         if isinstance(payload, dict):
             for record in payload.values():
-                record = remove_null_values_on_dataset(record)
-                outfile += generic_writing(record, prettyprint,
-                                           record.dim_at_obs)
+                yield from iter_generic_writing(record, prettyprint,
+                                                record.dim_at_obs, executor)
         else:
-            payload = remove_null_values_on_dataset(payload)
-            outfile += generic_writing(payload, prettyprint,
-                                       dim=payload.dim_at_obs)
+            yield from iter_generic_writing(payload, prettyprint,
+                                            dim=payload.dim_at_obs,
+                                            executor=executor)
     elif type_ == MessageTypeEnum.StructureSpecificDataSet:
         if isinstance(payload, dict):
             count = 0
             for record in payload.values():
                 count += 1
-                record = remove_null_values_on_dataset(record)
-                outfile += strWriting(record, prettyprint, count,
-                                      record.dim_at_obs)
+                yield from iter_str_writing(record, prettyprint, count,
+                                            record.dim_at_obs, executor)
         else:
-            payload = remove_null_values_on_dataset(payload)
-            outfile += strWriting(payload, prettyprint, dim=payload.dim_at_obs)
+            yield from iter_str_writing(payload, prettyprint,
+                                        dim=payload.dim_at_obs,
+                                        executor=executor)
     elif type_ == MessageTypeEnum.Metadata:
         if len(payload) > 0:
-            outfile += parse_metadata(payload, prettyprint)
+            yield parse_metadata(payload, prettyprint)
 
-    outfile += get_end_message(type_)
+    yield get_end_message(type_)
 
-    if path != '':
-        with open(path, "w", encoding="UTF-8", errors='replace') as f:
-            f.write(outfile)
-    else:
-        return outfile
 
+def iter_chunks(data: pd.DataFrame):
+    """Splits the data in chunks of chunksize rows"""
+    for start in range(0, len(data), chunksize):
+        yield data.iloc[start:start + chunksize]
 
-def format_dict_ser(out, parser, data_dict, obs):
-    data_dict['Series'][0]['Obs'] = obs.to_dict(orient="records")
-    out.append(parser(data_dict['Series'][0]))
-    del data_dict['Series'][0]
 
+def map_chunks(func, chunks, executor: Executor = None):
+    """
+    Applies func to each chunk, keeping the order. With an executor, only
+    a few chunks per CPU are pending at the same time, so the data is not
+    copied to the workers all at once
+
+    :param func: Picklable function writing a chunk
+    :param chunks: Iterable of DataFrames
+    :param executor: Executor writing the chunks, None writes them here
+    :return: A generator of strings
+    """
+    if executor is None:
+        yield from map(func, chunks)
+        return
+
+    max_pending = 2 * (os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def series_starts(data: pd.DataFrame, series_codes: list) -> np.ndarray:
+    """
+    Finds the first row of each series on data sorted by the series codes
 
-def series_process(parser, data, data_dict, series_codes, obs_codes):
-    out = []
-    if all(elem in data.columns for elem in obs_codes):
-        data.groupby(by=series_codes)[obs_codes].apply(
-            lambda x: format_dict_ser(out, parser, data_dict, x))
+    :param data: Data sorted by the series codes
+    :param series_codes: Components of the series key
+    :return: Positions of the first row of each series
+    """
+    change = np.zeros(len(data), dtype=bool)
+    change[:1] = True
+    for k in series_codes:
+        codes = pd.factorize(data[k])[0]
+        change[1:] |= codes[1:] != codes[:-1]
+    return np.flatnonzero(change)
 
-    return ''.join(out)
+
+def iter_series_chunks(data: pd.DataFrame, series_codes: list):
+    """
+    Splits the data (sorted by the series codes) in chunks of about
+    chunksize rows, without splitting any series
+    """
+    if len(data) <= chunksize or len(series_codes) == 0:
+        yield data
+        return
+
+    starts = series_starts(data, series_codes)
+    start = 0
+    while start < len(data):
+        i = np.searchsorted(starts, start + chunksize)
+        end = starts[i] if i < len(starts) else len(data)
+        yield data.iloc[start:end]
+        start = end
 
 
 def get_codes(dim, dataset):
@@ -151,25 +237,12 @@ def get_codes(dim, dataset):
 
 
 def memory_optimization_str(dataset, opt_att_codes, prettyprint):
-    outfile = ""
-    length_ = len(dataset.data)
-    if len(dataset.data) > chunksize:
-        previous = 0
-        next_ = chunksize
-        while previous <= length_:
-            outfile += obs_str(dataset.data.iloc[previous:next_],
-                               opt_att_codes, prettyprint)
-            previous = next_
-            next_ += chunksize
-
-            if next_ >= length_:
-                outfile += obs_str(dataset.data.iloc[previous:],
-                                   opt_att_codes, prettyprint)
-                previous = next_
-    else:
-        outfile += obs_str(dataset.data, opt_att_codes, prettyprint)
+    return ''.join(iter_obs_str(dataset.data, opt_att_codes, prettyprint))
+
 
-    return outfile
+def iter_obs_str(data, opt_att_codes, prettyprint, executor=None):
+    func = partial(obs_str, codes=opt_att_codes, prettyprint=prettyprint)
+    yield from map_chunks(func, iter_chunks(data), executor)
 
 
 #
@@ -182,8 +255,12 @@ def memory_optimization_str(dataset, opt_att_codes, prettyprint):
 
 
 def strWriting(dataset, prettyprint=True, count=1, dim="AllDimensions"):
+    return ''.join(iter_str_writing(dataset, prettyprint, count, dim))
+
+
+def iter_str_writing(dataset, prettyprint=True, count=1,
+                     dim="AllDimensions", executor: Executor = None):
     check_structure(dataset)
-    outfile = ''
 
     if prettyprint:
         child1 = '\t'
@@ -196,11 +273,11 @@ def strWriting(dataset, prettyprint=True, count=1, dim="AllDimensions"):
         attached_attributes_str += f'{k}="{v}" '
 
     # Datasets
-    outfile += f'{child1}<{messageAbbr}:DataSet {attached_attributes_str}' \
-               f'ss:structureRef="{dataset.structure.id}" ' \
-               f'xsi:type="ns{count}:DataSetType" ' \
-               f'ss:dataScope="DataStructure" ' \
-               f'action="Replace">{nl}'
+    yield f'{child1}<{messageAbbr}:DataSet {attached_attributes_str}' \
+          f'ss:structureRef="{dataset.structure.id}" ' \
+          f'xsi:type="ns{count}:DataSetType" ' \
+          f'ss:dataScope="DataStructure" ' \
+          f'action="Replace">{nl}'
     man_att = get_mandatory_attributes(dataset.structure)
     opt_att_codes = [att for att in dataset.structure.attribute_codes
                      if att not in man_att]
@@ -209,85 +286,130 @@ def strWriting(dataset, prettyprint=True, count=1, dim="AllDimensions"):
         if check_dataset_for_groups(dataset):
             raise Exception("Structure Specific All Dimensions writing "
                             "with groups is not supported")
-        outfile += memory_optimization_str(dataset, opt_att_codes, prettyprint)
+        yield from iter_obs_str(dataset.data, opt_att_codes, prettyprint,
+                                executor)
     else:
         series_codes, obs_codes, group_codes, gr_obj = get_codes(dim, dataset)
 
         if len(group_codes) > 0:
-            outfile += group_str(data=dataset.data,
-                                 group_codes=group_codes,
-                                 group_obj=gr_obj,
-                                 prettyprint=prettyprint)
+            yield group_str(data=dataset.data,
+                            group_codes=group_codes,
+                            group_obj=gr_obj,
+                            prettyprint=prettyprint)
 
-        outfile += ser_str(data=dataset.data,
-                           opt_att_codes=opt_att_codes,
-                           series_codes=series_codes,
-                           obs_codes=obs_codes,
-                           prettyprint=prettyprint)
+        yield from iter_ser_str(data=dataset.data,
+                                opt_att_codes=opt_att_codes,
+                                series_codes=series_codes,
+                                obs_codes=obs_codes,
+                                prettyprint=prettyprint,
+                                executor=executor)
 
-    outfile += f'{child1}</{messageAbbr}:DataSet>{nl}'
+    yield f'{child1}</{messageAbbr}:DataSet>{nl}'
 
-    return outfile
 
+def escape_value(value) -> str:
+    """Escapes the XML special characters of an attribute value"""
+    return str(value).replace("&", "&amp;").replace("<", "&lt;") \
+        .replace(">", "&gt;").replace('"', "&quot;")
 
-def format_obs_str(data: dict, prettyprint: bool) -> str:
-    if prettyprint:
-        child2 = '\t\t'
-        nl = '\n'
-    else:
-        child2 = nl = ''
 
-    out = f"{child2}<Obs "
+def render_values(values: pd.Series, template: str,
+                  empty: str = None) -> np.ndarray:
+    """
+    Formats the template with each value of a column. Each distinct value
+    is formatted and escaped once
+
+    :param values: Column to be rendered
+    :param template: Template with a {} for the value
+    :param empty: Text of the empty and missing values, defaults to the
+                  template with an empty value
+    :return: Object array with the text of each row
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = uniques.tolist()
+    if len({type(v) for v in uniques}) > 1:
+        # Equal values of different types (1, 1.0, True) are written apart
+        codes, uniques = pd.factorize(values.map(str, na_action='ignore'))
+        uniques = uniques.tolist()
+    if empty is None:
+        empty = template.format('')
+    fragments = [escape_value(v) for v in uniques]
+    fragments = [template.format(v) if v != '' else empty for v in fragments]
+    # Missing values (code -1) are written as empty
+    fragments = np.array(fragments + [empty], dtype=object)
+    return fragments[codes]
+
+
+def render_table(data: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Renders the rows of a DataFrame by columns
 
-    for k, v in data.items():
-        out += f'{k}="{v}" '
+    :param data: Data to be rendered
+    :param columns: Fixed strings or (component, template, empty) tuples,
+                    as in render_values
+    :return: Object array (rows x columns) with the text of each cell
+    """
+    table = np.empty((len(data), len(columns)), dtype=object)
+    for i, column in enumerate(columns):
+        if isinstance(column, str):
+            table[:, i] = column
+        else:
+            table[:, i] = render_values(data[column[0]], *column[1:])
+    return table
 
-    out += f"/>{nl}"
 
-    return out
+def render_rows(data: pd.DataFrame, columns: list) -> str:
+    """Renders each row of a DataFrame, joining all cells at once"""
+    return ''.join(render_table(data, columns).ravel().tolist())
 
 
-def obs_str(data: pd.DataFrame,
-            codes: list,
-            prettyprint=True) -> str:
-    parser = lambda x: format_obs_str(x, prettyprint)  # noqa: E731
+def render_series(data: pd.DataFrame,
+                  series_codes: list,
+                  series_columns: list,
+                  obs_columns: list,
+                  end: str) -> str:
+    """
+    Renders the series of a DataFrame sorted by the series codes in a
+    single pass: the header of each series is rendered on its first row
+    and inserted before its observations
+
+    :param data: Data sorted by the series codes
+    :param series_codes: Components of the series key
+    :param series_columns: Columns of the series header, as in render_table
+    :param obs_columns: Columns of each observation, as in render_table
+    :param end: Closing of each series
+    :return: The series as string
+    """
+    if len(data) == 0:
+        return ''
+    starts = series_starts(data, series_codes)
+    headers = render_table(data.iloc[starts], series_columns).tolist()
+    headers = [''.join(h) for h in headers]
+    separators = headers[:1] + [end + h for h in headers[1:]]
 
-    iterator = map(parser, data.to_dict(orient='records'))
-    out = ''.join(iterator)
+    table = render_table(data, obs_columns)
+    out = np.insert(table.ravel(), starts * table.shape[1],
+                    np.array(separators, dtype=object))
+    return ''.join(out.tolist()) + end
 
-    for c in codes:
-        out = out.replace(f'{c}="" ', '')
 
-    return out
+def str_columns(codes: list, opt_codes: list) -> list:
+    """Structure Specific k="v" columns, omitting empty optional ones"""
+    return [(k, f'{k}="{{}}" ', '' if k in opt_codes else None)
+            for k in codes]
 
 
-def format_ser_str(data: dict, prettyprint: bool) -> str:
+def obs_str(data: pd.DataFrame,
+            codes: list,
+            prettyprint=True) -> str:
     if prettyprint:
         child2 = '\t\t'
-        child3 = '\t\t\t'
         nl = '\n'
     else:
-        child2 = child3 = nl = ''
-
-    out = f"{child2}<Series "
-
-    for k, v in data.items():
-        if k != 'Obs':
-            out += f'{k}="{v}" '
-
-    out += f">{nl}"
-
-    for obs in data['Obs']:
-        out += f"{child3}<Obs "
-
-        for k, v in obs.items():
-            out += f'{k}="{v}" '
-
-        out += f"/>{nl}"
-
-    out += f"{child2}</Series>{nl}"
+        child2 = nl = ''
 
-    return out
+    columns = str_columns(data.columns, codes)
+    return render_rows(data, [f"{child2}<Obs "] + columns + [f"/>{nl}"])
 
 
 def format_group_str(out: list,
@@ -310,7 +432,7 @@ def format_group_str(out: list,
 
 def group_str(data, group_codes, group_obj, prettyprint):
     # Getting each datapoint from data and creating dict
-    group_data = data[group_codes]
+    group_data = data[group_codes].astype(object).fillna('')
     group_data = group_data.drop_duplicates().reset_index(drop=True)
 
     out = []
@@ -325,21 +447,39 @@ def ser_str(data: pd.DataFrame,
             series_codes: list,
             obs_codes: list,
             prettyprint=True) -> str:
-    # Getting each datapoint from data and creating dict
-    data = data.sort_values(series_codes, axis=0)
-    data_dict = {'Series': data[series_codes].drop_duplicates().reset_index(
-        drop=True).to_dict(orient="records")}
+    return ''.join(iter_ser_str(data, opt_att_codes, series_codes,
+                                obs_codes, prettyprint))
+
 
-    parser = lambda x: format_ser_str(data=x,  # noqa: E731
-                                      prettyprint=prettyprint)
+def iter_ser_str(data: pd.DataFrame,
+                 opt_att_codes: list,
+                 series_codes: list,
+                 obs_codes: list,
+                 prettyprint=True,
+                 executor: Executor = None):
+    if prettyprint:
+        child2 = '\t\t'
+        child3 = '\t\t\t'
+        nl = '\n'
+    else:
+        child2 = child3 = nl = ''
 
-    out = series_process(parser=parser, data=data, data_dict=data_dict,
-                         series_codes=series_codes, obs_codes=obs_codes)
+    if not all(k in data.columns for k in obs_codes):
+        return
 
-    for c in opt_att_codes:
-        out = out.replace(f'{c}="" ', '')
+    series_columns = ([f"{child2}<Series "] +
+                      str_columns(series_codes, opt_att_codes) +
+                      [f">{nl}"])
+    obs_columns = ([f"{child3}<Obs "] +
+                   str_columns(obs_codes, opt_att_codes) +
+                   [f"/>{nl}"])
 
-    return out
+    func = partial(render_series, series_codes=series_codes,
+                   series_columns=series_columns, obs_columns=obs_columns,
+                   end=f"{child2}</Series>{nl}")
+    data = data.sort_values(series_codes, axis=0)
+    yield from map_chunks(func, iter_series_chunks(data, series_codes),
+                          executor)
 
 
 #
@@ -352,35 +492,18 @@ def ser_str(data: pd.DataFrame,
 
 def memory_optimization_generic(dataset, dim_codes, att_codes, measure_code,
                                 prettyprint):
-    outfile = ""
-    length_ = len(dataset.data)
-    if len(dataset.data) > chunksize:
-        previous = 0
-        next_ = chunksize
-        while previous <= length_:
-            outfile += obs_gen(dataset.data.iloc[previous:next_],
-                               dim_codes=dim_codes,
-                               att_codes=att_codes,
-                               measure_code=measure_code,
-                               prettyprint=prettyprint)
-            previous = next_
-            next_ += chunksize
-
-            if next_ >= length_:
-                outfile += obs_gen(dataset.data.iloc[previous:length_],
-                                   dim_codes=dim_codes,
-                                   att_codes=att_codes,
-                                   measure_code=measure_code,
-                                   prettyprint=prettyprint)
-                previous = next_
-    else:
-        outfile += obs_gen(dataset.data,
-                           dim_codes=dim_codes,
-                           att_codes=att_codes,
-                           measure_code=measure_code,
-                           prettyprint=prettyprint)
+    return ''.join(iter_obs_gen(dataset.data, dim_codes, att_codes,
+                                measure_code, prettyprint))
 
-    return outfile
+
+def iter_obs_gen(data, dim_codes, att_codes, measure_code, prettyprint,
+                 executor=None):
+    func = partial(obs_gen,
+                   dim_codes=dim_codes,
+                   att_codes=att_codes,
+                   measure_code=measure_code,
+                   prettyprint=prettyprint)
+    yield from map_chunks(func, iter_chunks(data), executor)
 
 
 def check_dataset_for_groups(dataset):
@@ -413,6 +536,20 @@ def generic_writing(dataset, prettyprint=True, dim="AllDimensions"):
     :param dim: Dimension at observation
     :return:
     """
+    return ''.join(iter_generic_writing(dataset, prettyprint, dim))
+
+
+def iter_generic_writing(dataset, prettyprint=True, dim="AllDimensions",
+                         executor: Executor = None):
+    """
+    Generates a generic SDMX-ML DataSet by chunks of observations
+
+    :param dataset: Dataset to be written
+    :param prettyprint: Prettyprint option
+    :param dim: Dimension at observation
+    :param executor: Executor writing the chunks
+    :return: A generator of strings
+    """
     check_structure(dataset)
     outfile = ''
 
@@ -443,52 +580,57 @@ def generic_writing(dataset, prettyprint=True, dim="AllDimensions"):
 
     if has_groups:
         raise Exception("Generic writing with groups is not supported")
+    yield outfile
     if dim == "AllDimensions":
-        outfile += memory_optimization_generic(dataset, dim_codes, att_codes,
-                                               measure_code, prettyprint)
+        yield from iter_obs_gen(dataset.data, dim_codes, att_codes,
+                                measure_code, prettyprint, executor)
     else:
         series_codes, obs_codes, group_codes, gr_obj = get_codes(dim, dataset)
 
-        outfile += creating_series_generic(dataset.data,
-                                           dim_codes=dim_codes,
-                                           att_codes=att_codes,
-                                           measure_code=measure_code,
-                                           prettyprint=prettyprint,
-                                           series_codes=series_codes,
-                                           obs_codes=obs_codes)
+        yield from iter_series_generic(dataset.data,
+                                       dim_codes=dim_codes,
+                                       att_codes=att_codes,
+                                       measure_code=measure_code,
+                                       prettyprint=prettyprint,
+                                       series_codes=series_codes,
+                                       obs_codes=obs_codes,
+                                       executor=executor)
+
+    yield f'{child1}</{messageAbbr}:DataSet>{nl}'
 
-    outfile += f'{child1}</{messageAbbr}:DataSet>{nl}'
 
-    return outfile
+def generic_value_columns(codes: list, indent: str, nl: str,
+                          empty: str = None) -> list:
+    """Generic Value elements of each component, as in render_table"""
+    return [(k, f'{indent}<{genericAbbr}:Value id="{k}" value="{{}}"/>{nl}',
+             empty) for k in codes]
 
 
-def format_measure_att(data, measure_code, att_codes, child3, child4, nl):
-    out = ""
+def generic_obs_columns(measure_code: str, att_codes: list, child3: str,
+                        child4: str, nl: str) -> list:
+    """Generic ObsValue and Attributes of each observation"""
     if measure_code != "OBS_VALUE":
-        out += f'{child3}<{genericAbbr}:ObsValue id="{measure_code}" ' \
-               f'value="{data[measure_code]}"/>{nl}'
+        columns = [(measure_code,
+                    f'{child3}<{genericAbbr}:ObsValue '
+                    f'id="{measure_code}" value="{{}}"/>{nl}', None)]
     else:
-        out += f'{child3}<{genericAbbr}:ObsValue ' \
-               f'value="{data[measure_code]}"/>{nl}'
+        columns = [(measure_code,
+                    f'{child3}<{genericAbbr}:ObsValue '
+                    f'value="{{}}"/>{nl}', None)]
 
     if len(att_codes) > 0:
-        out += f"{child3}<{genericAbbr}:Attributes>{nl}"
-
-        for k in att_codes:
-            if data[k] != '':
-                out += f'{child4}<{genericAbbr}:Value id="{k}" ' \
-                       f'value="{data[k]}"/>{nl}'
-
-        out += f"{child3}</{genericAbbr}:Attributes>{nl}"
+        columns.append(f"{child3}<{genericAbbr}:Attributes>{nl}")
+        columns += generic_value_columns(att_codes, child4, nl, '')
+        columns.append(f"{child3}</{genericAbbr}:Attributes>{nl}")
 
-    return out
+    return columns
 
 
-def format_gen_obs(data: dict,
-                   dim_codes: list,
-                   att_codes: list,
-                   measure_code: str,
-                   prettyprint=True):
+def obs_gen(data: pd.DataFrame,
+            dim_codes: list,
+            att_codes: list,
+            measure_code: str,
+            prettyprint=True):
     if prettyprint:
         child2 = '\t\t'
         child3 = '\t\t\t'
@@ -497,44 +639,28 @@ def format_gen_obs(data: dict,
     else:
         child2 = child3 = child4 = nl = ''
 
-    out = f"{child2}<{genericAbbr}:Obs>{nl}"
-
-    out += f"{child3}<{genericAbbr}:ObsKey>{nl}"
-
-    for k in dim_codes:
-        out += f'{child4}<{genericAbbr}:Value id="{k}" value="{data[k]}"/>{nl}'
-
-    out += f"{child3}</{genericAbbr}:ObsKey>{nl}"
-
-    out += format_measure_att(data, measure_code, att_codes,
-                              child3, child4, nl)
-
-    out += f"{child2}</{genericAbbr}:Obs>{nl}"
-
-    return out
-
+    columns = [f"{child2}<{genericAbbr}:Obs>{nl}"
+               f"{child3}<{genericAbbr}:ObsKey>{nl}"]
+    columns += generic_value_columns(dim_codes, child4, nl)
+    columns.append(f"{child3}</{genericAbbr}:ObsKey>{nl}")
+    columns += generic_obs_columns(measure_code, att_codes, child3, child4, nl)
+    columns.append(f"{child2}</{genericAbbr}:Obs>{nl}")
 
-def obs_gen(data: pd.DataFrame,
-            dim_codes: list,
-            att_codes: list,
-            measure_code: str,
-            prettyprint=True):
-    parser = lambda x: format_gen_obs(x, dim_codes, att_codes,  # noqa: E731
-                                      measure_code, prettyprint)
-
-    iterator = map(parser, data.to_dict(orient='records'))
-    out = ''.join(iterator)
+    return render_rows(data, columns)
 
-    return out
 
+def generic_series_columns(measure_code: str,
+                           series_key: list,
+                           series_attr: list,
+                           obs_attr: list,
+                           dim: str,
+                           prettyprint=True):
+    """
+    Columns of the header and the observations of generic series,
+    as in render_table
 
-def format_generic_series(data: dict,
-                          measure_code: str,
-                          series_key: list,
-                          series_attr: list,
-                          obs_attr: list,
-                          dim: str,
-                          prettyprint=True):
+    :return: Series columns, observation columns and end of series
+    """
     if prettyprint:
         child2 = '\t\t'
         child3 = '\t\t\t'
@@ -543,48 +669,26 @@ def format_generic_series(data: dict,
     else:
         child2 = child3 = child4 = nl = ''
 
-    out = f"{child2}<{genericAbbr}:Series>{nl}"
     # --------------  Series --------------
-    # Series Keys
-
-    out += f"{child3}<{genericAbbr}:SeriesKey>{nl}"
-
-    for k in series_key:
-        out += f'{child4}<{genericAbbr}:Value id="{k}" value="{data[k]}"/>{nl}'
-
-    out += f"{child3}</{genericAbbr}:SeriesKey>{nl}"
-
-    # Series Attributes
+    series_columns = [f"{child2}<{genericAbbr}:Series>{nl}"
+                      f"{child3}<{genericAbbr}:SeriesKey>{nl}"]
+    series_columns += generic_value_columns(series_key, child4, nl)
+    series_columns.append(f"{child3}</{genericAbbr}:SeriesKey>{nl}")
 
     if len(series_attr) > 0:
-        out += f"{child3}<{genericAbbr}:Attributes>{nl}"
-
-        for k in series_attr:
-            if data[k] != '':
-                out += f'{child4}<{genericAbbr}:Value id="{k}" ' \
-                       f'value="{data[k]}"/>{nl}'
-
-        out += f"{child3}</{genericAbbr}:Attributes>{nl}"
+        series_columns.append(f"{child3}<{genericAbbr}:Attributes>{nl}")
+        series_columns += generic_value_columns(series_attr, child4, nl, '')
+        series_columns.append(f"{child3}</{genericAbbr}:Attributes>{nl}")
 
     # --------------  Obs  --------------
+    obs_columns = [f"{child3}<{genericAbbr}:Obs>{nl}",
+                   (dim, f'{child4}<{genericAbbr}:ObsDimension '
+                         f'value="{{}}"/>{nl}', None)]
+    obs_columns += generic_obs_columns(measure_code, obs_attr,
+                                       child3, child4, nl)
+    obs_columns.append(f"{child3}</{genericAbbr}:Obs>{nl}")
 
-    for obs in data['Obs']:
-        out += f"{child3}<{genericAbbr}:Obs>{nl}"
-        # Obs Elements
-        if dim in obs:
-            out += f'{child4}<{genericAbbr}:ObsDimension ' \
-                   f'value="{obs[dim]}"/>{nl}'
-
-        out += format_measure_att(obs, measure_code, obs_attr,
-                                  child3, child4, nl)
-
-        out += f"{child3}</{genericAbbr}:Obs>{nl}"
-
-    out += f"{child2}</{genericAbbr}:Series>{nl}"
-
-    del data['Obs']
-
-    return out
+    return series_columns, obs_columns, f"{child2}</{genericAbbr}:Series>{nl}"
 
 
 def creating_series_generic(data: pd.DataFrame,
@@ -594,8 +698,19 @@ def creating_series_generic(data: pd.DataFrame,
                             obs_codes: list,
                             series_codes: list,
                             prettyprint=True):
-    # Getting each datapoint from data and creating dict
-
+    return ''.join(iter_series_generic(data, dim_codes, att_codes,
+                                       measure_code, obs_codes, series_codes,
+                                       prettyprint))
+
+
+def iter_series_generic(data: pd.DataFrame,
+                        dim_codes: list,
+                        att_codes: list,
+                        measure_code: str,
+                        obs_codes: list,
+                        series_codes: list,
+                        prettyprint=True,
+                        executor: Executor = None):
     series_key = [v for v in series_codes if v in dim_codes]
     series_att = [v for v in series_codes if v in att_codes]
     dim = obs_codes[0]
@@ -604,20 +719,20 @@ def creating_series_generic(data: pd.DataFrame,
     else:
         obs_att = obs_codes[2:]
 
-    data_dict = {'Series': data[series_codes].drop_duplicates().reset_index(
-        drop=True).to_dict(orient="records")}
-
-    parser = lambda x: format_generic_series(data=x,  # noqa: E731
-                                             measure_code=measure_code,
-                                             series_key=series_key,
-                                             series_attr=series_att,
-                                             obs_attr=obs_att,
-                                             dim=dim,
-                                             prettyprint=prettyprint)
+    if not all(k in data.columns for k in obs_codes):
+        return
 
-    out = series_process(parser=parser, data=data, data_dict=data_dict,
-                         series_codes=series_codes, obs_codes=obs_codes)
+    series_columns, obs_columns, end = generic_series_columns(
+        measure_code=measure_code,
+        series_key=series_key,
+        series_attr=series_att,
+        obs_attr=obs_att,
+        dim=dim,
+        prettyprint=prettyprint)
 
-    del data_dict
-
-    return out
+    func = partial(render_series, series_codes=series_codes,
+                   series_columns=series_columns, obs_columns=obs_columns,
+                   end=end)
+    data = data.sort_values(series_codes, axis=0)
+    yield from map_chunks(func, iter_series_chunks(data, series_codes),
+                          executor)
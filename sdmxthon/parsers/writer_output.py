@@ -0,0 +1,128 @@
+import gzip
+import io
+import os
+from contextlib import ExitStack, contextmanager
+from zipfile import ZIP_DEFLATED, ZipFile
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ['gzip', 'zstd', 'zip']
+
+EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.zip': 'zip'}
+
+
+def check_zstandard():
+    if zstandard is None:
+        raise ImportError('zstandard is required for zstd compression, '
+                          'install it with pip install sdmxthon[zstd]')
+
+
+def is_binary(stream) -> bool:
+    """Checks if a file-like object expects bytes"""
+    return (isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or
+            'b' in str(getattr(stream, 'mode', '')))
+
+
+def infer_compression(path, compression='infer'):
+    """
+    Gets the compression of the output
+
+    :param path: Output path or file-like object
+    :param compression: 'infer' (from the extension of the path), 'gzip',
+                        'zstd', 'zip' or None
+    :return: The compression or None
+    """
+    if compression == 'infer':
+        if not isinstance(path, (str, os.PathLike)):
+            return None
+        extension = os.path.splitext(str(path))[1].lower()
+        return EXTENSIONS.get(extension)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f'Compression must be one of {COMPRESSIONS} '
+                         f'or None')
+    return compression
+
+
+def entry_name(path) -> str:
+    """Name of the file inside a zip archive, the path without .zip"""
+    name = getattr(path, 'name', path)
+    if not isinstance(name, (str, os.PathLike)):
+        return 'data'
+    name = os.path.basename(str(name))
+    if name.lower().endswith('.zip'):
+        name = name[:-4]
+    return name or 'data'
+
+
+@contextmanager
+def open_zip_entry(archive: ZipFile, name: str, newline=None):
+    """
+    Opens a text stream on a new file of a zip archive. The file is
+    compressed as it is written, without building it in memory
+
+    :param archive: ZipFile opened on write mode
+    :param name: Name of the file inside the archive
+    :param newline: Newline option of the text stream
+    """
+    with archive.open(name, 'w', force_zip64=True) as raw:
+        with io.TextIOWrapper(raw, encoding='UTF-8', errors='replace',
+                              newline=newline) as text:
+            yield text
+
+
+@contextmanager
+def open_output(path, compression='infer', entry: str = None,
+                newline=None):
+    """
+    Opens a text stream to write on the output, compressing it by chunks
+
+    :param path: Path or file-like object. Text streams are used as they
+                 are, binary ones are written in UTF-8
+    :param compression: 'infer' (from the extension of the path), 'gzip',
+                        'zstd', 'zip' or None
+    :param entry: Name of the file inside a zip archive, defaults to the
+                  name of the path without .zip
+    :param newline: Newline option of the text stream
+    """
+    compression = infer_compression(path, compression)
+    stream = hasattr(path, 'write')
+    if stream and not is_binary(path):
+        if compression is not None:
+            raise ValueError('Compressed output must be written on a path '
+                             'or a binary stream')
+        yield path
+        path.flush()
+        return
+
+    with ExitStack() as stack:
+        if compression == 'zip':
+            archive = stack.enter_context(
+                ZipFile(path, 'w', compression=ZIP_DEFLATED))
+            yield stack.enter_context(
+                open_zip_entry(archive, entry or entry_name(path), newline))
+            return
+
+        if compression == 'gzip':
+            raw = stack.enter_context(gzip.open(path, 'wb'))
+        elif compression == 'zstd':
+            check_zstandard()
+            raw = stack.enter_context(
+                zstandard.open(path, 'wb', closefd=not stream))
+        elif stream:
+            raw = path
+        else:
+            raw = stack.enter_context(open(path, 'wb'))
+
+        text = io.TextIOWrapper(raw, encoding='UTF-8', errors='replace',
+                                newline=newline)
+        try:
+            yield text
+        finally:
+            # The stream of the caller is not closed with the wrapper
+            text.flush()
+            text.detach()
+        if stream:
+            path.flush()
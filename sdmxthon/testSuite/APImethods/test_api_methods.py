@@ -4,14 +4,16 @@ API methods Tests
 import os
 from io import StringIO
 from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
 
 import pandas as pd
 import pytest
 from pytest import mark
 from requests.exceptions import ConnectionError
 
-from sdmxthon.api.api import get_pandas_df, read_sdmx, upload_metadata_to_fmr, \
-    xml_to_csv
+from sdmxthon.api.api import get_pandas_df, iter_datasets_chunks, read_sdmx, \
+    upload_metadata_to_fmr, xml_to_csv
+from sdmxthon.utils.handlers import first_element_dict
 
 pytestmark = pytest.mark.input_path(Path(__file__).parent / "data")
 
@@ -69,6 +71,19 @@ def test_xml_to_csv(filename, data_path, reference_path):
     assert_with_reference(dataframe, reference_path)
 
 
+# Test: xml to zip of csv
+def test_xml_to_csv_zip(data_path, reference_path, tmp_path):
+    output_path = str(tmp_path / 'data.zip')
+    xml_to_csv(os.path.join(data_path, 'str_all.xml'), output_path,
+               index=False, header=True)
+    with ZipFile(output_path) as archive:
+        assert len(archive.namelist()) == 1
+        assert archive.infolist()[0].compress_type == ZIP_DEFLATED
+        with archive.open(archive.namelist()[0]) as f:
+            dataframe = pd.read_csv(f).astype('str')
+    assert_with_reference(dataframe, reference_path)
+
+
 metadata_filenames = ["metadata.xml"]
 
 
@@ -86,3 +101,60 @@ def test_upload_metadata_to_fmr(filename, metadata_path):
                              'or the submitted structures contain '
                              'no changes from the ones currently '
                              'stored in the system')
+
+
+# Test: Iter datasets chunks
+@mark.parametrize("filename", filenames)
+def test_iter_datasets_chunks(filename, data_path):
+    file_path = os.path.join(data_path, filename)
+    expected = read_sdmx(file_path).payload['BIS:BIS_DER(1.0)'].data
+    chunks = []
+    for dataset_id, chunk in iter_datasets_chunks(file_path, chunk_rows=300):
+        assert dataset_id == 'BIS:BIS_DER(1.0)'
+        assert len(chunk) <= 300
+        chunks.append(chunk)
+    assert len(chunks) == 4
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected,
+                                  check_like=True)
+
+
+def test_iter_datasets_chunks_invalid_rows(data_path):
+    file_path = os.path.join(data_path, filenames[0])
+    with pytest.raises(ValueError):
+        next(iter_datasets_chunks(file_path, chunk_rows=0))
+
+
+# Categorical columns are built while reading on streaming and validated
+# reading, and converted after reading otherwise
+@mark.parametrize("filename", filenames)
+@mark.parametrize("validate, streaming", [(False, False), (True, False),
+                                          (False, True)])
+def test_get_pandas_df_categorical(data_path, filename, validate,
+                                   streaming):
+    file_path = os.path.join(data_path, filename)
+    expected = first_element_dict(get_pandas_df(file_path))
+    result = first_element_dict(get_pandas_df(file_path, validate=validate,
+                                              streaming=streaming,
+                                              dtype_backend='categorical'))
+    assert isinstance(result['FREQ'].dtype, pd.CategoricalDtype)
+    assert result['OBS_VALUE'].dtype == object
+    pd.testing.assert_frame_equal(result.astype(expected.dtypes), expected)
+
+
+@mark.parametrize("filename", filenames)
+def test_iter_datasets_chunks_categorical(data_path, filename):
+    file_path = os.path.join(data_path, filename)
+    expected = first_element_dict(get_pandas_df(file_path))
+    chunks = [df for _, df in iter_datasets_chunks(
+        file_path, chunk_rows=20, dtype_backend='categorical')]
+    assert all(isinstance(df['FREQ'].dtype, pd.CategoricalDtype)
+               for df in chunks)
+    result = pd.concat([df.astype(object) for df in chunks])
+    pd.testing.assert_frame_equal(result[expected.columns]
+                                  .astype(expected.dtypes), expected)
+
+
+def test_get_pandas_df_invalid_dtype_backend(data_path):
+    file_path = os.path.join(data_path, filenames[0])
+    with pytest.raises(ValueError):
+        get_pandas_df(file_path, dtype_backend='numpy')
@@ -0,0 +1,83 @@
+"""
+    Scaling benchmark for the dict based data readers. It is skipped
+    unless SDMXTHON_BENCHMARK is set, as building 10M observations takes
+    several minutes and a few GB of memory. SDMXTHON_BENCHMARK_SIZES can
+    be used to override the default sizes (comma separated). The time is
+    compared with a reference computed on the same machine, so the stored
+    baseline ratios do not depend on it.
+"""
+import os
+import time
+
+import pandas as pd
+from pytest import mark
+
+from sdmxthon.parsers.data_read import reading_generic_series, \
+    reading_str_series
+
+pytestmark = mark.skipif('SDMXTHON_BENCHMARK' not in os.environ,
+                         reason='Set SDMXTHON_BENCHMARK to run benchmarks')
+
+OBS_PER_SERIES = 100
+# The baseline ratios of each reader (time of the reader divided by the
+# time of building the DataFrame from the flat records) were measured on
+# 100k and 1M rows
+TOLERANCE = 2
+SIZES = [int(x) for x in os.environ.get('SDMXTHON_BENCHMARK_SIZES',
+                                        '100000,1000000,10000000').split(',')]
+
+
+def str_series_dataset(num_obs):
+    series = []
+    for i in range(num_obs // OBS_PER_SERIES):
+        obs = [{'TIME_PERIOD': str(j), 'OBS_VALUE': str(i * j),
+                'OBS_STATUS': 'A'} for j in range(OBS_PER_SERIES)]
+        series.append({'FREQ': 'A', 'REF_AREA': f'R{i}', 'Obs': obs})
+    return {'Series': series}
+
+
+def generic_series_dataset(num_obs):
+    series = []
+    for i in range(num_obs // OBS_PER_SERIES):
+        obs = [{'ObsDimension': {'value': str(j)},
+                'ObsValue': {'value': str(i * j)},
+                'Attributes': {'Value': {'id': 'OBS_STATUS',
+                                         'value': 'A'}}}
+               for j in range(OBS_PER_SERIES)]
+        series.append({'SeriesKey': {'Value': [
+            {'id': 'FREQ', 'value': 'A'},
+            {'id': 'REF_AREA', 'value': f'R{i}'}]},
+            'Obs': obs})
+    return {'Series': series}
+
+
+def flat_records(num_obs):
+    return [{'FREQ': 'A', 'REF_AREA': f'R{i}', 'TIME_PERIOD': str(j),
+             'OBS_VALUE': str(i * j), 'OBS_STATUS': 'A'}
+            for i in range(num_obs // OBS_PER_SERIES)
+            for j in range(OBS_PER_SERIES)]
+
+
+@mark.parametrize("reader, builder, baseline_ratio", [
+    (reading_str_series, str_series_dataset, 1.6),
+    (reading_generic_series, generic_series_dataset, 7.8)])
+def test_reading_linear_scaling(reader, builder, baseline_ratio):
+    for size in SIZES:
+        dataset = builder(size)
+        start = time.perf_counter()
+        df = reader(dataset)
+        elapsed = time.perf_counter() - start
+        assert len(df) == size
+        del dataset, df
+
+        # Reference on the same machine: DataFrame of the flat records
+        records = flat_records(size)
+        start = time.perf_counter()
+        pd.DataFrame(records)
+        reference = time.perf_counter() - start
+        del records
+
+        ratio = elapsed / reference
+        assert ratio < baseline_ratio * TOLERANCE, \
+            f'{reader.__name__}, {size} rows: {ratio:.2f} times the ' \
+            f'reference time'
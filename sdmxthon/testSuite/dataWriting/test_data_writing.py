@@ -1,16 +1,20 @@
 """
 Data Writing Tests
 """
+import gzip
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
+from io import BytesIO, StringIO
 from pathlib import Path
+from zipfile import ZipFile
 
 import pandas as pd
-from pytest import mark
+from pytest import importorskip, mark
 
 from sdmxthon.api.api import get_pandas_df, read_sdmx
 from sdmxthon.model.dataset import Dataset
+from sdmxthon.parsers import write
 from sdmxthon.utils.enums import MessageTypeEnum
 from sdmxthon.utils.handlers import first_element_dict
 
@@ -51,6 +55,89 @@ def test_data_writing(data_type, series, data_path, metadata_path):
         check_like=True)
 
 
+# Test writing to streams by chunks gives the same file as the string
+@mark.parametrize("data_type,series", data_types_params)
+def test_stream_writing(data_type, series, data_path, metadata_path,
+                        monkeypatch, tmp_path):
+    message = read_sdmx(os.path.join(metadata_path, 'metadata.xml'))
+    data_path = os.path.join(data_path, "df.json")
+    dataset = Dataset(data=pd.read_json(data_path, orient='records'),
+                      structure=message.payload['DataStructures']
+                      ['BIS:BIS_DER(1.0)'])
+    dataset.data = dataset.data.astype('str')
+    if series:
+        dataset.set_dimension_at_observation('TIME_PERIOD')
+
+    prepared_time = datetime.fromisoformat('2000-01-01T00:00:01')
+    expected = dataset.to_xml(message_type=data_type, prepared=prepared_time)
+
+    monkeypatch.setattr(write, 'chunksize', 7)
+    text = StringIO()
+    dataset.to_xml(text, message_type=data_type, prepared=prepared_time)
+    assert text.getvalue() == expected
+
+    binary = BytesIO()
+    dataset.to_xml(binary, message_type=data_type, prepared=prepared_time)
+    assert binary.getvalue().decode('UTF-8') == expected
+
+    with gzip.open(tmp_path / 'data.xml.gz', 'wb') as f:
+        dataset.to_xml(f, message_type=data_type, prepared=prepared_time)
+    with gzip.open(tmp_path / 'data.xml.gz', 'rt', encoding='UTF-8') as f:
+        assert f.read() == expected
+
+
+# Test parallel writing gives the same file as the serial one
+@mark.parametrize("data_type,series", data_types_params)
+def test_parallel_writing(data_type, series, data_path, metadata_path,
+                          monkeypatch):
+    message = read_sdmx(os.path.join(metadata_path, 'metadata.xml'))
+    data_path = os.path.join(data_path, "df.json")
+    dataset = Dataset(data=pd.read_json(data_path, orient='records'),
+                      structure=message.payload['DataStructures']
+                      ['BIS:BIS_DER(1.0)'])
+    dataset.data = dataset.data.astype('str')
+    if series:
+        dataset.set_dimension_at_observation('TIME_PERIOD')
+
+    prepared_time = datetime.fromisoformat('2000-01-01T00:00:01')
+    monkeypatch.setattr(write, 'chunksize', 50)
+    expected = dataset.to_xml(message_type=data_type, prepared=prepared_time)
+
+    assert dataset.to_xml(message_type=data_type, prepared=prepared_time,
+                          n_jobs=2) == expected
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = StringIO()
+        dataset.to_xml(result, message_type=data_type,
+                       prepared=prepared_time, executor=executor)
+    assert result.getvalue() == expected
+
+
+# Test values are escaped and missing values are omitted
+@mark.parametrize("data_type,series", data_types_params)
+def test_value_escaping(data_type, series, data_path, metadata_path):
+    message = read_sdmx(os.path.join(metadata_path, 'metadata.xml'))
+    data_path = os.path.join(data_path, "df.json")
+    dataset = Dataset(data=pd.read_json(data_path, orient='records'),
+                      structure=message.payload['DataStructures']
+                      ['BIS:BIS_DER(1.0)'])
+    dataset.data = dataset.data.astype('str')
+    dataset.data['TITLE_TS'] = 'A & "B" <C>'
+    dataset.data['OBS_CONF'] = pd.Categorical(
+        [None] + dataset.data['OBS_CONF'].iloc[1:].tolist())
+    if series:
+        dataset.set_dimension_at_observation('TIME_PERIOD')
+
+    result = dataset.to_xml(message_type=data_type, prettyprint=False)
+    assert '"A &amp; &quot;B&quot; &lt;C&gt;"' in result
+    assert dataset.data['OBS_CONF'].isna().sum() == 1
+    df = first_element_dict(get_pandas_df(BytesIO(bytes(result,
+                                                        encoding='UTF-8'))))
+    assert (df['TITLE_TS'] == 'A & "B" <C>').all()
+    assert len(df) == len(dataset.data)
+    assert df['OBS_CONF'].fillna('').iloc[0] == ''
+    assert (df['OBS_CONF'].iloc[1:] == 'F').all()
+
+
 @mark.parametrize("sdmx_version", [1, 2])
 def test_to_sdmx_csv_writing(data_path, metadata_path, sdmx_version):
     message = read_sdmx(os.path.join(metadata_path, 'metadata.xml'))
@@ -66,3 +153,52 @@ def test_to_sdmx_csv_writing(data_path, metadata_path, sdmx_version):
         dataset_sdmx_csv.data.fillna('').replace('nan', ''),
         dataset.data.replace('nan', ''),
         check_like=True)
+
+
+def read_compressed(path, compression):
+    if compression == 'gzip':
+        with gzip.open(path, 'rt', encoding='UTF-8', newline='') as f:
+            return f.read()
+    if compression == 'zip':
+        with ZipFile(path) as archive:
+            assert archive.namelist() == [path.name[:-4]]
+            return archive.read(archive.namelist()[0]).decode('UTF-8')
+    if compression == 'zstd':
+        zstandard = importorskip('zstandard')
+        with zstandard.open(path, 'rt', encoding='UTF-8', newline='') as f:
+            return f.read()
+    with open(path, 'r', encoding='UTF-8', newline='') as f:
+        return f.read()
+
+
+compression_params = [('', None), ('.gz', 'gzip'), ('.zip', 'zip'),
+                      ('.zst', 'zstd')]
+
+
+# Test compressed output is written by chunks on the path
+@mark.parametrize("extension, compression", compression_params)
+def test_compressed_writing(extension, compression, data_path, metadata_path,
+                            tmp_path):
+    if compression == 'zstd':
+        importorskip('zstandard')
+    message = read_sdmx(os.path.join(metadata_path, 'metadata.xml'))
+    data_path = os.path.join(data_path, "df.json")
+    dataset = Dataset(data=pd.read_json(data_path, orient='records'),
+                      structure=message.payload['DataStructures']
+                      ['BIS:BIS_DER(1.0)'])
+    dataset.data = dataset.data.astype('str')
+
+    prepared_time = datetime.fromisoformat('2000-01-01T00:00:01')
+    path = tmp_path / f'data.xml{extension}'
+    assert dataset.to_xml(path, prepared=prepared_time) is None
+    assert read_compressed(path, compression) == \
+        dataset.to_xml(prepared=prepared_time)
+
+    path = tmp_path / f'data.csv{extension}'
+    assert dataset.to_sdmx_csv(2, path) is None
+    assert read_compressed(path, compression) == dataset.to_sdmx_csv(2)
+
+    path = tmp_path / 'data.out'
+    dataset.to_sdmx_csv(2, path, compression=compression)
+    if compression != 'zip':
+        assert read_compressed(path, compression) == dataset.to_sdmx_csv(2)
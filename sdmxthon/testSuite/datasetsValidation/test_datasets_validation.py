@@ -5,9 +5,13 @@ import json
 import os
 from pathlib import Path
 
+import numpy as np
 from pytest import mark
 
 from sdmxthon.api.api import get_datasets
+from sdmxthon.model.representation import Facet
+from sdmxthon.parsers.data_validations import check_num_facets, \
+    check_str_facets, error_SS09
 
 pytestmark = mark.input_path(Path(__file__).parent / "data")
 
@@ -37,3 +41,58 @@ def test_datasets_validation(data_filename, metadata_filename,
         reference_dict = sorted(reference_dict, key=lambda i: i['Code'])
 
     assert sv_result == reference_dict
+
+
+time_params = [
+    ("ObservationalTimePeriod", ['2020', '2020-01', '2020-Q1', '2020-W53',
+                                 '2020-01-01'], ['2020-Q5', '1800']),
+    ("GregorianTimePeriod", ['2020', '2020-12', '2020-01-31'],
+     ['2020-T1', '2020-13']),
+    ("ReportingTimePeriod", ['2020-A1', '2020-S2', '2020-D365'],
+     ['2020', '2020-S3']),
+    ("ReportingQuarter", ['2020-Q4'], ['2020-Q5']),
+    ("GregorianYear", ['1901', '2020'], ['1900', '20']),
+    ("GregorianDay", ['2020-02-29', '2020-01-01'], ['2019-02-29']),
+    ("DateTime", ['2020-01-01T10:00:00'], ['2020-01-32T10:00:00']),
+    ("TimeRange", [], ['2020-01-01', '2020-01-01T00:00:00/X']),
+]
+
+
+@mark.parametrize("time_type, valid, invalid", time_params)
+def test_time_period_validation(time_type, valid, invalid):
+    errors = []
+    data_column = np.array(valid + invalid + invalid, dtype=object)
+    error_SS09('TIME_PERIOD', {'TIME_PERIOD': time_type}, data_column,
+               errors, 'Dimension')
+    assert [e['Code'] for e in errors] == ['SS09'] * len(invalid)
+    assert [e['Message'] for e in errors] == [
+        f'Value {v} not compliant with type : {time_type}' for v in invalid]
+
+
+facet_params = [
+    (check_num_facets, [Facet('maxValue', '10'), Facet('minValue', '1')],
+     [1.0, 5.5, 10.0, np.nan], [0.5, 12.0]),
+    (check_num_facets, [Facet('maxLength', '4'), Facet('minLength', '2')],
+     [10.0, 1.5, 12.5], [1.0, 123.25]),
+    (check_num_facets, [Facet('decimals', '1')], [1.0, 1.5, 100.0],
+     [1.25, 0.125]),
+    (check_num_facets, [Facet('isSequence', 'true'),
+                        Facet('startValue', '0'), Facet('interval', '5'),
+                        Facet('endValue', '20')],
+     [0.0, 5.0, 20.0, np.nan], [7.0, 12.5]),
+    (check_str_facets, [Facet('maxLength', '3'), Facet('minLength', '2')],
+     ['AB', 'ABC', 'nan'], ['A', 'ABCD']),
+    (check_str_facets, [Facet('pattern', '[A-Z]{2}[0-9]?')],
+     ['AB', 'AB1', 'None'], ['ab', 'AB12']),
+    (check_str_facets, [Facet('decimals', '2')], ['1', '1.25', 'A.123'],
+     ['1.125']),
+]
+
+
+@mark.parametrize("func, facets, valid, invalid", facet_params)
+def test_facet_validation(func, facets, valid, invalid):
+    data_column = np.array(valid + invalid, dtype=object)
+    errors = func(facets, data_column, 'OBS_VALUE', 'Measure')
+    assert [e['Code'] for e in errors] == ['SS08'] * len(invalid)
+    assert sorted(e['Message'].split()[1] for e in errors) == \
+        sorted(str(v) for v in invalid)
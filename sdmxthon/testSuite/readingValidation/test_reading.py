@@ -1,10 +1,26 @@
+import bz2
+import gzip
 import os
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
 from pathlib import Path
+from threading import Thread
+from zipfile import ZIP_DEFLATED, ZipFile
 
-from pytest import mark
+import pandas as pd
+import xmltodict
+from pytest import fixture, importorskip, mark, raises
 
-from sdmxthon.api.api import read_sdmx
+from sdmxthon.api.api import iter_datasets_chunks, read_sdmx
 from sdmxthon.model.message import Message
+from sdmxthon.parsers import writer_output
+from sdmxthon.parsers.data_read import reading_str_series
+from sdmxthon.parsers.read import options, read_and_validate
+from sdmxthon.parsers.reader_input_processor import ChunkValidator, \
+    validate_doc
+from sdmxthon.utils.enums import MessageTypeEnum
+from sdmxthon.webservices.webservices import SdmxWebServiceConnection
 
 pytestmark = mark.input_path(Path(__file__).parent / "data")
 
@@ -58,3 +74,268 @@ def test_two_actions(data_path, filename):
     result = read_sdmx(file_path, validate=True)
     data = result.content['MD_TEST:TEST(1.0)'].data
     assert len(data) == 1
+
+
+# Test streaming reading returns the same datasets
+@mark.parametrize("filename", ['gen_all.xml', 'gen_ser.xml',
+                               'str_all.xml', 'str_ser.xml',
+                               'str_ser_group.xml', 'dataflow.xml',
+                               'two_actions_delete_first.xml'])
+def test_streaming_reading(data_path, filename):
+    file_path = os.path.join(data_path, filename)
+    expected = read_sdmx(file_path, validate=True)
+    result = read_sdmx(file_path, validate=True, streaming=True)
+    assert list(result.payload) == list(expected.payload)
+    for key, dataset in expected.payload.items():
+        pd.testing.assert_frame_equal(result.payload[key].data, dataset.data)
+        assert (result.payload[key].attached_attributes ==
+                dataset.attached_attributes)
+        assert result.payload[key].unique_id == dataset.unique_id
+        assert result.payload[key].structure_type == dataset.structure_type
+
+
+class NonSeekable:
+    """Binary stream that can only be read forwards, like a socket"""
+
+    def __init__(self, data: bytes):
+        self._data = BytesIO(data)
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+# Test validation while streaming reads the source only once
+def test_streaming_validation_non_seekable(data_path):
+    file_path = os.path.join(data_path, 'str_ser.xml')
+    expected = read_sdmx(file_path, validate=True)
+    with open(file_path, 'rb') as f:
+        result = read_sdmx(NonSeekable(f.read()), validate=True,
+                           streaming=True)
+    pd.testing.assert_frame_equal(result.payload['BIS:BIS_DER(1.0)'].data,
+                                  expected.payload['BIS:BIS_DER(1.0)'].data)
+
+
+# Test errors in the second half of the file are found, for any chunk size
+@mark.parametrize("chunk_size", [10, 4096])
+def test_chunk_validator_errors(data_path, chunk_size):
+    with open(os.path.join(data_path, 'gen_ser.xml'), 'rb') as f:
+        data = f.read()
+    position = data.index(b'<generic:Obs>', len(data) // 2)
+    data = data[:position] + b'<generic:Foo/>' + data[position:]
+    validator = ChunkValidator()
+    for i in range(0, len(data), chunk_size):
+        validator.feed(data[i:i + chunk_size])
+    with raises(Exception, match='Foo'):
+        validator.close()
+    with raises(Exception, match='Foo'):
+        read_sdmx(NonSeekable(data), validate=True, streaming=True)
+    with raises(Exception, match='Foo'):
+        list(iter_datasets_chunks(BytesIO(data), chunk_rows=100,
+                                  validate=True))
+
+
+# Test the order of the elements is checked along the whole dataset
+def test_chunk_validator_sequence(data_path):
+    with open(os.path.join(data_path, 'gen_ser.xml'), 'rb') as f:
+        data = f.read()
+    start = data.index(b'<generic:Attributes>')
+    end = data.index(b'</generic:Attributes>') + len(b'</generic:Attributes>')
+    attributes = data[start:end]
+    position = data.index(b'</message:DataSet>')
+    data = (data[:start] + data[end:position] + attributes +
+            data[position:])
+    with raises(Exception, match='Attributes'):
+        validate_doc(BytesIO(data))
+    with raises(Exception, match='Attributes'):
+        read_sdmx(NonSeekable(data), validate=True)
+    with raises(Exception, match='Attributes'):
+        read_sdmx(NonSeekable(data), validate=True, streaming=True)
+
+
+def test_streaming_metadata(metadata_path):
+    file_path = os.path.join(metadata_path, 'metadata.xml')
+    result = read_sdmx(file_path, streaming=True)
+    assert result.type == MessageTypeEnum.Metadata
+
+
+# Test series keys are repeated on every observation of the series
+def test_str_series_columnar():
+    dataset = {'Series': [
+        {'FREQ': 'A', 'REF_AREA': 'ES',
+         'Obs': [{'TIME_PERIOD': '2020', 'OBS_VALUE': '1'},
+                 {'TIME_PERIOD': '2021', 'FREQ': 'M'}]},
+        {'FREQ': 'Q', 'UNIT': 'EUR',
+         'Obs': {'TIME_PERIOD': '2022', 'OBS_STATUS': 'A'}}]}
+    expected = pd.DataFrame([
+        {'FREQ': 'A', 'REF_AREA': 'ES', 'TIME_PERIOD': '2020',
+         'OBS_VALUE': '1'},
+        {'FREQ': 'M', 'REF_AREA': 'ES', 'TIME_PERIOD': '2021'},
+        {'FREQ': 'Q', 'UNIT': 'EUR', 'TIME_PERIOD': '2022',
+         'OBS_STATUS': 'A'}])
+    pd.testing.assert_frame_equal(reading_str_series(dataset), expected)
+
+
+# Test the validated tree gives the same result as xmltodict
+@mark.parametrize("filename", ['gen_all.xml', 'gen_ser.xml',
+                               'str_all.xml', 'str_ser.xml',
+                               'str_ser_group.xml', 'dataflow.xml'])
+def test_tree_to_dict(data_path, filename):
+    file_path = os.path.join(data_path, filename)
+    with open(file_path, 'rb') as f:
+        expected = xmltodict.parse(f.read(), **options)
+    with open(file_path, 'rb') as f:
+        assert read_and_validate(f) == expected
+
+
+# Test validated metadata messages are parsed once, from the validator
+def test_tree_to_dict_metadata(metadata_path):
+    file_path = os.path.join(metadata_path, 'metadata.xml')
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    expected = xmltodict.parse(data, **options)
+    result = read_and_validate(NonSeekable(data))
+    # The xml prefix declaration is implicit in lxml
+    expected['Structure']['xmlns'].pop('xml', None)
+    assert result == expected
+    message = read_sdmx(NonSeekable(data), validate=True)
+    assert message.type == MessageTypeEnum.Metadata
+
+
+def compress_file(file_path, tmp_path, compression):
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    name = os.path.basename(file_path)
+    if compression == 'gz':
+        content = gzip.compress(content)
+    elif compression == 'bz2':
+        content = bz2.compress(content)
+    elif compression == 'zst':
+        content = importorskip('zstandard').compress(content)
+    else:
+        buffer = BytesIO()
+        with ZipFile(buffer, 'w', compression=ZIP_DEFLATED) as archive:
+            archive.writestr(name, content)
+        content = buffer.getvalue()
+    compressed_path = tmp_path / f'{name}.{compression}'
+    compressed_path.write_bytes(content)
+    return compressed_path
+
+
+# Test zstd files ask for the zstd extra if zstandard is not installed
+def test_zstd_reading_without_zstandard(monkeypatch):
+    monkeypatch.setattr(writer_output, 'zstandard', None)
+    with raises(ImportError, match=r'sdmxthon\[zstd\]'):
+        read_sdmx(BytesIO(b'\x28\xb5\x2f\xfd' + b'\x00' * 16))
+
+
+# Test compressed files are read as the plain ones
+@mark.parametrize("compression", ['gz', 'bz2', 'zst', 'zip'])
+@mark.parametrize("filename", ['str_ser.xml', 'gen_all.xml'])
+@mark.parametrize("validate, streaming", [(True, False), (False, False),
+                                          (True, True)])
+def test_compressed_reading(data_path, tmp_path, filename, compression,
+                            validate, streaming):
+    file_path = os.path.join(data_path, filename)
+    compressed_path = compress_file(file_path, tmp_path, compression)
+    expected = read_sdmx(file_path, validate=False)
+    for infile in [compressed_path, str(compressed_path),
+                   BytesIO(compressed_path.read_bytes())]:
+        result = read_sdmx(infile, validate=validate, streaming=streaming)
+        assert list(result.payload) == list(expected.payload)
+        for key, dataset in expected.payload.items():
+            pd.testing.assert_frame_equal(result.payload[key].data,
+                                          dataset.data)
+
+
+def test_compressed_metadata(metadata_path, tmp_path):
+    file_path = os.path.join(metadata_path, 'metadata.xml')
+    compressed_path = compress_file(file_path, tmp_path, 'gz')
+    result = read_sdmx(compressed_path, streaming=True)
+    assert result.type == MessageTypeEnum.Metadata
+    assert (list(result.content['DataStructures']) ==
+            list(read_sdmx(file_path).content['DataStructures']))
+
+
+def test_zip_several_files(data_path, tmp_path):
+    zip_path = tmp_path / 'data.zip'
+    with ZipFile(zip_path, 'w') as archive:
+        archive.write(os.path.join(data_path, 'str_ser.xml'), 'a.xml')
+        archive.write(os.path.join(data_path, 'gen_all.xml'), 'b.xml')
+    with raises(ValueError):
+        read_sdmx(zip_path)
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    # Paths requested, to check the URLs are downloaded only once
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        super().do_GET()
+
+
+@fixture
+def base_url(data_path):
+    CountingHandler.paths.clear()
+    handler = partial(CountingHandler,
+                      directory=os.path.dirname(data_path))
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+class LocalWs(SdmxWebServiceConnection):
+    def __init__(self, entry_point):
+        self.ENTRY_POINT = entry_point
+
+    def get_data_url(self, flow, **kwargs) -> str:
+        return f'{self.ENTRY_POINT}/{flow}'
+
+
+# Test URLs are parsed while they are downloaded
+@mark.parametrize("filename", ['gen_ser.xml', 'str_ser_group.xml'])
+def test_streaming_url(data_path, base_url, filename):
+    data_url = f'{base_url}/data_sample'
+    expected = read_sdmx(os.path.join(data_path, filename))
+    for validate in [False, True]:
+        CountingHandler.paths.clear()
+        result = read_sdmx(f'{data_url}/{filename}', validate=validate,
+                           streaming=True)
+        assert CountingHandler.paths == [f'/data_sample/{filename}']
+        assert list(result.payload) == list(expected.payload)
+        for key, dataset in expected.payload.items():
+            pd.testing.assert_frame_equal(result.payload[key].data,
+                                          dataset.data)
+
+    result = LocalWs(data_url).get_data(filename, streaming=True)
+    dataset = expected.payload[list(expected.payload)[0]]
+    pd.testing.assert_frame_equal(
+        result.payload[list(result.payload)[0]].data, dataset.data)
+
+    chunks = list(LocalWs(data_url).get_data_chunks(filename,
+                                                    chunk_rows=300))
+    assert [len(df) for _, df in chunks] == [300, 300, 300, 100]
+    data = pd.concat([df for _, df in chunks], ignore_index=True)
+    assert len(data) == len(dataset.data)
+    assert list(iter_datasets_chunks(f'{data_url}/{filename}',
+                                     chunk_rows=300))[0][0] == chunks[0][0]
+
+
+def test_streaming_url_metadata(base_url):
+    for validate in [False, True]:
+        CountingHandler.paths.clear()
+        result = read_sdmx(f'{base_url}/metadata/metadata.xml',
+                           validate=validate, streaming=True)
+        assert result.type == MessageTypeEnum.Metadata
+        assert CountingHandler.paths == ['/metadata/metadata.xml']
+
+
+# Test non data messages are read from non-seekable streams
+def test_streaming_metadata_non_seekable(metadata_path):
+    with open(os.path.join(metadata_path, 'metadata.xml'), 'rb') as f:
+        result = read_sdmx(NonSeekable(f.read()), validate=True,
+                           streaming=True)
+    assert result.type == MessageTypeEnum.Metadata
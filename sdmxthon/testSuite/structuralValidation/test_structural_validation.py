@@ -1,10 +1,21 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from pathlib import Path
 
-from pytest import mark
+import pandas as pd
+from pytest import importorskip, mark, raises
 
 from sdmxthon.api.api import read_sdmx, get_datasets
 from sdmxthon.model.dataset import Dataset
+from sdmxthon.model.definitions import ContentConstraint, CubeRegion, \
+    DataKeySet, MemberSelection
+from sdmxthon.model.message import Message
+from sdmxthon.parsers.data_types import convert_dtypes, to_arrow_table
+from sdmxthon.parsers.data_validations import SeriesKeyIndex
+from sdmxthon.parsers.reader_input_processor import load_schema, \
+    validate_doc
+from sdmxthon.utils.enums import MessageTypeEnum
 from sdmxthon.utils.handlers import first_element_dict
 
 pytestmark = mark.input_path(Path(__file__).parent / "data")
@@ -73,3 +84,271 @@ def test_nodsd(data_path, metadata_path):
          'ObjectID': None,
          'ObjectType': 'DSD'}]
     assert validation_errors == expected_errors
+
+
+# Test: Categorical columns use the codelist values as categories
+def test_categorical_dtype(data_path, metadata_path):
+    dataset = get_datasets(os.path.join(data_path, "data.xml"),
+                           os.path.join(metadata_path, "test_valid.xml"),
+                           dtype_backend='categorical')
+    codes = list(dataset.structure.dimension_descriptor.components['FREQ']
+                 .representation.codelist.items.keys())
+    assert isinstance(dataset.data['FREQ'].dtype, pd.CategoricalDtype)
+    assert list(dataset.data['FREQ'].cat.categories) == codes
+    assert pd.api.types.is_numeric_dtype(dataset.data['OBS_VALUE'])
+    assert dataset.data['TIME_PERIOD'].dtype == object
+    assert len(dataset.structural_validation()) == 0
+
+
+# Test: Without DSD only the columns with few distinct values are converted
+def test_categorical_dtype_without_dsd():
+    data = pd.DataFrame({'FREQ': ['A', 'A', 'M', 'M'],
+                         'TITLE': ['a', 'b', 'c', 'd'],
+                         'TIME_PERIOD': ['2020', '2020', '2021', '2021'],
+                         'OBS_VALUE': ['1', '1', '2', '2']})
+    result = convert_dtypes(data, dtype_backend='categorical')
+    assert isinstance(result['FREQ'].dtype, pd.CategoricalDtype)
+    assert (result[['TITLE', 'TIME_PERIOD', 'OBS_VALUE']].dtypes ==
+            object).all()
+
+
+# Test: Arrow backed columns and Parquet/Feather output
+@mark.skipif(not hasattr(pd, 'ArrowDtype'), reason='requires pandas>=1.5')
+def test_pyarrow_dtype(data_path, metadata_path, tmp_path):
+    pa = importorskip('pyarrow')
+    dataset = get_datasets(os.path.join(data_path, "data.xml"),
+                           os.path.join(metadata_path, "test_valid.xml"),
+                           dtype_backend='pyarrow')
+    assert dataset.data['FREQ'].dtype == 'string[pyarrow]'
+    assert dataset.data['OBS_VALUE'].dtype == pd.ArrowDtype(pa.float64())
+
+    table = dataset.to_arrow()
+    assert not pa.types.is_dictionary(table.schema.field('FREQ').type)
+    assert table.num_rows == len(dataset.data)
+    table = dataset.to_arrow(dictionary_encode=True)
+    assert pa.types.is_dictionary(table.schema.field('FREQ').type)
+    assert not pa.types.is_dictionary(table.schema.field('TIME_PERIOD').type)
+    table = to_arrow_table(dataset.data.astype(str), dictionary_encode=True)
+    assert pa.types.is_dictionary(table.schema.field('FREQ').type)
+    assert not pa.types.is_dictionary(table.schema.field('TIME_PERIOD').type)
+
+    dataset.to_parquet(tmp_path / "data.parquet")
+    dataset.to_feather(tmp_path / "data.feather", dictionary_encode=True)
+    for result in [pd.read_parquet(tmp_path / "data.parquet"),
+                   pd.read_feather(tmp_path / "data.feather")]:
+        assert result.shape == dataset.data.shape
+        assert list(result['FREQ'].astype(str)) == \
+            list(dataset.data['FREQ'].astype(str))
+
+
+# Test: The pyarrow dtype backend requires pandas>=1.5
+def test_pyarrow_dtype_pandas_version(monkeypatch):
+    importorskip('pyarrow')
+    monkeypatch.delattr(pd, 'ArrowDtype', raising=False)
+    data = pd.DataFrame({'FREQ': ['A', 'M']})
+    with raises(ImportError, match='pandas>=1.5'):
+        convert_dtypes(data, dtype_backend='pyarrow')
+    assert to_arrow_table(data).num_rows == 2
+
+
+# Test: First error only mode raises only the first XSD error
+def test_metadata_errors_first_error_only(metadata_path):
+    with raises(Exception) as e:
+        read_sdmx(os.path.join(metadata_path, 'metadata_errors.xml'),
+                  validate=True, validate_first_error_only=True)
+    assert len(e.value.args[0].splitlines()) == 1
+
+
+# Test: Partial validation ignores the elements cut at the limit
+@mark.parametrize("max_size", [0.01, 0.05, 1])
+def test_validate_max_size(data_path, metadata_path, max_size):
+    for path in [os.path.join(data_path, "data.xml"),
+                 os.path.join(metadata_path, "metadata.xml")]:
+        with open(path, 'rb') as f:
+            validate_doc(f, max_size=max_size)
+
+
+def test_validate_max_size_errors(metadata_path):
+    with raises(Exception):
+        read_sdmx(os.path.join(metadata_path, 'metadata_errors.xml'),
+                  validate=True, validate_max_size=1)
+
+
+# Test: The XSD schema is compiled once and shared by the threads
+def test_validate_threads(data_path):
+    with open(os.path.join(data_path, "data.xml"), 'r') as f:
+        data = f.read()
+    invalid = data.replace('</message:Header>', '<Foo/></message:Header>')
+
+    def validate(xml):
+        # The errors of each thread are kept apart on the shared schema
+        try:
+            validate_doc(xml)
+        except Exception as e:
+            return 'Foo' in str(e)
+        return False
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert executor.submit(load_schema).result() is load_schema()
+        results = list(executor.map(validate, [data, invalid] * 4))
+    assert results == [False, True] * 4
+
+
+# Test: Duplicated datapoints are grouped and the rows reported can be capped
+def test_duplicated_datapoints(data_path, metadata_path):
+    dataset: Dataset = get_test_dataset(data_path, metadata_path,
+                                        'metadata.xml')
+    data = dataset.data
+    dataset.data = pd.concat([data, data.head(3), data.head(3)],
+                             ignore_index=True)
+
+    errors = [e for e in dataset.structural_validation()
+              if e['Code'] == 'SS07']
+    assert len(errors) == 3
+    n = len(data)
+    assert sorted(e['Rows'] for e in errors) == \
+        [[i, n + i, n + 3 + i] for i in range(3)]
+
+    errors = [e for e in dataset.structural_validation(max_duplicated_rows=2)
+              if e['Code'] == 'SS07']
+    assert len(errors) == 3
+    assert all(len(e['Rows']) == 2 for e in errors)
+    for max_rows in [0, -1, 1.5, True]:
+        with raises(ValueError):
+            dataset.structural_validation(max_duplicated_rows=max_rows)
+
+
+# Test: The validation plan is reused and rebuilt when the DSD changes
+def test_validation_plan(data_path, metadata_path):
+    dataset: Dataset = get_test_dataset(data_path, metadata_path,
+                                        'metadata.xml')
+    dsd = dataset.structure
+    plan = dsd.validation_plan
+    assert len(dataset.structural_validation()) == 0
+    assert dsd.validation_plan is plan
+
+    dimension = next(k for k in dsd.dimension_codes
+                     if dataset.data[k].nunique() > 1)
+    value = dataset.data[dimension].iloc[0]
+    member = MemberSelection(values_for=dimension, sel_value=[value])
+    dsd.add_constraint(ContentConstraint(
+        dataContentRegion=[CubeRegion(is_included=True, member=[member])],
+        role='Allowed'))
+    assert dsd.validation_plan is not plan
+    assert dsd.validation_plan.cubes == {dimension: {value}}
+    errors = dataset.structural_validation()
+    assert len(errors) > 0
+    assert all(e['Code'] == 'SS10' for e in errors)
+
+    # The setters of the constraints rebuild the plan
+    plan = dsd.validation_plan
+    member.sel_value = ['ZZZ']
+    assert dsd.validation_plan is not plan
+    assert dsd.validation_plan.cubes == {dimension: {'ZZZ'}}
+
+    plan = dsd.validation_plan
+    member.sel_value = dataset.data[dimension].unique().tolist()
+    assert dsd.validation_plan is not plan
+    assert len(dataset.structural_validation()) == 0
+
+    # And the setters of the components
+    plan = dsd.validation_plan
+    component = dsd.dimension_descriptor[dimension]
+    component.local_representation = component.local_representation
+    assert dsd.validation_plan is not plan
+
+
+# Test: Parallel validation gives the same errors as the serial one
+def test_parallel_validation(data_path, metadata_path):
+    dataset: Dataset = get_test_dataset(data_path, metadata_path,
+                                        'metadata.xml')
+    data = dataset.data
+    dimension = dataset.structure.dimension_codes[0]
+    wrong_code = data.copy()
+    wrong_code.loc[:9, dimension] = 'WRONG'
+    payload = {}
+    for i, df in enumerate([data, pd.concat([data, data.head(5)]),
+                            wrong_code]):
+        structure = copy(dataset.structure)
+        structure.id = f'DSD_{i}'
+        payload[structure.id] = Dataset(structure=structure, data=df)
+    message = Message(MessageTypeEnum.StructureSpecificDataSet, payload)
+
+    expected = message.validate()
+    assert list(expected) == ['DSD_1', 'DSD_2']
+    assert message.validate(n_jobs=2) == expected
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert message.validate(executor=executor) == expected
+
+    dataset = payload['DSD_2']
+    assert (dataset.structural_validation(n_jobs=4) ==
+            dataset.structural_validation())
+    with raises(ValueError):
+        dataset.structural_validation(n_jobs=0)
+
+
+# Test: Error budget, fail fast and summary modes
+def test_validation_budget(data_path, metadata_path):
+    content = read_sdmx(os.path.join(data_path, 'data.xml')).content
+    dataset = first_element_dict(content)
+    metadata = read_sdmx(os.path.join(metadata_path, 'metadata_valid.xml'))
+    dataset.structure = metadata.content['DataStructures']['MD:DS1(1.0)']
+
+    errors = dataset.structural_validation()
+    assert dataset.structural_validation(max_errors=3) == errors[:3]
+    assert dataset.structural_validation(fail_fast=True) == errors[:1]
+    with raises(ValueError):
+        dataset.structural_validation(max_errors=0)
+
+    summary = dataset.structural_validation(summary=True)
+    assert summary['SS01'] == {k: 1 for k in
+                               [e['Component'] for e in errors
+                                if e['Code'] == 'SS01']}
+    assert summary['SS07'] == {'Duplicated': 28}
+    assert sum(sum(v.values()) for v in summary.values()) == len(errors)
+    assert dataset.structural_validation(max_errors=3, summary=True) == \
+        dataset.structural_validation(summary=True, n_jobs=2, max_errors=3)
+
+
+# Test: Series keys are matched against the index, with wildcards
+def test_series_key_index():
+    index = SeriesKeyIndex([{'FREQ': 'A', 'REF_AREA': 'ES', 'UNIT': 'EUR'},
+                            {'FREQ': 'Q', 'REF_AREA': 'FR'},
+                            {'FREQ': 'M'}])
+    assert index.components == ['FREQ', 'REF_AREA', 'UNIT']
+    data = pd.DataFrame({'FREQ': ['A', 'A', 'Q', 'Q', 'M', None],
+                         'REF_AREA': ['ES', 'FR', 'FR', 'ES', 'IT', 'ES'],
+                         'UNIT': ['EUR', 'EUR', 'USD', 'EUR', 'USD', 'EUR']})
+    expected = [True, False, True, False, True, False]
+    assert index.allowed(data).tolist() == expected
+    assert index.allowed(data.astype('category')).tolist() == expected
+    assert index.allowed(data.iloc[:0]).tolist() == []
+
+
+# Test: SS11 uses the series key index of the Allowed constraints
+def test_series_constraint(data_path, metadata_path):
+    dataset: Dataset = get_test_dataset(data_path, metadata_path,
+                                        'metadata.xml')
+    dimensions = [k for k in dataset.structure.dimension_codes
+                  if dataset.data[k].nunique() > 1][:2]
+    first = dataset.data.iloc[0]
+    key = {k: first[k] for k in dimensions}
+    constraint = ContentConstraint(dataKeySet=[DataKeySet(keys=[key])],
+                                   role='Allowed')
+    dataset.structure.add_constraint(constraint)
+    assert constraint.series_key_index is constraint.series_key_index
+
+    errors = dataset.structural_validation()
+    allowed = (dataset.data[dimensions] == pd.Series(key)).all(axis=1)
+    assert [e['Code'] for e in errors] == ['SS11']
+    assert len(errors[0]['Rows']) == (~allowed).sum()
+
+    # Setting the keys rebuilds the index
+    index = constraint.series_key_index
+    constraint.data_content_keys[0].keys = [{**key, dimensions[0]: 'ZZZ'}]
+    assert constraint.series_key_index is not index
+    errors = dataset.structural_validation()
+    assert len(errors[0]['Rows']) == len(dataset.data)
+
+    constraint.data_content_keys[0].keys = [key, {}]
+    assert len(dataset.structural_validation()) == 0
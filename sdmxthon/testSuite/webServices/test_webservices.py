@@ -0,0 +1,251 @@
+import asyncio
+import os
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+
+from pytest import fixture, importorskip, mark, raises
+
+from sdmxthon.api.api import read_sdmx
+from sdmxthon.utils.session import configure_session, get_session
+from sdmxthon.webservices.async_webservices import \
+    AsyncSdmxWebServiceConnection
+from sdmxthon.webservices.webservices import SdmxWebServiceConnection
+
+pytestmark = mark.input_path(Path(__file__).parent / "data")
+
+
+class LocalWs(SdmxWebServiceConnection):
+    AGENCY_ID = 'LOCAL'
+
+    def __init__(self, entry_point):
+        self.ENTRY_POINT = entry_point
+
+    def get_data_url(self, flow, **kwargs) -> str:
+        return f'{self.ENTRY_POINT}/{flow}'
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@fixture
+def serve(data_path):
+    # Starts a local server of the data files with a handler class
+    servers = []
+
+    def start(handler_class):
+        handler = partial(handler_class, directory=data_path)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class UnavailableHandler(QuietHandler):
+    # Answers 503 to the first request of each file
+    failed = set()
+    retry_after = '0'
+
+    def do_GET(self):
+        if self.path not in self.failed:
+            self.failed.add(self.path)
+            self.send_response(503)
+            self.send_header('Retry-After', self.retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+# Test the shared session retries the 5xx responses
+def test_session_retry(data_path, serve):
+    url = f'{serve(UnavailableHandler)}/str_ser.xml'
+    expected = read_sdmx(os.path.join(data_path, 'str_ser.xml'))
+    UnavailableHandler.failed.clear()
+    try:
+        assert get_session() is get_session()
+        configure_session(max_retries=0)
+        with raises(Exception):
+            read_sdmx(url)
+        UnavailableHandler.failed.clear()
+        configure_session(backoff_factor=0)
+        for streaming in [False, True]:
+            result = read_sdmx(url, streaming=streaming)
+            UnavailableHandler.failed.clear()
+            assert list(result.payload) == list(expected.payload)
+    finally:
+        configure_session()
+
+
+class SlowHandler(QuietHandler):
+    # Keeps track of the requests in flight
+    lock = Lock()
+    active = 0
+    max_active = 0
+
+    def do_GET(self):
+        with self.lock:
+            SlowHandler.active += 1
+            SlowHandler.max_active = max(SlowHandler.max_active,
+                                         SlowHandler.active)
+        time.sleep(0.1)
+        try:
+            super().do_GET()
+        finally:
+            with self.lock:
+                SlowHandler.active -= 1
+
+
+# Test the async client keeps max_concurrency requests in flight, in order
+def test_async_concurrency(data_path, serve):
+    importorskip('httpx')
+    ws = LocalWs(serve(SlowHandler))
+    filenames = ['gen_ser.xml', 'str_ser.xml'] * 3
+    expected = {f: read_sdmx(os.path.join(data_path, f))
+                for f in set(filenames)}
+    SlowHandler.max_active = 0
+
+    async def harvest():
+        async with AsyncSdmxWebServiceConnection(ws,
+                                                 max_concurrency=2) as client:
+            messages = await client.get_data_many(filenames)
+        # Without context manager, the call opens its own client
+        one = await client.get_data('str_ser.xml')
+        return messages, one
+
+    messages, one = asyncio.run(harvest())
+    assert SlowHandler.max_active == 2
+    for filename, message in zip(filenames + ['str_ser.xml'],
+                                 messages + [one]):
+        assert list(message.payload) == list(expected[filename].payload)
+
+
+# Test the requests started are spaced by the rate limit
+def test_async_rate_limit(serve):
+    importorskip('httpx')
+    ws = LocalWs(serve(QuietHandler))
+    client = AsyncSdmxWebServiceConnection(ws, rate_limit=20)
+    start = time.monotonic()
+    asyncio.run(client.get_data_many(['str_ser.xml'] * 5))
+    assert time.monotonic() - start >= 0.2
+
+
+# Test the Retry-After of the server is waited before retrying
+def test_async_retry_after(serve):
+    importorskip('httpx')
+
+    class RetryAfterHandler(UnavailableHandler):
+        retry_after = '1'
+
+    ws = LocalWs(serve(RetryAfterHandler))
+    UnavailableHandler.failed.clear()
+    client = AsyncSdmxWebServiceConnection(ws, backoff_factor=0)
+    start = time.monotonic()
+    message = asyncio.run(client.get_data('str_ser.xml'))
+    assert time.monotonic() - start >= 1
+    assert len(message.payload) == 1
+
+    UnavailableHandler.failed.clear()
+    client = AsyncSdmxWebServiceConnection(ws, max_retries=0)
+    with raises(Exception):
+        asyncio.run(client.get_data('str_ser.xml'))
+
+
+# Test the concurrency slot is released while waiting the Retry-After
+def test_async_retry_releases_slot(serve):
+    importorskip('httpx')
+
+    class RetryAfterHandler(UnavailableHandler):
+        # Only the first request of gen_ser.xml fails
+        failed = {'/str_ser.xml'}
+        retry_after = '1'
+
+    ws = LocalWs(serve(RetryAfterHandler))
+
+    async def harvest():
+        async with AsyncSdmxWebServiceConnection(ws,
+                                                 max_concurrency=1) as client:
+            start = time.monotonic()
+
+            async def elapsed(flow):
+                await client.get_data(flow)
+                return time.monotonic() - start
+
+            return await asyncio.gather(elapsed('gen_ser.xml'),
+                                        elapsed('str_ser.xml'))
+
+    retried, other = asyncio.run(harvest())
+    assert retried >= 1
+    assert other < 0.5
+
+
+# Test the errors are raised, or returned in place of the failed queries
+def test_async_errors(serve):
+    importorskip('httpx')
+    ws = LocalWs(serve(QuietHandler))
+    client = AsyncSdmxWebServiceConnection(ws)
+    with raises(Exception):
+        asyncio.run(client.get_data_many(['missing.xml', 'str_ser.xml']))
+
+    errors = asyncio.run(client.get_data_many(['missing.xml', 'str_ser.xml'],
+                                              return_exceptions=True))
+    assert isinstance(errors[0], Exception)
+    assert len(errors[1].payload) == 1
+
+    with raises(ValueError):
+        asyncio.run(client.get_data_many(['str_ser.xml'], ['A', 'B']))
+    with raises(ValueError):
+        AsyncSdmxWebServiceConnection(ws, max_concurrency=0)
+
+
+# Test the clients of an agency share the limiter with their own interval
+def test_async_rate_limit_clients(serve):
+    importorskip('httpx')
+    ws = LocalWs(serve(QuietHandler))
+    slow = AsyncSdmxWebServiceConnection(ws, rate_limit=1)
+    fast = AsyncSdmxWebServiceConnection(ws, rate_limit=20)
+    assert slow.rate_limiter is fast.rate_limiter
+    assert (slow.interval, fast.interval) == (1, 0.05)
+    start = time.monotonic()
+    asyncio.run(fast.get_data_many(['str_ser.xml'] * 3))
+    assert 0.1 <= time.monotonic() - start < 1
+    with raises(ValueError):
+        AsyncSdmxWebServiceConnection(ws, rate_limit=0)
+
+
+# Test the connection errors are retried
+def test_async_retry_connection_error(data_path):
+    httpx = importorskip('httpx')
+    with open(os.path.join(data_path, 'str_ser.xml'), 'rb') as f:
+        content = f.read()
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        if len(requests) == 1:
+            raise httpx.ConnectError('Connection refused', request=request)
+        return httpx.Response(200, content=content)
+
+    class MockConnection(AsyncSdmxWebServiceConnection):
+        def _create_client(self):
+            return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+    ws = LocalWs('http://localhost')
+    message = asyncio.run(MockConnection(ws, backoff_factor=0)
+                          .get_data('str_ser.xml'))
+    assert len(requests) == 2
+    assert len(message.payload) == 1
+
+    requests.clear()
+    with raises(httpx.ConnectError):
+        asyncio.run(MockConnection(ws, max_retries=0)
+                    .get_data('str_ser.xml'))
@@ -0,0 +1,95 @@
+"""
+    Shared HTTP session for the URLs read, the web services and the FMR.
+    Connections are pooled and kept alive among requests, and requests
+    failing with 429 or 5xx are retried with exponential backoff
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_config = {'pool_connections': 10, 'pool_maxsize': 10, 'max_retries': 3,
+           'backoff_factor': 0.5, 'timeout': None}
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 10,
+                   max_retries: int = 3, backoff_factor: float = 0.5):
+    """
+    Creates a requests Session with connection pooling and retries
+
+    :param pool_connections: Number of hosts with a pool of connections
+    :param pool_maxsize: Maximum connections kept alive for each host
+    :param max_retries: Retries on connection errors and 429/5xx responses
+                        (only idempotent methods, POST is not retried)
+    :param backoff_factor: Sleeps backoff_factor * 2 ** (retry - 1) seconds
+                           between retries, or the Retry-After of the server
+    :return: The requests Session
+    """
+    retry = Retry(total=max_retries, backoff_factor=backoff_factor,
+                  status_forcelist=RETRY_STATUS, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+def configure_session(pool_connections: int = 10, pool_maxsize: int = 10,
+                      max_retries: int = 3, backoff_factor: float = 0.5,
+                      timeout: float = None):
+    """
+    Sets the options of the shared session, replacing the current one
+
+    :param pool_connections: Number of hosts with a pool of connections
+    :param pool_maxsize: Maximum connections kept alive for each host
+    :param max_retries: Retries on connection errors and 429/5xx responses
+    :param backoff_factor: Base of the exponential backoff, in seconds
+    :param timeout: Timeout of each request in seconds (None waits forever)
+    """
+    global _session
+    with _session_lock:
+        _config.update(pool_connections=pool_connections,
+                       pool_maxsize=pool_maxsize, max_retries=max_retries,
+                       backoff_factor=backoff_factor, timeout=timeout)
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_session():
+    """
+    Gets the session shared in the process, creating it on the first call.
+    Child processes create their own, as the connections cannot be shared
+
+    :return: The requests Session
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                options = {k: v for k, v in _config.items()
+                           if k != 'timeout'}
+                _session = create_session(**options)
+                _session_pid = os.getpid()
+    return _session
+
+
+def get(url: str, **kwargs):
+    """Sends a GET request with the shared session"""
+    kwargs.setdefault('timeout', _config['timeout'])
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    """Sends a POST request with the shared session"""
+    kwargs.setdefault('timeout', _config['timeout'])
+    return get_session().post(url, **kwargs)
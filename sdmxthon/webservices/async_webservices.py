@@ -0,0 +1,227 @@
+"""
+    Asyncio client for the SDMX web services, to send many data queries
+    concurrently. The URLs are built by the SDMX web service connections
+    (and their QueryBuilder). Requires httpx
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from io import BytesIO
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from sdmxthon.utils.session import RETRY_STATUS
+from sdmxthon.webservices.webservices import SdmxWebServiceConnection
+
+
+def check_httpx():
+    if httpx is None:
+        raise ImportError('httpx is required for the async client, '
+                          'install it with pip install sdmxthon[async]')
+
+
+class RateLimiter:
+    """
+    Spaces the requests started to a web service. Each client waits its
+    own interval after the last request started by any client
+    """
+
+    def __init__(self):
+        self.next_time = 0.0
+
+    async def wait(self, interval: float):
+        """
+        Waits for the next slot to start a request
+
+        :param interval: Seconds between this request and the next one
+        """
+        # No await until the slot is taken, so no lock is needed
+        now = time.monotonic()
+        start = max(now, self.next_time)
+        self.next_time = start + interval
+        await asyncio.sleep(start - now)
+
+
+class AsyncSdmxWebServiceConnection:
+    """
+    Asyncio client of a SDMX web service connection. The data of many
+    flows or keys is requested concurrently with httpx, keeping at most
+    max_concurrency requests in flight, and parsed in threads.
+
+    Can be used as an async context manager to share the connections
+    among calls. Otherwise, each call opens its own client.
+
+    :param connection: The SDMX web service connection that builds the
+                       URLs (BisWs, EcbWs, EuroStatWs...)
+    :type connection: SdmxWebServiceConnection
+
+    :param max_concurrency: Maximum number of requests in flight
+    :type max_concurrency: int
+
+    :param rate_limit: Maximum number of requests started per second on
+                       the agency. The clients of the same agency share
+                       the time of the last request, and each one waits
+                       its own interval (default is None, no limit)
+    :type rate_limit: float
+
+    :param max_retries: Retries of the requests failing with connection
+                        errors, 429 or 5xx
+    :type max_retries: int
+
+    :param backoff_factor: Sleeps backoff_factor * 2 ** retry seconds
+                           between retries, or the Retry-After of the server
+    :type backoff_factor: float
+
+    :param timeout: Timeout of each request in seconds
+    :type timeout: float
+    """
+
+    _rate_limiters = {}
+
+    def __init__(self, connection: SdmxWebServiceConnection,
+                 max_concurrency: int = 10, rate_limit: float = None,
+                 max_retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: float = 60):
+        check_httpx()
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be a positive integer')
+        self.connection = connection
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.rate_limiter = None
+        self.interval = None
+        if rate_limit is not None:
+            if rate_limit <= 0:
+                raise ValueError('rate_limit must be a positive number')
+            self.rate_limiter = self._rate_limiters.setdefault(
+                connection.AGENCY_ID, RateLimiter())
+            self.interval = 1 / rate_limit
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    async def __aenter__(self):
+        self._client = self._create_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._client.aclose()
+        self._client = None
+
+    def _create_client(self):
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(limits=limits, timeout=self.timeout,
+                                 follow_redirects=True)
+
+    @asynccontextmanager
+    async def _open_client(self):
+        if self._client is not None:
+            yield self._client
+            return
+        async with self._create_client() as client:
+            yield client
+
+    async def fetch(self, client, url: str) -> bytes:
+        """
+        Gets the body of a URL, retrying on connection errors and on 429
+        and 5xx responses. A slot of max_concurrency is taken for each
+        request, and released while sleeping before the retries
+
+        :param client: httpx AsyncClient
+        :param url: The URL to request
+        :return: The body of the response
+        :exception: httpx.HTTPStatusError if the response is not successful,
+                    httpx.TransportError if the last retry cannot connect
+        """
+        for retry in range(self.max_retries + 1):
+            delay = self.backoff_factor * 2 ** retry
+            async with self._get_semaphore():
+                # The request starts on the slot given by the rate limiter
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.wait(self.interval)
+                try:
+                    response = await client.get(url)
+                except httpx.TransportError:
+                    if retry == self.max_retries:
+                        raise
+                    response = None
+            if response is None:
+                await asyncio.sleep(delay)
+                continue
+            if (response.status_code not in RETRY_STATUS or
+                    retry == self.max_retries):
+                break
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = int(retry_after)
+            await asyncio.sleep(delay)
+        response.raise_for_status()
+        return response.content
+
+    def _get_semaphore(self):
+        # Shared by the concurrent calls, created again on a new event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _get_message(self, client, url: str):
+        from sdmxthon.api.api import read_sdmx
+        content = await self.fetch(client, url)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(read_sdmx, BytesIO(content), validate=False))
+
+    async def get_data(self, flow, key=None, **kwargs):
+        """
+        Returns a message with the data
+
+        :param flow: The id of the dataflow
+        :param key: The key of the series (dot separated dimension values)
+        :param kwargs: The parameters of the get_data_url method of the
+                       connection
+        """
+        return (await self.get_data_many([flow], [key], **kwargs))[0]
+
+    async def get_data_many(self, flows, keys=None,
+                            return_exceptions: bool = False, **kwargs):
+        """
+        Requests the data of many flows or keys concurrently
+
+        :param flows: The id of a dataflow, or a list of ids
+        :param keys: A list of keys, queried on the flow (if flows is a
+                     string) or on the flow at the same position
+        :param return_exceptions: Returns the exceptions of the failed
+                                  queries in the list instead of raising
+                                  the first one
+        :param kwargs: The parameters of the get_data_url method of the
+                       connection, used on all the queries
+        :return: A list with a Message for each query, in the same order
+        """
+        if isinstance(flows, str):
+            flows = [flows] * (1 if keys is None else len(keys))
+        if keys is None:
+            keys = [None] * len(flows)
+        if len(flows) != len(keys):
+            raise ValueError('flows and keys must have the same length')
+
+        urls = []
+        for flow, key in zip(flows, keys):
+            if key is None:
+                urls.append(self.connection.get_data_url(flow, **kwargs))
+            else:
+                urls.append(self.connection.get_data_url(flow, key=key,
+                                                         **kwargs))
+
+        async with self._open_client() as client:
+            return await asyncio.gather(
+                *[self._get_message(client, url) for url in urls],
+                return_exceptions=return_exceptions)
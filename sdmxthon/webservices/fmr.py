@@ -1,13 +1,13 @@
 import json
 from time import sleep, time
 
-from requests import get, post
 from requests.exceptions import ConnectionError
 
 from sdmxthon.model.error import SDMXError
 from sdmxthon.model.utils import (generate_basic_auth_token,
                                   METADATA_ENDPOINT, STATUS_ERRORS,
                                   STATUS_IN_PROCESS)
+from sdmxthon.utils.session import get, post
 
 
 def check_host_availability(host_url):
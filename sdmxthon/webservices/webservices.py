@@ -97,31 +97,39 @@ class SdmxWebServiceConnection(ABC):
         return (f"{self.ENTRY_POINT}"
                 f"{self.WS_IMPLEMENTATION.get_constraints(flow, **kwargs)}")
 
-    def get_data(self, flow, **kwargs):
+    def get_data(self, flow, streaming=False, **kwargs):
+        """Returns a message with the data. With streaming, the response
+        is parsed while it is downloaded, without keeping the body"""
         from sdmxthon.api.api import read_sdmx
-        """Returns a message with the data"""
         url = self.get_data_url(flow, **kwargs)
-        print(url)
-        message = read_sdmx(url, validate=False)
+        message = read_sdmx(url, validate=False, streaming=streaming)
         return message
 
+    def get_data_chunks(self, flow, chunk_rows=50000, **kwargs):
+        """Returns a generator of tuples (dataset id, Pandas DataFrame)
+        with chunk_rows observations at most, parsed while the response
+        is downloaded"""
+        from sdmxthon.api.api import iter_datasets_chunks
+        url = self.get_data_url(flow, **kwargs)
+        return iter_datasets_chunks(url, chunk_rows=chunk_rows)
+
     def get_dsd(self, **kwargs):
-        from sdmxthon.api.api import read_sdmx
         """Returns a message with the dsd"""
+        from sdmxthon.api.api import read_sdmx
         url = self.get_dsd_url(**kwargs)
         message = read_sdmx(url, validate=False)
         return message
 
     def get_data_flow(self, flow, **kwargs):
-        from sdmxthon.api.api import read_sdmx
         """Returns a message with the dataflow"""
+        from sdmxthon.api.api import read_sdmx
         url = self.get_data_flow_url(flow, **kwargs)
         message = read_sdmx(url, validate=False)
         return message
 
     def get_constraints(self, **kwargs):
-        from sdmxthon.api.api import read_sdmx
         """Returns a message with the constraints"""
+        from sdmxthon.api.api import read_sdmx
         url = self.get_constraints_url(kwargs)
         message = read_sdmx(url, validate=False)
         return message
@@ -35,6 +35,11 @@ setuptools.setup(
         'requests',
         'xmltodict'
     ],
+    extras_require={
+        'arrow': ['pyarrow', 'pandas>=1.5'],
+        'zstd': ['zstandard'],
+        'async': ['httpx']
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',